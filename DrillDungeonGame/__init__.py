@@ -1,8 +1,13 @@
+from .ai_level_of_detail import *
 from .drill_dungeon_game import *
+from .entity_renderer import *
+from .hud import *
 from .in_game_menus import *
 from .inventory import *
 from .level import *
+from .level_store import *
 from .obscure_vision import *
+from .spatial_hash import *
 from .sprite_container import *
 from .sprite_container import *
 from .view_margins import *
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import itertools
+from enum import Enum
+from typing import Dict
+
+import arcade
+
+from .spatial_hash import SpatialHash
+
+LOD_FULL_DISTANCE = 750  # Enemies within this many pixels of the drill, ie. anywhere on screen, update every frame.
+LOD_REDUCED_DISTANCE = 1200  # Enemies within this many pixels update every LOD_REDUCED_INTERVAL frames.
+LOD_REDUCED_INTERVAL = 4
+
+
+class AITier(Enum):
+    FULL = 0
+    REDUCED = 1
+    FROZEN = 2
+
+
+class AILevelOfDetail:
+    """
+
+    Decides which enemies to update each frame by how far they are from the drill, so enemies far away from the
+    player don't cost anything.
+
+    Notes
+    -----
+    Enemies are put into one of three tiers. Those within full_distance of the drill, which covers the whole screen,
+    are updated every frame. Those within reduced_distance think every reduced_interval frames, with the time since
+    their last update, so they keep wandering and re-pathing at a fraction of the cost. Entities move a fixed step
+    per frame whatever the delta_time, so before thinking they are moved on for the frames they sat out, and they and
+    their bullets travel as far as they would have every frame. The ones in each frame are staggered so the work is
+    spread evenly. Anything further away is frozen until the drill comes closer.
+
+    The enemies are kept in a SpatialHash (SpriteContainer.entity_hash), so finding the enemies in range only looks
+    at the cells around the drill and frozen enemies aren't even iterated over. Only enemies that have been updated
+    can have moved, so only they are moved in the hash. The whole hash is only brought back in line with the entity
+    list when enemies have been added or killed.
+
+    Methods
+    -------
+    tier_of(entity: Entity, center_x: float, center_y: float)
+        Returns the tier an entity is in, for a drill at a position.
+    update(time: float, delta_time: float, sprites: SpriteContainer, block_grid: BlockGrid)
+        Updates the enemies that are due an update this frame.
+
+    """
+    def __init__(self, full_distance: float = LOD_FULL_DISTANCE, reduced_distance: float = LOD_REDUCED_DISTANCE,
+                 reduced_interval: int = LOD_REDUCED_INTERVAL) -> None:
+        """
+
+        Parameters
+        ----------
+        full_distance       :   float
+            How many pixels from the drill enemies are updated every frame.
+        reduced_distance    :   float
+            How many pixels from the drill enemies are updated at a reduced rate. Further away they are frozen.
+        reduced_interval    :   int
+            How many frames apart enemies at a reduced rate are updated.
+
+        """
+        if not 0 <= full_distance <= reduced_distance:
+            raise ValueError(f'Distances must satisfy 0 <= full_distance <= reduced_distance, '
+                             f'got {full_distance} and {reduced_distance}.')
+        if reduced_interval < 1:
+            raise ValueError(f'reduced_interval must be at least 1, got {reduced_interval}.')
+        self.full_distance = full_distance
+        self.reduced_distance = reduced_distance
+        self.reduced_interval = reduced_interval
+        self.frame = 0
+        self.updated = 0  # How many enemies were updated last frame.
+        self._phases: Dict[arcade.Sprite, int] = {}  # The frame out of every reduced_interval to update each enemy.
+        self._phase_counter = itertools.count()
+
+    def tier_of(self, entity: arcade.Sprite, center_x: float, center_y: float) -> AITier:
+        """
+
+        Returns the tier an entity is in.
+
+        Parameters
+        ----------
+        entity      :   Entity
+            The entity to find the tier of.
+        center_x    :   float
+            The x pixel coordinate of the drill.
+        center_y    :   float
+            The y pixel coordinate of the drill.
+
+        Returns
+        -------
+        AITier
+            How often the entity should be updated.
+
+        """
+        distance_squared = (entity.center_x - center_x) ** 2 + (entity.center_y - center_y) ** 2
+        if distance_squared <= self.full_distance ** 2:
+            return AITier.FULL
+        if distance_squared <= self.reduced_distance ** 2:
+            return AITier.REDUCED
+        return AITier.FROZEN
+
+    def update(self, time: float, delta_time: float, sprites, block_grid) -> None:
+        """
+
+        Updates every enemy in the full tier, and the enemies in the reduced tier whose turn it is this frame. Should
+        be called once a frame in place of updating every entity in the entity list.
+
+        Parameters
+        ----------
+        time       :   float
+            The time that the game has been running for.
+        delta_time :   float
+            The time in seconds since the last game loop iteration.
+        sprites    :   SpriteContainer
+            The SpriteContainer holding the entities and their spatial hash.
+        block_grid :   BlockGrid
+            Reference to all blocks in the game.
+
+        """
+        self.frame += 1
+        entity_hash: SpatialHash = sprites.entity_hash
+        sprites.update_entity_hash()
+        if len(self._phases) > len(entity_hash):  # Forget the phases of enemies that have been killed.
+            self._phases = {entity: phase for entity, phase in self._phases.items() if entity in entity_hash}
+
+        center_x, center_y = sprites.drill.center_x, sprites.drill.center_y
+        updated = 0
+        for entity in entity_hash.query_radius(center_x, center_y, self.reduced_distance):
+            tier = self.tier_of(entity, center_x, center_y)
+            if tier is AITier.FROZEN or not entity.sprite_lists:
+                continue  # Out of range, or killed by something else earlier this frame.
+            if tier is AITier.REDUCED:
+                phase = self._phases.get(entity)
+                if phase is None:
+                    phase = self._phases[entity] = next(self._phase_counter) % self.reduced_interval
+                if self.frame % self.reduced_interval != phase:
+                    continue
+                for _ in range(self.reduced_interval - 1):
+                    self._move(entity, time, delta_time, sprites, block_grid)
+                entity.update(time, delta_time * self.reduced_interval, sprites, block_grid)
+            else:
+                entity.update(time, delta_time, sprites, block_grid)
+            entity_hash.move(entity)
+            updated += 1
+        self.updated = updated
+
+    def _move(self, entity, time: float, delta_time: float, sprites, block_grid) -> None:
+        """Moves an entity and its children as far as Entity.update does in a frame, without them thinking."""
+        entity.update_collision_engine(time, delta_time, sprites, block_grid)
+        for child in entity.children:
+            self._move(child, time, delta_time, sprites, block_grid)
@@ -2,10 +2,13 @@ import arcade
 
 from .entity.entities import Drill
 from .entity.mixins import ControllableMixin, ShotType
-from .in_game_menus import draw_3d_rectangle
-from .level import Level
+from .hud import HUD
+from .level import Level, LevelPrefetcher
+from .level_store import LevelStore
+from .map import BLOCK
 from .obscure_vision import ObscuredVision
-from .utility import SCREEN_TITLE, generate_next_layer_resource_patch_amount, generate_next_layer_dungeon_amount
+from .utility import (SCREEN_TITLE, SCREEN_WIDTH, SCREEN_HEIGHT, generate_next_layer_resource_patch_amount,
+                      generate_next_layer_dungeon_amount, pixel_to_tile, PATH_FINDING_BUDGET_MS)
 from .view_margins import View
 
 
@@ -15,7 +18,8 @@ class DrillDungeonGame(arcade.View):
 
     Methods
     -------
-    setup(number_of_coal_patches: int, number_of_gold_patches: int, number_of_dungeons: int, center_x: int, center_y: int)
+    setup(number_of_coal_patches: int, number_of_gold_patches: int, number_of_dungeons: int, center_x: int,
+          center_y: int)
         Set up game and initialize variables.
     draw_next_map_layer()
         Generates and loads the next layer of the map when drilling down.
@@ -27,7 +31,8 @@ class DrillDungeonGame(arcade.View):
         Draws map.
     load_map_layer_from_matrix(map_layer_matrix: List)
         Loads a map from a layer matrix.
-    fill_row_with_terrain(map_row: list, y_block_center: Union[float, int], block_width: Union[float, int], block_height: Union[float, int])
+    fill_row_with_terrain(map_row: list, y_block_center: Union[float, int], block_width: Union[float, int],
+                          block_height: Union[float, int])
         Fills a row with terrain.
     on_key_press(key: int, modifiers: int)
         If key is pressed, it sets that key in self.keys_pressed dict to True.
@@ -40,7 +45,15 @@ class DrillDungeonGame(arcade.View):
     on_mouse_release(x: float, y: float, button: int, modifiers: int)
         Executes logic when mouse key is released.
     reload_chunks()
-        Loads fresh set of chunks.
+        Loads the chunks of the current level around the view and evicts those that have scrolled away.
+    update_flow_field()
+        Points the current level's flow field at the drill.
+    update_field_of_view()
+        Casts the current level's field of view from the drill.
+    prefetch_next_level()
+        Starts generating the next level in the background once the drill is close to a drill down block.
+    shutdown()
+        Stops generating levels in the background.
     on_update(delta_time: float)
         Method is called by the arcade library every iteration. Provides basis for game running time.
 
@@ -73,6 +86,7 @@ class DrillDungeonGame(arcade.View):
         self.gold_per_layer = 20
         self.coal_per_layer = 20
         self.dungeons_per_layer = 3
+        self.path_finding_budget_ms = PATH_FINDING_BUDGET_MS
 
         self.frame = 0
         self.time = 0
@@ -87,12 +101,14 @@ class DrillDungeonGame(arcade.View):
                            coal=200,
                            gold=0)
 
-        self._levels = []
+        self._levels = LevelStore(self.drill)
         self._level_index = 0
         self._levels.append(Level(drill=self.drill, current_level=self._level_index))
+        self._level_prefetcher = LevelPrefetcher()
         self.drill.setup_collision_engine([self.current_level.sprites.indestructible_blocks_list])
 
         self.vignette = ObscuredVision()
+        self.hud = HUD()
 
         self.score = 0
 
@@ -110,9 +126,11 @@ class DrillDungeonGame(arcade.View):
                            coal=40,
                            gold=0)
 
-        self._levels = []
+        self._levels.clear()
+        self._levels = LevelStore(self.drill)
         self._level_index = 0
         self._levels.append(Level(drill=self.drill, current_level=self._level_index))
+        self._level_prefetcher.cancel_all()
         self.drill.setup_collision_engine([self.current_level.sprites.indestructible_blocks_list])
 
         self.vignette = ObscuredVision()
@@ -123,6 +141,60 @@ class DrillDungeonGame(arcade.View):
     def current_level(self):
         return self._levels[self._level_index]
 
+    def reload_chunks(self) -> None:
+        """
+
+        Loads the chunks of the current level that are around the view and evicts those that have scrolled away
+        from it, so only blocks near the screen are kept as sprite lists to draw.
+
+        """
+        self.current_level.block_grid.chunks.update(self.view.left_offset, self.view.bottom_offset,
+                                                    SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def update_flow_field(self) -> None:
+        """
+
+        Points the current level's flow field at the drill, so every enemy chasing the drill can share one search.
+        The field is only searched again once the drill has moved to another block or a block has been broken.
+
+        """
+        self.current_level.block_grid.flow_field.update(pixel_to_tile(self.drill.center_x),
+                                                        pixel_to_tile(self.drill.center_y))
+
+    def update_field_of_view(self) -> None:
+        """
+
+        Casts the current level's field of view from the drill, so every enemy can tell whether it can see the drill
+        with one lookup. The field is only cast again once the drill has moved to another block or a block has been
+        broken.
+
+        """
+        self.current_level.block_grid.field_of_view.update(pixel_to_tile(self.drill.center_x),
+                                                           pixel_to_tile(self.drill.center_y))
+
+    def prefetch_next_level(self) -> None:
+        """
+
+        Starts generating the layout of the next level in a worker process once the drill is near a drill down
+        block, so drilling down doesn't have to wait for the map to be generated.
+
+        """
+        if (len(self._levels) - self._level_index) != 1:
+            return  # The next level already exists.
+
+        if self.current_level.block_grid.is_block_type_near(self.drill.center_x, self.drill.center_y,
+                                                            BLOCK.DRILLDOWN, radius=10):
+            self._level_prefetcher.request(self._level_index)
+
+    def shutdown(self) -> None:
+        """
+
+        Stops generating levels in the background, so no worker process is left running. Called when the window is
+        closed.
+
+        """
+        self._level_prefetcher.shutdown()
+
     def update_map_configuration(self) -> None:
         """
 
@@ -136,23 +208,12 @@ class DrillDungeonGame(arcade.View):
 
     def on_draw(self) -> None:
         """Draws the map."""
-        self.current_level.draw()
+        self.current_level.draw(self.view)
 
         self.vignette.draw(self.drill.center_x, self.drill.center_y)
 
-        draw_3d_rectangle(self.view.left_offset+718, self.view.bottom_offset+587, 160, 25, arcade.color.LIGHT_GRAY+(150,),
-                          arcade.color.WHITE+(150,), arcade.color.GRAY+(150,), 1)
-        score_text = f"Score: {self.score}"
-        arcade.draw_text(score_text, self.view.left_offset + 643, self.view.bottom_offset + 574, arcade.color.BLACK, 18)
-
-        draw_3d_rectangle(self.view.left_offset+110, self.view.bottom_offset+70, 220, 140, arcade.color.LIGHT_GRAY+(150,),
-                          arcade.color.WHITE+(150,), arcade.color.GRAY+(150,), 2)
-        self.drill.draw_health_bar(self.view.left_offset+80, self.view.bottom_offset+50, 130, 20)
-        self.drill.draw_shield_bar(self.view.left_offset+80, self.view.bottom_offset+20, 130, 20)
-        hud = f"Ammunition: {self.drill.inventory.ammunition}\nCoal:{self.drill.inventory.coal}" \
-              f"\nGold:{self.drill.inventory.gold}"
-        # update hud with screen scroll
-        arcade.draw_text(hud, self.view.left_offset + 10, self.view.bottom_offset + 60, arcade.color.BLACK, 20)
+        # Panels and text are kept between frames and only redrawn when what they show changes.
+        self.hud.draw(self.score, self.drill)
 
     def on_key_press(self, key: int, modifiers: int) -> None:
         """
@@ -193,8 +254,10 @@ class DrillDungeonGame(arcade.View):
             self.window.show_view(self.window.pause_view)
 
         elif self.keys_pressed['U']:
-            if self.drill.check_ground_for_drilling(self.current_level.sprites):
+            if self.drill.check_ground_for_drilling(self.current_level.block_grid):
                 if self._level_index > 0:
+                    self.current_level.block_grid.chunks.evict_all()
+                    self.current_level.entity_renderer.clear()
                     self._level_index -= 1
                 self.drill.collision_engine = []  # Clear previous level collision engine first.
                 self.drill.setup_collision_engine([self.current_level.sprites.indestructible_blocks_list])
@@ -210,11 +273,14 @@ class DrillDungeonGame(arcade.View):
         Handles drilling down, when the player presses 'T'.
         Requires the drill to be over a drill down block and have more than 50 coal.
         """
-        if self.drill.check_ground_for_drilling(self.current_level.sprites):
+        if self.drill.check_ground_for_drilling(self.current_level.block_grid):
             if self.drill.inventory.coal > 30:
                 if (len(self._levels) - self._level_index) == 1:
-                    next_level = Level(self.drill, self._level_index)
+                    next_level = Level(self.drill, self._level_index,
+                                       layout=self._level_prefetcher.take(self._level_index))
                     self._levels.append(next_level)
+                self.current_level.block_grid.chunks.evict_all()
+                self.current_level.entity_renderer.clear()
                 self._level_index += 1
                 self.drill.collision_engine = []  # Clear previous level collision engine first.
                 self.drill.setup_collision_engine([self.current_level.sprites.indestructible_blocks_list])
@@ -357,6 +423,10 @@ class DrillDungeonGame(arcade.View):
 
         # Check for side scrolling
         self.view.update(self.drill)
+        self.reload_chunks()
+        self.update_flow_field()
+        self.update_field_of_view()
+        self.prefetch_next_level()
 
         # TODO move this into entities.Drill.update(). We need to pass view as a param to update()
         self.drill.children[0].aim(self.mouse_position[0] + self.view.left_offset,
@@ -366,9 +436,13 @@ class DrillDungeonGame(arcade.View):
         gold = self.drill.inventory.gold
         coal = self.drill.inventory.coal
 
-        for entity in (*self.current_level.sprites.entity_list, self.drill):
-            # pass the sprite Container so update function can interact with other sprites.
-            entity.update(self.time, delta_time, self.current_level.sprites, self.current_level.block_grid)
+        # Enemies far from the drill are updated less often, or not at all. See AILevelOfDetail.
+        self.current_level.ai_level_of_detail.update(self.time, delta_time, self.current_level.sprites,
+                                                     self.current_level.block_grid)
+        # pass the sprite Container so update function can interact with other sprites.
+        self.drill.update(self.time, delta_time, self.current_level.sprites, self.current_level.block_grid)
+        self.current_level.block_grid.path_requests.process(self.path_finding_budget_ms)
+        self.current_level.block_grid.flush_breaks()
 
         if len(self.current_level.sprites.entity_list) < enemies:
             self.score += (enemies-len(self.current_level.sprites.entity_list))*2
@@ -378,7 +452,8 @@ class DrillDungeonGame(arcade.View):
         if self.drill.inventory.coal > coal:
             self.score += self.drill.inventory.coal-coal
 
-        self.current_level.sprites.explosion_list.update()
+        # Animations and particles are only updated on the screen.
+        self.current_level.update_cosmetics(delta_time, self.view)
 
         # for bullet in self.current_level.sprites.bullet_list:
         #     if bullet.center_x > self.window.width + self.view.left_offset or \
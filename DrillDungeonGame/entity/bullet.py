@@ -58,7 +58,8 @@ class Bullet(ChildEntity):
         method. We do this instead of using arcade.SimplePhysicsEngine because the engine also corrects the position
         of the entity so it doesn't collide with any other sprites. This is an issue as when a bullet is fired, it
         is already colliding with the parent entity and a potential block. The bullet would appear to phase through
-        walls.
+        walls. Entities are found through SpriteContainer.entities_near, so the cost doesn't grow with the number of
+        entities on the level.
 
         Parameters
         ----------
@@ -72,9 +73,13 @@ class Bullet(ChildEntity):
             Reference to all blocks in the game.
 
         """
-        for sprite_list in (sprites.all_blocks_list, sprites.entity_list, sprites.drill_list):
-            collisions = arcade.check_for_collision_with_list(self, sprite_list)
-
+        block_collisions = block_grid.blocks_overlapping(self)
+        # Only the entities in the cells of the spatial hash around the bullet are checked, not every entity.
+        entity_collisions = [entity for entity in sprites.entities_near(self)
+                             if arcade.check_for_collision(self, entity)]
+        for collisions in (block_collisions,
+                           entity_collisions,
+                           arcade.check_for_collision_with_list(self, sprites.drill_list)):
             # We might want to change this behaviour to instead loop over all collisions. The reason we only use the
             # first collision is because otherwise at the end of a gameloop, a bullet could be overlapping with up to
             # 4 (usually at most 3) blocks. One bullet could remove many blocks. We only want 1 bullet to remove 1 block
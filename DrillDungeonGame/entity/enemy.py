@@ -6,6 +6,7 @@ from typing import Union, List
 import arcade
 
 from .entity import Entity
+from ..utility import pixel_to_tile
 
 
 class Enemy(Entity):
@@ -60,6 +61,25 @@ class Enemy(Entity):
         self._last_line_of_sight_check_time = random.uniform(0, 1)
         self._has_line_of_sight_with_drill = False
 
+    def can_see_drill(self, block_grid) -> bool:
+        """
+
+        Returns whether this enemy and the drill can see each other, by looking its block up in the block grid's
+        field of view from the drill rather than casting a ray of its own.
+
+        Parameters
+        ----------
+        block_grid  :   BlockGrid
+            The block grid whose field of view to look in. It must have been updated with the drill's block.
+
+        Returns
+        -------
+        bool
+            True if there is line of sight, False otherwise.
+
+        """
+        return block_grid.field_of_view.is_visible(pixel_to_tile(self.center_x), pixel_to_tile(self.center_y))
+
     def draw_health_bar(self):
         super().draw_health_bar(self.center_x, self.center_y - 20, self.width, 5)
 
@@ -5,7 +5,7 @@ import arcade
 from ..bullet import Bullet
 from ..entity import Entity
 from ...map import BLOCK
-from ...particles.explosion import ParticleGold, Smoke, ParticleCoal, ParticleDirt, ParticleShield
+from ...particles.explosion import ParticleKind
 from ...utility import make_explosion_particles
 
 
@@ -61,43 +61,39 @@ class BlueNormalBullet(Bullet):
 
         """
         if type(sprite) == BLOCK.GOLD:
-            make_explosion_particles(ParticleGold, sprite.position, time, sprites)
+            make_explosion_particles(ParticleKind.GOLD, sprite.position, time, sprites)
             block_grid.break_block(sprite, sprites)
             self.remove_from_sprite_lists()
 
         elif type(sprite) == BLOCK.COAL:
-            make_explosion_particles(ParticleCoal, sprite.position, time, sprites)
-            smoke = Smoke(50)
-            smoke.position = sprite.position
-            sprites.explosion_list.append(smoke)
+            make_explosion_particles(ParticleKind.COAL, sprite.position, time, sprites)
+            sprites.particles.emit_smoke(sprite.position, 50)
             block_grid.break_block(sprite, sprites)
             self.remove_from_sprite_lists()
 
         elif type(sprite) == BLOCK.DIRT:
-            make_explosion_particles(ParticleDirt, sprite.position, time, sprites)
+            make_explosion_particles(ParticleKind.DIRT, sprite.position, time, sprites)
             block_grid.break_block(sprite, sprites)
             self.remove_from_sprite_lists()
 
-        elif sprite in sprites.indestructible_blocks_list:
-            make_explosion_particles(ParticleDirt, sprite.position, time, sprites)
+        elif sprites.indestructible_blocks_list in sprite.sprite_lists:
+            make_explosion_particles(ParticleKind.DIRT, sprite.position, time, sprites)
             self.remove_from_sprite_lists()
 
         # The second and statement here makes sure the bullet doesnt belong to the sprite that shot it.
-        elif sprite in (*sprites.enemy_list, sprites.drill):
+        elif sprite is sprites.drill or sprites.enemy_list in sprite.sprite_lists:
             # Little check to make sure the bullet isn't hitting the turret or any parent. Bullets spawn inside this.
             if sprite in self.get_all_parents:
                 return
 
             if hasattr(sprite, 'shield_enabled') and sprite.shield_enabled is True:
-                make_explosion_particles(ParticleShield, sprite.position, time, sprites)
+                make_explosion_particles(ParticleKind.SHIELD, sprite.position, time, sprites)
                 self.remove_from_sprite_lists()
 
             else:
 
-                make_explosion_particles(ParticleDirt, sprite.position, time, sprites)
-                smoke = Smoke(50)
-                smoke.position = sprite.position
-                sprites.explosion_list.append(smoke)
+                make_explosion_particles(ParticleKind.DIRT, sprite.position, time, sprites)
+                sprites.particles.emit_smoke(sprite.position, 50)
 
                 self.remove_from_sprite_lists()
                 if hasattr(sprite, 'hurt'):
@@ -155,43 +151,39 @@ class FireBall(Bullet):
 
         """
         if type(sprite) == BLOCK.GOLD:
-            make_explosion_particles(ParticleGold, sprite.position, time, sprites)
+            make_explosion_particles(ParticleKind.GOLD, sprite.position, time, sprites)
             block_grid.break_block(sprite, sprites)
             self.remove_from_sprite_lists()
 
         elif type(sprite) == BLOCK.COAL:
-            make_explosion_particles(ParticleCoal, sprite.position, time, sprites)
-            smoke = Smoke(50)
-            smoke.position = sprite.position
-            sprites.explosion_list.append(smoke)
+            make_explosion_particles(ParticleKind.COAL, sprite.position, time, sprites)
+            sprites.particles.emit_smoke(sprite.position, 50)
             block_grid.break_block(sprite, sprites)
             self.remove_from_sprite_lists()
 
         elif type(sprite) == BLOCK.DIRT:
-            make_explosion_particles(ParticleDirt, sprite.position, time, sprites)
+            make_explosion_particles(ParticleKind.DIRT, sprite.position, time, sprites)
             block_grid.break_block(sprite, sprites)
             self.remove_from_sprite_lists()
 
-        elif sprite in sprites.indestructible_blocks_list:
-            make_explosion_particles(ParticleDirt, sprite.position, time, sprites)
+        elif sprites.indestructible_blocks_list in sprite.sprite_lists:
+            make_explosion_particles(ParticleKind.DIRT, sprite.position, time, sprites)
             self.remove_from_sprite_lists()
 
         # The second and statement here makes sure the bullet doesnt belong to the sprite that shot it.
-        elif sprite in (*sprites.enemy_list, sprites.drill):
+        elif sprite is sprites.drill or sprites.enemy_list in sprite.sprite_lists:
             # Little check to make sure the bullet isn't hitting the turret or any parent. Bullets spawn inside this.
             if sprite in self.get_all_parents:
                 return
 
             if hasattr(sprite, 'shield_enabled') and sprite.shield_enabled is True:
-                make_explosion_particles(ParticleShield, sprite.position, time, sprites)
+                make_explosion_particles(ParticleKind.SHIELD, sprite.position, time, sprites)
                 self.remove_from_sprite_lists()
 
             else:
 
-                make_explosion_particles(ParticleDirt, sprite.position, time, sprites)
-                smoke = Smoke(50)
-                smoke.position = sprite.position
-                sprites.explosion_list.append(smoke)
+                make_explosion_particles(ParticleKind.DIRT, sprite.position, time, sprites)
+                sprites.particles.emit_smoke(sprite.position, 50)
 
                 self.remove_from_sprite_lists()
                 if hasattr(sprite, 'hurt'):
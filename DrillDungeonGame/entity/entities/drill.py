@@ -10,6 +10,7 @@ from .turret import Turret
 from ..entity import Entity
 from ..mixins import DiggingMixin, ControllableMixin, ShotType
 from ...inventory import Inventory
+from ...map import BLOCK
 
 
 class Drill(Entity, DiggingMixin, ControllableMixin):
@@ -102,14 +103,24 @@ class Drill(Entity, DiggingMixin, ControllableMixin):
 
         self._hurt_sound = arcade.load_sound("resources/sound/hit_marker.wav")
 
+    @property
+    def shield_level(self) -> float:
+        """How long the shield can last as a fraction of the longest it can be upgraded to, from 0 to 1."""
+        return self._shield_duration / self._max_shield_duration
+
+    @property
+    def shield_remaining(self) -> float:
+        """How much of the shield's duration is left to use, from 0 to 1."""
+        return (self._shield_duration - self._total_shield_uptime) / self._shield_duration
+
     def draw_shield_bar(self, position_x, position_y, width, height):
         """Draws a shield health below the drill when shield activated."""
-        level_width = (self._shield_duration/self._max_shield_duration)*width
+        level_width = self.shield_level*width
         position_x = position_x - width/2 + level_width/2
         arcade.draw_rectangle_filled(
             position_x, position_y, level_width, height, arcade.color.WHITE
         )
-        status_width = ((self._shield_duration-self._total_shield_uptime) / self._shield_duration) * level_width
+        status_width = self.shield_remaining * level_width
         arcade.draw_rectangle_filled(
             position_x - (level_width / 2 - status_width / 2),
             position_y,
@@ -220,22 +231,21 @@ class Drill(Entity, DiggingMixin, ControllableMixin):
         if not self.shield_enabled:
             super().hurt(damage)
 
-    def check_ground_for_drilling(self, sprites) -> bool:
+    def check_ground_for_drilling(self, block_grid) -> bool:
         """
         Checks to see if the drill is above drillable dirt
 
         Parameters
         ----------
-        sprites   :   SpriteContainer
-            The sprite container for the map the drill is currently on
+        block_grid  :   BlockGrid
+            The block grid for the map the drill is currently on
 
         Returns
         -------
         return    :   boolean
             True if the ground can be drilled, false otherwise
         """
-        drillable_blocks_list = sprites.drill_down_list
-        if len(arcade.check_for_collision_with_list(self, drillable_blocks_list)):
+        if len(block_grid.blocks_overlapping(self, (BLOCK.DRILLDOWN,))):
             return True
         else:
             return False
@@ -89,7 +89,7 @@ class NecromancerEnemy(Enemy, DiggingMixin, PathFindingMixin):
         """
         if (time - self._last_line_of_sight_check_time) > 1:
             self._last_line_of_sight_check_time = time
-            if self.has_line_of_sight_with(sprites.drill, sprites.all_blocks_list):
+            if self.can_see_drill(block_grid):
                 self._has_line_of_sight_with_drill = True
             else:
                 self._has_line_of_sight_with_drill = False
@@ -102,6 +102,6 @@ class NecromancerEnemy(Enemy, DiggingMixin, PathFindingMixin):
 
             if (time - self._last_pathfind_time) > 1:
                 self._last_pathfind_time = time
-                self.path_to_position(sprites.drill.center_x, sprites.drill.center_y, sprites.all_blocks_list)
+                self.follow_flow_field(block_grid.flow_field, block_grid)
 
         super().update(time, delta_time, sprites, block_grid)
@@ -67,7 +67,7 @@ class WizardBoss(Enemy, DiggingMixin, PathFindingMixin):
                          current_health=current_health, max_health=max_health,
                          idle_textures=idle_textures, moving_textures=moving_textures,
                          time_between_animation_texture_updates=time_between_animation_texture_updates)
-        PathFindingMixin.__init__(self, vision)
+        PathFindingMixin.__init__(self, vision, long_range=True)
         self.children.append(Turret(turret_sprite, turret_scale, parent=self, bullet_type=FireBall,
                                     firing_mode=ShotType.SINGLE))
 
@@ -96,7 +96,7 @@ class WizardBoss(Enemy, DiggingMixin, PathFindingMixin):
         """
         if (time - self._last_line_of_sight_check_time) > 1:
             self._last_line_of_sight_check_time = time
-            if self.has_line_of_sight_with(sprites.drill, sprites.all_blocks_list):
+            if self.can_see_drill(block_grid):
                 self._has_line_of_sight_with_drill = True
             else:
                 self._has_line_of_sight_with_drill = False
@@ -109,6 +109,6 @@ class WizardBoss(Enemy, DiggingMixin, PathFindingMixin):
 
             if (time - self._last_pathfind_time) > 1:
                 self._last_pathfind_time = time
-                self.path_to_position(sprites.drill.center_x, sprites.drill.center_y, sprites.all_blocks_list)
+                self.follow_flow_field(block_grid.flow_field, block_grid)
 
         super().update(time, delta_time, sprites, block_grid)
\ No newline at end of file
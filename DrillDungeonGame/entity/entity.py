@@ -20,7 +20,7 @@ class Entity(arcade.Sprite):
         Returns all children.
     hurt(damage: Union[float, int])
         Deals damage to target.
-    has_line_of_sight_with(entity: Entity, blocking_sprites: arcade.SpriteList)
+    has_line_of_sight_with(entity: Entity, blocking_sprites: Union[BlockGrid, arcade.SpriteList])
         Returns TRUE if line of sight is established with other entity.
     look_at(x: float, y: float)
         Set entity to face a certain position.
@@ -202,7 +202,7 @@ class Entity(arcade.Sprite):
             border_width=1.5
         )
 
-    def has_line_of_sight_with(self, entity: Entity, blocking_sprites: arcade.SpriteList) -> bool:
+    def has_line_of_sight_with(self, entity: Entity, blocking_sprites: Union[BlockGrid, arcade.SpriteList]) -> bool:
         """
 
         Returns True is this class has line of site with another given entity, given a list of obstacles.
@@ -211,8 +211,9 @@ class Entity(arcade.Sprite):
         ----------
         entity: Entity
             The entity to check if if this entity has line of sight with.
-        blocking_sprites: arcade.SpriteList
-            The sprite list containing sprites which block line of sight.
+        blocking_sprites: Union[BlockGrid, arcade.SpriteList]
+            The sprite list containing sprites which block line of sight. Passing a BlockGrid instead is much quicker,
+            as only the blocks along the line are checked rather than every sprite in the list.
 
         Returns
         -------
@@ -220,6 +221,8 @@ class Entity(arcade.Sprite):
             True if there is line of sight, False otherwise.
 
         """
+        if isinstance(blocking_sprites, BlockGrid):
+            return blocking_sprites.has_line_of_sight(*self.position, *entity.position, 200)
         return arcade.has_line_of_sight(self.position, entity.position, blocking_sprites, 200)
 
     def look_at(self, x: float, y: float) -> None:
@@ -416,9 +419,6 @@ class Entity(arcade.Sprite):
         """
         self.update_collision_engine(time, delta_time, sprites, block_grid)
 
-        if self.is_animated:
-            self.update_animation(delta_time)
-
         for mixin in self.__class__.__mro__:
             # Used to be issubclass(mixin, Entity), but entity inherits from arcade.Sprite now. So we also don't want
             # to pass the sprite list to the update function of arcade.Sprite as this doesn't take args. We use
@@ -40,9 +40,7 @@ class DiggingMixin:
         block_grid : BlockGrid
             Reference to all blocks in the game.
         """
-        blocks_to_remove = []
-        destructible_blocks = sprites.destructible_blocks_list
-        blocks_to_remove.extend(arcade.check_for_collision_with_list(self, destructible_blocks))
+        blocks_to_remove = block_grid.blocks_overlapping(self, (BLOCK.DIRT, BLOCK.COAL, BLOCK.GOLD))
         for block in blocks_to_remove:
             if hasattr(self, 'inventory') and self.inventory is not None:
                 if type(block) == BLOCK.COAL:
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import math
-from typing import Tuple, List, Union, Callable
+from typing import Tuple, List, Optional, Union, Callable
 
 import arcade
 
 from ..entity import Entity
-from ...utility import BLOCK_PIXEL_SIZE, is_near
+from ...map.block_grid import BlockGrid
+from ...map.flow_field import FlowField
+from ...utility import BLOCK_PIXEL_SIZE, is_near, pixel_to_tile, tile_to_pixel
 
 
 class PathFindingMixin:
@@ -20,10 +22,16 @@ class PathFindingMixin:
 
     Methods
     -------
-    path_to_entity(entity: Entity, blocking_sprites: arcade.SpriteList, diagonal_movement: bool = True)
+    path_to_entity(entity: Entity, blocking_sprites: Union[BlockGrid, arcade.SpriteList],
+                   diagonal_movement: bool = True)
         Automatically unpacks entity coordinates.
-    path_to_position(x: float, y: float, blocking_sprites: arcade.SpriteList, diagonal_movement: bool = True)
+    path_to_position(x: float, y: float, blocking_sprites: Union[BlockGrid, arcade.SpriteList],
+                     diagonal_movement: bool = True)
         Stores a list of tuples[float, float] in the path attribute.
+    path_across_map(x: float, y: float, block_grid: BlockGrid)
+        Stores the path to a position anywhere on the map in the path attribute.
+    follow_flow_field(flow_field: FlowField, block_grid: Optional[BlockGrid] = None)
+        Stores the path to the target of a flow field in the path attribute.
     move_towards(x: Union[float, int], y: Union[float, int], use_angle: bool = False)
         Moves towards the position specified.
     update(self, time: float, delta_time: float, sprites, block_grid)
@@ -43,16 +51,20 @@ class PathFindingMixin:
     look_at: Callable[[float, float], None]
     stop_moving: Callable[[None], None]
 
-    def __init__(self, vision: Union[float, int]) -> None:
+    def __init__(self, vision: Union[float, int], long_range: bool = False) -> None:
         """
         Parameters
         ----------
         vision: Union[float, int]
             The distance that this entity can see.
+        long_range: bool
+            Whether paths that leave a flow field are found with path_across_map rather than path_to_position, so
+            they aren't limited to what this entity can see. Defaults to False.
         """
         self.vision = vision  # How far the path finding can see.
+        self.long_range = long_range
 
-    def path_to_entity(self, entity: Entity, blocking_sprites: arcade.SpriteList,
+    def path_to_entity(self, entity: Entity, blocking_sprites: Union[BlockGrid, arcade.SpriteList],
                        diagonal_movement: bool = True) -> None:
         """
         Used as a shortcut to path_to_position. Automatically unpacks entity coordinates.
@@ -65,15 +77,15 @@ class PathFindingMixin:
         ----------
         entity: Entity
             The entity to path towards.
-        blocking_sprites: arcade.SpriteList
-            A list of sprites to avoid colliding with when calculating the path.
+        blocking_sprites: Union[BlockGrid, arcade.SpriteList]
+            The block grid to path through, or a list of sprites to avoid colliding with when calculating the path.
         diagonal_movement: bool
             Whether or not the path can include diagonal movement. Defaults to True.
 
         """
         return self.path_to_position(entity.center_x, entity.center_y, blocking_sprites, diagonal_movement)
 
-    def path_to_position(self, x: float, y: float, blocking_sprites: arcade.SpriteList,
+    def path_to_position(self, x: float, y: float, blocking_sprites: Union[BlockGrid, arcade.SpriteList],
                          diagonal_movement: bool = True) -> None:
         """
         Stores a list of tuples[float, float] in the path attribute, consisting of x, y coordinates of the path
@@ -85,11 +97,35 @@ class PathFindingMixin:
             The x position on the map to try to pathfind to.
         y: float
             The y position on the map to try to pathfind to.
-        blocking_sprites: arcade.SpriteList
-            A list of sprites to avoid colliding with when calculating the path.
+        blocking_sprites: Union[BlockGrid, arcade.SpriteList]
+            The block grid to path through, or a list of sprites to avoid colliding with when calculating the path.
+            Given a block grid, an empty path is stored straight away if its ConnectedRegions show the position
+            can't be reached at all, and a path still in its PathCache is stored straight away. Otherwise the request is
+            queued on its PathRequestQueue, and the path is stored once the queue gets round to finding it (the
+            current path is kept until then). Each point of the path is the center of a block. Given a sprite list,
+            arcade's A* is used instead and the path is stored straight away.
         diagonal_movement: bool
             Whether or not the path can include diagonal movement. Defaults to True.
         """
+        if isinstance(blocking_sprites, BlockGrid):
+            bounds = (pixel_to_tile(self.center_x - self.vision), pixel_to_tile(self.center_y - self.vision),
+                      pixel_to_tile(self.center_x + self.vision), pixel_to_tile(self.center_y + self.vision))
+            start = pixel_to_tile(self.center_x), pixel_to_tile(self.center_y)
+            goal = pixel_to_tile(x), pixel_to_tile(y)
+            if not blocking_sprites.regions.connected(start, goal):
+                blocking_sprites.path_requests.cancel(self)
+                self._set_block_path(None)  # Sealed off from the goal, so there's no point searching.
+                return
+
+            cached = blocking_sprites.path_cache.get(start, goal, diagonal_movement, bounds)
+            if cached is not None:
+                blocking_sprites.path_requests.cancel(self)
+                self._set_block_path(cached.path)
+            else:
+                blocking_sprites.path_requests.request(self, start, goal, diagonal_movement, bounds,
+                                                       self._set_block_path)
+            return
+
         barrier_list = arcade.AStarBarrierList(self, blocking_sprites, BLOCK_PIXEL_SIZE,
                                                int(self.center_x - self.vision), int(self.center_x + self.vision),
                                                int(self.center_y - self.vision), int(self.center_y + self.vision))
@@ -99,6 +135,58 @@ class PathFindingMixin:
         self.path = path if path is not None else []
         self.path_index = 0
 
+    def path_across_map(self, x: float, y: float, block_grid: BlockGrid) -> None:
+        """
+        Stores a list of tuples[float, float] in the path attribute, consisting of x, y coordinates of a path to the
+        position specified. Unlike path_to_position the path isn't limited to what this entity can see, as it is
+        found by the block grid's HierarchicalPathFinder, which stays cheap however far away the position is.
+
+        Parameters
+        ----------
+        x: float
+            The x position on the map to try to pathfind to.
+        y: float
+            The y position on the map to try to pathfind to.
+        block_grid: BlockGrid
+            The block grid to path through.
+        """
+        start = pixel_to_tile(self.center_x), pixel_to_tile(self.center_y)
+        goal = pixel_to_tile(x), pixel_to_tile(y)
+        if not block_grid.regions.connected(start, goal):
+            self._set_block_path(None)
+            return
+        self._set_block_path(block_grid.hierarchical_path_finder.find_path(start, goal))
+
+    def follow_flow_field(self, flow_field: FlowField, block_grid: Optional[BlockGrid] = None) -> None:
+        """
+        Stores a list of tuples[float, float] in the path attribute, consisting of x, y coordinates of the path
+        from this entity to the target of a flow field. Reading a path off a flow field is much cheaper than
+        path_to_position, as the search has already been done once for every entity heading for the same target.
+
+        Parameters
+        ----------
+        flow_field: FlowField
+            The flow field to follow. Stores an empty path if the target can't be reached from here.
+        block_grid: Optional[BlockGrid]
+            The block grid the flow field is laid over. If given and the target can't be reached within the field,
+            say because the way round a wall leaves it, the path is searched for with path_to_position instead, or
+            path_across_map if this entity paths at long range.
+        """
+        cells = flow_field.path_from(pixel_to_tile(self.center_x), pixel_to_tile(self.center_y))
+        if cells or block_grid is None or flow_field.target is None:
+            self._set_block_path(cells)
+            return
+        target_x, target_y = tile_to_pixel(flow_field.target[0]), tile_to_pixel(flow_field.target[1])
+        if self.long_range:
+            self.path_across_map(target_x, target_y, block_grid)
+        else:
+            self.path_to_position(target_x, target_y, block_grid)
+
+    def _set_block_path(self, cells: Optional[List[Tuple[int, int]]]) -> None:
+        self.path = [(int(tile_to_pixel(cell_x)), int(tile_to_pixel(cell_y)))
+                     for cell_x, cell_y in cells] if cells is not None else []
+        self.path_index = 0
+
     def move_towards(self, x: Union[float, int], y: Union[float, int], use_angle: bool = False) -> None:
         """
         Moves towards the position specified. If use_angle is true, it saves some computation of having to
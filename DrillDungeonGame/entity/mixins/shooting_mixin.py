@@ -9,6 +9,7 @@ import arcade
 from ..bullet import Bullet
 from ..entity import Entity
 from ...inventory import Inventory
+from ...map.block_grid import BlockGrid
 
 
 class ShotType(Enum):
@@ -41,7 +42,7 @@ class ShootingMixin:
     center_x: float
     center_y: float
     speed = Union[float, int]
-    has_line_of_sight_with: Callable[[Entity, arcade.SpriteList], bool]
+    has_line_of_sight_with: Callable[[Entity, Union[BlockGrid, arcade.SpriteList]], bool]
     remove_from_sprite_lists: Callable[[None], None]
     inventory: Inventory
     angle: float
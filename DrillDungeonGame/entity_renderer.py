@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Iterable, List, Tuple
+
+import arcade
+
+from .entity.bullet import Bullet
+from .entity.enemy import Enemy
+from .entity.entity import Entity
+
+HEALTH_BAR_HEIGHT = 5
+HEALTH_BAR_OFFSET = 20  # How many pixels below the centre of an enemy its health bar is drawn.
+HEALTH_BAR_BORDER = 1.5
+
+
+class EntityRenderer:
+    """
+
+    Draws every entity of a level, and everything attached to them, in a handful of batched draw calls.
+
+    Notes
+    -----
+    Entity.draw draws an entity with arcade.Sprite.draw, then each of its children the same way, so every sprite
+    costs its own draw call. Instead, the renderer keeps every entity body, every child such as turrets and shields,
+    and every bullet in one of three SpriteLists that persist between frames, and draws each list at once. As a
+    sprite tells every SpriteList it is in when it moves or changes texture, nothing has to be rebuilt each frame.
+
+    The draw order matches drawing each entity in turn as closely as layers allow: enemy health bars first, then
+    bodies, then children, then bullets. Within a layer sprites are drawn in the order they were added, so the drill,
+    which comes after the enemies, is drawn over them.
+
+    Killed entities and spent bullets take themselves out of every SpriteList, these included. Before drawing, any
+    sprite that isn't one of the entities being drawn or one of their children (eg. an enemy that has gone off the
+    screen, or a shield taken off its parent) is dropped, and any new entities, children or bullets are added. As
+    SpriteList.remove re-indexes the whole list, a list that has sprites to drop is instead rebuilt in one pass.
+
+    Methods
+    -------
+    sync(entities: Iterable[Entity])
+        Brings the sprite lists in line with a set of entities and their children.
+    draw(entities: Iterable[Entity])
+        Draws a set of entities, their children and the health bars of enemies.
+    clear()
+        Empties the sprite lists, letting go of every sprite.
+
+    """
+    def __init__(self) -> None:
+        self.body_list = arcade.SpriteList()
+        self.child_list = arcade.SpriteList()
+        self.bullet_list = arcade.SpriteList()
+
+    def sync(self, entities: Iterable[Entity]) -> None:
+        """
+
+        Brings the sprite lists in line with a set of entities and their children, adding any that are new and
+        dropping any that have been taken away from their entity.
+
+        Parameters
+        ----------
+        entities    :   Iterable[Entity]
+            The entities to draw, in the order to draw them.
+
+        """
+        entities = list(entities)
+        children = [child for entity in entities for child in entity.get_all_children()]
+        keep = set(children)
+        if any(sprite not in keep for sprite in self.child_list):
+            self.child_list = _rebuilt(self.child_list, [sprite for sprite in self.child_list if sprite in keep])
+        if any(sprite not in keep for sprite in self.bullet_list):
+            self.bullet_list = _rebuilt(self.bullet_list, [sprite for sprite in self.bullet_list if sprite in keep])
+
+        if self.body_list.sprite_list != entities:  # Only when the entities change, to keep the drill drawn last.
+            self.body_list = _rebuilt(self.body_list, entities)
+        for child in children:
+            _add_once(child, self.bullet_list if isinstance(child, Bullet) else self.child_list)
+
+    def draw(self, entities: Iterable[Entity]) -> None:
+        """
+
+        Draws a set of entities, their children and the health bars of enemies.
+
+        Parameters
+        ----------
+        entities    :   Iterable[Entity]
+            The entities to draw, in the order to draw them.
+
+        """
+        entities = list(entities)
+        self.sync(entities)
+
+        health_bars = [entity for entity in entities
+                       if isinstance(entity, Enemy) and entity.current_health != -1 and entity.max_health != -1]
+        if health_bars:
+            points, colors = _health_bar_quads(health_bars)
+            arcade.create_rectangles_filled_with_colors(points, colors).draw()
+
+        self.body_list.draw()
+        self.child_list.draw()
+        self.bullet_list.draw()
+
+    def clear(self) -> None:
+        self.body_list = _rebuilt(self.body_list, [])
+        self.child_list = _rebuilt(self.child_list, [])
+        self.bullet_list = _rebuilt(self.bullet_list, [])
+
+
+def _rebuilt(sprite_list: arcade.SpriteList, sprites: List[arcade.Sprite]) -> arcade.SpriteList:
+    """Returns a new sprite list holding sprites in order, after taking every sprite out of the old one."""
+    for sprite in sprite_list:
+        sprite.sprite_lists.remove(sprite_list)
+    new_list = arcade.SpriteList()
+    new_list.extend(sprites)
+    return new_list
+
+
+def _add_once(sprite: arcade.Sprite, sprite_list: arcade.SpriteList) -> None:
+    if sprite_list not in sprite.sprite_lists:
+        sprite_list.append(sprite)
+
+
+def _health_bar_quads(enemies: List[Enemy]) -> Tuple[List[Tuple[float, float]], List[arcade.Color]]:
+    """Returns the corners and colours of the quads making up the health bars of enemies, as Enemy.draw draws them."""
+    points = []
+    colors = []
+    for enemy in enemies:
+        x, y = enemy.center_x, enemy.center_y - HEALTH_BAR_OFFSET
+        width = enemy.width
+        status_width = max(0.0, enemy.current_health / enemy.max_health) * width
+        left = x - width / 2
+        for quad_left, quad_width, quad_height, color in (
+                (left - HEALTH_BAR_BORDER, width + 2 * HEALTH_BAR_BORDER, HEALTH_BAR_HEIGHT + 2 * HEALTH_BAR_BORDER,
+                 arcade.color.BLACK),
+                (left, width, HEALTH_BAR_HEIGHT, arcade.color.WHITE),
+                (left, status_width, HEALTH_BAR_HEIGHT, arcade.color.GREEN)):
+            bottom, top = y - quad_height / 2, y + quad_height / 2
+            points.extend(((quad_left, bottom), (quad_left + quad_width, bottom),
+                           (quad_left + quad_width, top), (quad_left, top)))
+            colors.extend((color,) * 4)
+    return points, colors
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+import arcade
+
+from .entity.entities import Drill
+from .utility import SCREEN_WIDTH, SCREEN_HEIGHT
+
+HUD_PANEL_ALPHA = 150
+HEALTH_BAR = (80, 50, 130, 20)  # The centre x and y, width and height of the drill's health bar on the screen.
+SHIELD_BAR = (80, 20, 130, 20)
+BAR_BORDER = 1.5
+
+
+def create_3d_rectangle(center_x: float, center_y: float, width: float, height: float, face_color: arcade.Color,
+                        highlight_color: arcade.Color, shadow_color: arcade.Color,
+                        shadow_thickness: float) -> List[arcade.Shape]:
+    """
+    Returns the shapes of a rectangle with shadow and thickness, to be put in a ShapeElementList and drawn with
+    everything else in it.
+
+    Parameters
+    ----------
+    center_x           :  float
+        center x coordinate position of rectangle
+    center_y           :  float
+        center y coordinate position of rectangle
+    width              :  float
+        width of rectangle
+    height             :  float
+        height of rectangle
+    face_color         :  arcade.color
+        colour of rectangle face
+    highlight_color    :  arcade.color
+        highlight colour of the top and left edges
+    shadow_color       :  arcade.color
+        shadow colour of the bottom and right edges
+    shadow_thickness   :  float
+        thickness of the edges
+
+    Returns
+    -------
+    List[arcade.Shape]
+        The face, then the bottom, right, top and left edges.
+    """
+    left, right = center_x - width / 2, center_x + width / 2
+    bottom, top = center_y - height / 2, center_y + height / 2
+    return [arcade.create_rectangle_filled(center_x, center_y, width, height, face_color),
+            arcade.create_line(left, bottom, right, bottom, shadow_color, shadow_thickness),
+            arcade.create_line(right, bottom, right, top, shadow_color, shadow_thickness),
+            arcade.create_line(left, top, right, top, highlight_color, shadow_thickness),
+            arcade.create_line(left, bottom, left, top, highlight_color, shadow_thickness)]
+
+
+def shape_list(shapes: List[arcade.Shape]) -> arcade.ShapeElementList:
+    """Returns a ShapeElementList holding the given shapes, so they can be drawn together."""
+    shape_element_list = arcade.ShapeElementList()
+    for shape in shapes:
+        shape_element_list.append(shape)
+    return shape_element_list
+
+
+class HUDText:
+    """
+    A line of text on the screen that is only rasterized again when the text changes.
+
+    Notes
+    -----
+    arcade.draw_text caches the image of each string it has drawn, but still looks it up, places it and draws it in
+    a SpriteList of its own every call. A HUDText keeps its image on a sprite that can be put in a SpriteList with
+    other text, so all of it is drawn at once.
+
+    Attributes
+    ----------
+    sprite          : arcade.Sprite
+        The sprite showing the text.
+    rasterizations  : int
+        How many times the text has been drawn to an image.
+    """
+    def __init__(self, start_x: float, start_y: float, color: arcade.Color = arcade.color.BLACK,
+                 font_size: float = 12) -> None:
+        """
+        Parameters
+        ----------
+        start_x     : float
+            The x position of the left of the text on the screen.
+        start_y     : float
+            The y position of the bottom of the text on the screen.
+        color       : arcade.Color
+            The colour of the text.
+        font_size   : float
+            The size of the text.
+        """
+        self.start_x = start_x
+        self.start_y = start_y
+        self.color = color
+        self.font_size = font_size
+        self.sprite = arcade.Sprite()
+        self.rasterizations = 0
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> Optional[str]:
+        return self._text
+
+    @text.setter
+    def text(self, text: str) -> None:
+        if text == self._text:
+            return
+        self._text = text
+        image = arcade.get_text_image(text=text, text_color=self.color, font_size=self.font_size)
+        self.sprite.texture = arcade.Texture(f"hud_text:{text}:{self.color}:{self.font_size}", image)
+        # Placed as arcade.draw_text places text anchored at its left and baseline.
+        self.sprite.center_x = self.start_x + image.width / 2
+        self.sprite.center_y = self.start_y + image.height / 2
+        self.rasterizations += 1
+
+
+class HUD:
+    """
+    Draws the score, health and shield bars and inventory over the game in a few draw calls.
+
+    Notes
+    -----
+    The panels behind the HUD never change, so they are made into one ShapeElementList the first time the HUD is
+    drawn. The bars are another, rebuilt only when one of them changes by at least a pixel. The text is rasterized
+    again only when the score or the drill's ammunition, coal or gold change, and is drawn in one SpriteList. The
+    HUD is drawn in screen coordinates, so nothing has to be moved when the view scrolls.
+
+    Methods
+    -------
+    update(score: int, drill: Drill)
+        Brings the text and bars in line with the score and the drill.
+    draw(score: int, drill: Drill)
+        Draws the HUD over the screen.
+    """
+    def __init__(self) -> None:
+        self.score_text = HUDText(643, 574, font_size=18)
+        self.inventory_text = HUDText(10, 60, font_size=20)
+        self.text_list = arcade.SpriteList()
+        self.text_list.append(self.score_text.sprite)
+        self.text_list.append(self.inventory_text.sprite)
+        self._panels: Optional[arcade.ShapeElementList] = None
+        self._bars: Optional[arcade.ShapeElementList] = None
+        self._bar_widths: Optional[Tuple[int, int, int]] = None
+        self._bar_geometry = ()
+
+    def update(self, score: int, drill: Drill) -> None:
+        """
+        Brings the text and bars in line with the score and the drill, redrawing only what has changed.
+
+        Parameters
+        ----------
+        score   : int
+            The player's score.
+        drill   : Drill
+            The drill to show the health, shield and inventory of.
+        """
+        self.score_text.text = f"Score: {score}"
+        self.inventory_text.text = f"Ammunition: {drill.inventory.ammunition}\nCoal:{drill.inventory.coal}" \
+                                   f"\nGold:{drill.inventory.gold}"
+
+        # The bars only look different once one of them has changed by a pixel.
+        health_width = max(0.0, drill.current_health / drill.max_health) * HEALTH_BAR[2]
+        level_width = drill.shield_level * SHIELD_BAR[2]
+        shield_width = max(0.0, drill.shield_remaining) * level_width
+        bar_widths = (round(health_width), round(level_width), round(shield_width))
+        if bar_widths != self._bar_widths:
+            self._bar_widths = bar_widths
+            self._bar_geometry = ((*HEALTH_BAR, health_width, arcade.color.GREEN),
+                                  (SHIELD_BAR[0] - SHIELD_BAR[2] / 2 + level_width / 2, SHIELD_BAR[1], level_width,
+                                   SHIELD_BAR[3], shield_width, arcade.color.BLUE))
+            self._bars = None
+
+    def draw(self, score: int, drill: Drill) -> None:
+        """
+        Draws the HUD over the screen, whatever the view has scrolled to.
+
+        Parameters
+        ----------
+        score   : int
+            The player's score.
+        drill   : Drill
+            The drill to show the health, shield and inventory of.
+        """
+        self.update(score, drill)
+        if self._panels is None:
+            panel_colors = (arcade.color.LIGHT_GRAY + (HUD_PANEL_ALPHA,), arcade.color.WHITE + (HUD_PANEL_ALPHA,),
+                            arcade.color.GRAY + (HUD_PANEL_ALPHA,))
+            self._panels = shape_list(create_3d_rectangle(718, 587, 160, 25, *panel_colors, 1) +
+                                      create_3d_rectangle(110, 70, 220, 140, *panel_colors, 2))
+        if self._bars is None:
+            self._bars = shape_list([shape for bar in self._bar_geometry for shape in _bar_shapes(*bar)])
+
+        viewport = arcade.get_viewport()
+        arcade.set_viewport(0, SCREEN_WIDTH, 0, SCREEN_HEIGHT)
+        self._panels.draw()
+        self._bars.draw()
+        self.text_list.draw()
+        arcade.set_viewport(*viewport)
+
+
+def _bar_shapes(center_x: float, center_y: float, bar_width: float, height: float, status_width: float,
+                status_color: arcade.Color) -> List[arcade.Shape]:
+    """Returns the shapes of a bar as Entity.draw_health_bar draws it: white, filled from the left, outlined."""
+    status_x = center_x - (bar_width / 2 - status_width / 2)
+    return [arcade.create_rectangle_filled(center_x, center_y, bar_width, height, arcade.color.WHITE),
+            arcade.create_rectangle_filled(status_x, center_y, status_width, height, status_color),
+            arcade.create_rectangle_outline(center_x, center_y, bar_width, height, arcade.color.BLACK,
+                                            border_width=BAR_BORDER)]
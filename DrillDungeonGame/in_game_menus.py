@@ -1,53 +1,10 @@
 import arcade
 
 from .entity.mixins import ShotType
+from .hud import create_3d_rectangle, shape_list
 from .utility import SCREEN_WIDTH, SCREEN_HEIGHT
 
 
-def draw_3d_rectangle(center_x, center_y, width, height, face_color,
-                      highlight_color, shadow_color, shadow_thickness):
-    """
-    Draws a rectangle with shadow and thickness
-
-    Parameters
-    ----------
-    center_x           :  int
-        center x coordinate position of rectangle
-    center_y           :  int
-        center y coordinate position of rectangle
-    width              :  int
-        width of rectangle
-    height             :  int
-        height of rectangle
-    face_color         :  arcade.color
-        colour of rectangle face
-    highlight_color    :  arcade.color
-        highlight colour of rectangle face
-    shadow_color       :  arcade.color
-        shadow colour of rectangle face
-    shadow_thickness   :  int
-        thickness of rectangle
-    """
-    arcade.draw_rectangle_filled(center_x, center_y, width,
-                                 height, face_color)
-    # Bottom horizontal
-    arcade.draw_line(center_x - width / 2, center_y - height / 2,
-                     center_x + width / 2, center_y - height / 2,
-                     shadow_color, shadow_thickness)
-    # Right vertical
-    arcade.draw_line(center_x + width / 2, center_y - height / 2,
-                     center_x + width / 2, center_y + height / 2,
-                     shadow_color, shadow_thickness)
-    # Top horizontal
-    arcade.draw_line(center_x - width / 2, center_y + height / 2,
-                     center_x + width / 2, center_y + height / 2,
-                     highlight_color, shadow_thickness)
-    # Left vertical
-    arcade.draw_line(center_x - width / 2, center_y - height / 2,
-                     center_x - width / 2, center_y + height / 2,
-                     highlight_color, shadow_thickness)
-
-
 class MenuButton:
     """
     Creates grey button used for in game menus.
@@ -99,6 +56,7 @@ class MenuButton:
         self.image_y_offset = 0
 
         self.action_function = None
+        self._shapes = {}  # The shapes of the button in each colouring, made the first time it is drawn so.
 
         self.text = None
         self.font_size = 1
@@ -163,8 +121,12 @@ class MenuButton:
         else:
             color1 = self.shadow_color
             color2 = self.highlight_color
-        draw_3d_rectangle(self.center_x, self.center_y, self.width, self.height,
-                          face_color, color1, color2, self.shadow_thickness)
+        shapes = self._shapes.get((face_color, color1, color2))
+        if shapes is None:
+            shapes = self._shapes[(face_color, color1, color2)] = shape_list(create_3d_rectangle(
+                self.center_x, self.center_y, self.width, self.height, face_color, color1, color2,
+                self.shadow_thickness))
+        shapes.draw()
 
         if self.button_image != None:
             if not self.pressed:
@@ -249,7 +211,7 @@ class MenuWindow:
   Methods
   -------
   draw
-      displays window using draw_3d_rectangle to draw
+      displays window using the shapes of create_3d_rectangle
   """
 
   def __init__(self, center_x, center_y, width, height):
@@ -273,11 +235,14 @@ class MenuWindow:
       self.highlight_color = arcade.color.WHITE
       self.shadow_color = arcade.color.GRAY
       self.shadow_thickness = 2
+      self._shapes = None
 
   def draw(self):
-      draw_3d_rectangle(self.center_x, self.center_y, self.width, self.height,
-                        self.face_color, self.highlight_color, self.shadow_color,
-                        self.shadow_thickness)
+      if self._shapes is None:
+          self._shapes = shape_list(create_3d_rectangle(self.center_x, self.center_y, self.width, self.height,
+                                                        self.face_color, self.highlight_color, self.shadow_color,
+                                                        self.shadow_thickness))
+      self._shapes.draw()
 
 
 class InGameMenu(arcade.View):
@@ -461,6 +426,7 @@ class ShopItem:
         self.buy_button = None
         self.reusable=reusablility
         self.available = True
+        self._shapes = {}  # The panel behind the item at each height it has been drawn at.
 
     def setup_button(self, center_y):
         """
@@ -495,7 +461,11 @@ class ShopItem:
 
 
     def draw(self, center_y):
-        draw_3d_rectangle(self.center_x, center_y, 450, 50, arcade.color.LIGHT_GRAY, arcade.color.WHITE, arcade.color.GRAY, 2)
+        shapes = self._shapes.get(center_y)
+        if shapes is None:
+            shapes = self._shapes[center_y] = shape_list(create_3d_rectangle(
+                self.center_x, center_y, 450, 50, arcade.color.LIGHT_GRAY, arcade.color.WHITE, arcade.color.GRAY, 2))
+        shapes.draw()
         if self.can_afford() and self.available:
           self.buy_button.draw()
         else:
@@ -613,6 +583,7 @@ class ShopMenu(InGameMenu):
 
         self.repair_button = None
         self.repair_cost = 1
+        self._tab_bar = None
 
     def add_ammo(self, amount):
         self.game_view.drill.inventory.ammunition += amount
@@ -635,6 +606,7 @@ class ShopMenu(InGameMenu):
         super().on_show()
         self.tab_list = []
         self.tab_position = 0
+        self._tab_bar = None  # The screen centre may have moved since the shop was last shown.
         self.upgrades_tab = ShopTab("Upgrades", self.screen_center_y+40)
         self.ammo_tab = ShopTab("Ammo", self.screen_center_y+40)
         close_button = MenuButton(self.screen_center_x-230, self.screen_center_y+180, 28, 28)
@@ -699,7 +671,10 @@ class ShopMenu(InGameMenu):
         arcade.draw_text("Shop", self.screen_center_x, self.screen_center_y+160, arcade.color.BLACK, font_size=20, anchor_x="center")
         arcade.draw_text("Gold: "+str(self.game_view.drill.inventory.gold), self.screen_center_x-210, self.screen_center_y+135, arcade.color.BLACK, font_size=16, anchor_x="center")
 
-        arcade.draw_rectangle_filled(self.screen_center_x, self.screen_center_y+110, 450, 30, arcade.color.GRAY)
+        if self._tab_bar is None:
+            self._tab_bar = shape_list([arcade.create_rectangle_filled(self.screen_center_x, self.screen_center_y+110,
+                                                                       450, 30, arcade.color.GRAY)])
+        self._tab_bar.draw()
         arcade.draw_text(self.tab_list[self.tab_position].tab_name, self.screen_center_x, self.screen_center_y+98, arcade.color.BLACK, font_size=18, anchor_x="center")
 
         for button in self.button_list:
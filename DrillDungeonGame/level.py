@@ -1,23 +1,229 @@
+from __future__ import annotations
+
 import arcade
 import random
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple, Type
+
 import numpy as np
 
+from .ai_level_of_detail import AILevelOfDetail
+from .entity.enemy import Enemy
 from .entity.entities import Drill, NecromancerEnemy, FlyingEnemy, TankBoss, WizardBoss, SpaceshipEnemy, GoblinEnemy, FireEnemy
+from .entity_renderer import EntityRenderer
 from .map import BlockGrid, MapLayer
 from .sprite_container import SpriteContainer
+from .utility import tile_to_pixel
+from .view_margins import View
 
 
 potential_enemies = (NecromancerEnemy, FlyingEnemy, SpaceshipEnemy, GoblinEnemy, FireEnemy)
 potential_bosses = (WizardBoss, TankBoss)
 
 
+class LevelLayout:
+    """
+
+    Everything about a level that can be generated without arcade, ie. its map and where its enemies spawn.
+
+    Notes
+    -----
+    A layout only holds plain python data so that it can be generated in a worker process and sent back to the
+    game to be turned into a Level. Space for the drill is cleared when the level is made rather than here, as the
+    drill may have moved in the meantime.
+
+    Attributes
+    ----------
+    map_layer       : MapLayer
+        The generated map layer.
+    enemy_spawns    : List[Tuple[Type[Enemy], float, float, bool]]
+        The type, x and y position of each enemy to spawn, and whether it is a boss.
+
+    """
+    def __init__(self, map_layer: MapLayer, enemy_spawns: List[Tuple[Type[Enemy], float, float, bool]]) -> None:
+        self.map_layer = map_layer
+        self.enemy_spawns = enemy_spawns
+
+
+def generate_enemy_chance(current_level: int, base_enemy_chance: float) -> float:
+    """
+    Generates the odds of an enemy spawning in a given spot.
+    Enemy chance increases by a natural logarithmic scale.
+
+    Parameters
+    ----------
+    current_level       :   int
+        The index of the level the enemy would spawn in.
+    base_enemy_chance   :   float
+        The minimum chance of this type of enemy
+
+    Returns
+    -------
+    enemy_chance   :   float
+        The chance of this type of enemy on the current layer
+    """
+    enemy_chance = base_enemy_chance * (1 + np.log(current_level + 1))
+    return enemy_chance
+
+
+def generate_level_layout(current_level: int,
+                          number_of_coal_patches: int = 20,
+                          number_of_gold_patches: int = 20,
+                          number_of_dungeons: int = 3,
+                          number_of_shops: int = 20,
+                          seed: Optional[int] = None,
+                          base_enemy_chance_cave: float = 0.006,
+                          base_enemy_chance_dungeon: float = 0.006,
+                          base_boss_chance: float = 0.003) -> LevelLayout:
+    """
+
+    Generates the map and enemy spawns for a level. This doesn't touch arcade so it can be run in another process.
+
+    Parameters
+    ----------
+    current_level               : int
+        The index of the level being generated. Deeper levels have more enemies.
+    number_of_coal_patches      : int
+        Number of coal patches to be created.
+    number_of_gold_patches      : int
+        Number of gold patches to be created.
+    number_of_dungeons          : int
+        Number of dungeon rooms to be created.
+    number_of_shops             : int
+        Number of shops to be created.
+    seed                        : Optional[int]
+        Seeds the random number generators first. Worker processes start with a copy of the game's random state, so
+        without a seed every level they generate would be the same.
+    base_enemy_chance_cave      : float
+        The minimum probability of an enemy spawning in an empty cave block.
+    base_enemy_chance_dungeon   : float
+        The minimum probability of an enemy spawning in an empty dungeon floor block.
+    base_boss_chance            : float
+        The minimum probability of a boss spawning in an empty dungeon floor block.
+
+    Returns
+    -------
+    LevelLayout
+        The generated layout.
+
+    """
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
+
+    map_layer = MapLayer()
+    map_layer.get_full_map_layer_configuration(number_of_dungeons, number_of_coal_patches, number_of_gold_patches,
+                                               number_of_shops)
+
+    enemy_chance_cave = generate_enemy_chance(current_level, base_enemy_chance_cave)
+    enemy_chance_dungeon = generate_enemy_chance(current_level, base_enemy_chance_dungeon)
+    boss_chance = generate_enemy_chance(current_level, base_boss_chance)
+    configuration = map_layer.map_layer_configuration
+    caves = configuration == ord(' ')
+    floors = configuration == ord('F')
+    enemies = (caves & (np.random.rand(*configuration.shape) > (1 - enemy_chance_cave))) | \
+              (floors & (np.random.rand(*configuration.shape) > (1 - enemy_chance_dungeon)))
+    bosses = floors & ~enemies & (np.random.rand(*configuration.shape) > (1 - boss_chance))
+
+    enemy_spawns = []
+    for y, x in zip(*np.nonzero(enemies | bosses)):
+        is_boss = bool(bosses[y, x])
+        enemy_type = random.choice(potential_bosses if is_boss else potential_enemies)
+        enemy_spawns.append((enemy_type, tile_to_pixel(int(x)), tile_to_pixel(int(y)), is_boss))
+    return LevelLayout(map_layer, enemy_spawns)
+
+
+class LevelPrefetcher:
+    """
+
+    Generates the layouts of levels ahead of time in a worker process.
+
+    Notes
+    -----
+    Generating a map is slow enough to freeze the game for a moment. Requesting a layout as soon as it looks like
+    it will be needed, eg. when the drill gets close to a drill down block, means that by the time it is needed it
+    has usually already been made.
+
+    Methods
+    -------
+    request(current_level: int)
+        Starts generating the layout for a level if it isn't already being generated.
+    take(current_level: int)
+        Returns the layout for a level, waiting for it if needed, or None if it was never requested.
+    cancel_all()
+        Forgets every requested layout.
+    shutdown()
+        Forgets every requested layout and stops the worker process.
+
+    """
+    def __init__(self) -> None:
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._futures: Dict[int, Future] = {}
+
+    def request(self, current_level: int) -> None:
+        if current_level in self._futures:
+            return
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1)
+        self._futures[current_level] = self._executor.submit(generate_level_layout, current_level,
+                                                             seed=random.getrandbits(32))
+
+    def take(self, current_level: int) -> Optional[LevelLayout]:
+        future = self._futures.pop(current_level, None)
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except BrokenProcessPool:  # The worker died, so the layout is generated in this process instead.
+            self.shutdown()
+            return None
+
+    def cancel_all(self) -> None:
+        for future in self._futures.values():
+            future.cancel()
+        self._futures = {}
+
+    def shutdown(self) -> None:
+        """Forgets every requested layout and stops the worker process. A later request starts a new one."""
+        self.cancel_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+def _create_sprite_container(drill: Drill) -> SpriteContainer:
+    border_wall_list = arcade.SpriteList()
+    shop_list = arcade.SpriteList()
+    explosion_list = arcade.SpriteList()
+    entity_list = arcade.SpriteList()
+    drill_list = arcade.SpriteList()
+    enemy_list = arcade.SpriteList()
+    bullet_list = arcade.SpriteList()
+
+    all_blocks_list = arcade.SpriteList()
+    destructible_blocks_list = arcade.SpriteList()
+    indestructible_blocks_list = arcade.SpriteList()
+    drill_down_list = arcade.SpriteList()
+    return SpriteContainer(drill=drill, border_wall_list=border_wall_list, shop_list=shop_list,
+                           explosion_list=explosion_list, entity_list=entity_list,
+                           drill_list=drill_list,
+                           enemy_list=enemy_list,
+                           bullet_list=bullet_list,
+                           all_blocks_list=all_blocks_list,
+                           destructible_blocks_list=destructible_blocks_list,
+                           indestructible_blocks_list=indestructible_blocks_list,
+                           drill_down_list = drill_down_list)
+
+
 class Level:
     def __init__(self, drill: Drill,
                  current_level: int,
                  number_of_coal_patches: int = 20,
                  number_of_gold_patches: int = 20,
                  number_of_dungeons: int = 3,
-                 number_of_shops: int = 20) -> None:
+                 number_of_shops: int = 20,
+                 layout: Optional[LevelLayout] = None) -> None:
         """
 
         Set up game and initialize variables.
@@ -26,122 +232,162 @@ class Level:
         ----------
         drill                   : Drill
             The drill instance to keep constant between levels.
+        current_level           : int
+            The index of this level.
         number_of_coal_patches  : int
             Number of coal patches to be created.
         number_of_gold_patches  : int
             Number of gold patches to be created.
         number_of_dungeons      : int
             Number of dungeon rooms to be created.
+        number_of_shops         : int
+            Number of shops to be created.
+        layout                  : Optional[LevelLayout]
+            A layout that has already been generated, eg. by a LevelPrefetcher. If this is given, the numbers of
+            patches, dungeons and shops are ignored.
 
         """
-        border_wall_list = arcade.SpriteList()
-        shop_list = arcade.SpriteList()
-        explosion_list = arcade.SpriteList()
-        entity_list = arcade.SpriteList()
-        drill_list = arcade.SpriteList()
-        enemy_list = arcade.SpriteList()
-        bullet_list = arcade.SpriteList()
-
-        all_blocks_list = arcade.SpriteList()
-        destructible_blocks_list = arcade.SpriteList()
-        indestructible_blocks_list = arcade.SpriteList()
-        drill_down_list = arcade.SpriteList()
-        self.sprites = SpriteContainer(drill=drill, border_wall_list=border_wall_list, shop_list=shop_list,
-                                       explosion_list=explosion_list, entity_list=entity_list,
-                                       drill_list=drill_list,
-                                       enemy_list=enemy_list,
-                                       bullet_list=bullet_list,
-                                       all_blocks_list=all_blocks_list,
-                                       destructible_blocks_list=destructible_blocks_list,
-                                       indestructible_blocks_list=indestructible_blocks_list,
-                                       drill_down_list = drill_down_list)
-
-        # Initialize the map layer with some dungeon
-        map_layer = MapLayer()
-        map_layer_configuration = map_layer.get_full_map_layer_configuration(number_of_dungeons,
-                                                                             number_of_coal_patches,
-                                                                             number_of_gold_patches,
-                                                                             number_of_shops,
-                                                                             drill.center_x, drill.center_y)
+        self.sprites = _create_sprite_container(drill)
+
+        if layout is None:
+            layout = generate_level_layout(current_level, number_of_coal_patches, number_of_gold_patches,
+                                           number_of_dungeons, number_of_shops)
+        map_layer_configuration = layout.map_layer.create_space_for_drill(drill.center_x, drill.center_y)
         self.block_grid = BlockGrid(map_layer_configuration, self.sprites)
         self.current_level = current_level
 
-        self._populate_level_with_enemies(map_layer_configuration)
+        self._populate_level_with_enemies(layout.enemy_spawns)
+        self.ai_level_of_detail = AILevelOfDetail()
+        self.entity_renderer = EntityRenderer()
         # Set viewpoint boundaries - where the drill currently has scrolled to
         self.time = 0
         self.frame = 0
 
-    def _populate_level_with_enemies(self,
-                                     map_layer_configuration,
-                                     base_enemy_chance_cave: float = 0.006,
-                                     base_enemy_chance_dungeon: float = 0.006,
-                                     base_boss_chance: float = 0.003) -> None:
+    @classmethod
+    def from_state(cls, drill: Drill, current_level: int, tiles: np.ndarray,
+                   enemy_states: List[Tuple[Type[Enemy], float, float, float, float, float]]) -> Level:
+        """
+
+        Recreates a level from the state saved by Level.enemy_states and its block grid's tiles.
+
+        Parameters
+        ----------
+        drill           : Drill
+            The drill instance to keep constant between levels.
+        current_level   : int
+            The index of the level.
+        tiles           : np.ndarray
+            The block codes of the level's grid, indexed as tiles[x, y].
+        enemy_states    : List[Tuple[Type[Enemy], float, float, float, float, float]]
+            The saved state of each enemy, as returned by Level.enemy_states.
+
+        Returns
+        -------
+        Level
+            The recreated level.
+
+        """
+        level = cls.__new__(cls)
+        level.sprites = _create_sprite_container(drill)
+        level.block_grid = BlockGrid.from_tiles(tiles, level.sprites)
+        level.current_level = current_level
+
+        for enemy_type, x, y, vision, speed, current_health in enemy_states:
+            enemy = enemy_type(x, y, vision=vision, speed=speed)
+            enemy.current_health = current_health
+            level.sprites.entity_list.append(enemy)
+            level.sprites.enemy_list.append(enemy)
+        level.sprites.drill_list.append(drill)
+
+        for entity in level.sprites.entity_list:
+            entity.setup_collision_engine([level.sprites.indestructible_blocks_list])
+        level.ai_level_of_detail = AILevelOfDetail()
+        level.entity_renderer = EntityRenderer()
+        level.time = 0
+        level.frame = 0
+        return level
+
+    def enemy_states(self) -> List[Tuple[Type[Enemy], float, float, float, float, float]]:
+        """Returns the type, x and y position, vision, speed and health of every enemy, for Level.from_state."""
+        return [(type(enemy), enemy.center_x, enemy.center_y, enemy.vision, enemy.speed, enemy.current_health)
+                for enemy in self.sprites.enemy_list]
+
+    def release(self) -> None:
+        """Lets go of the sprites of this level, so it can be garbage collected. The drill is kept."""
+        self.block_grid.chunks.evict_all()
+        self.entity_renderer.clear()
+        if self.sprites.drill in self.sprites.drill_list:
+            self.sprites.drill_list.remove(self.sprites.drill)
+
+    def _populate_level_with_enemies(self, enemy_spawns: List[Tuple[Type[Enemy], float, float, bool]]) -> None:
         """
-        Spawns enemies into caves and dungeons.
+        Spawns the enemies of the level's layout into caves and dungeons.
 
         Parameters
         ----------
-        enemy_chance_cave      :   float
-            Probability of an enemy spawning in an empty cave block
-        enemy_chance_dungeon   :   float
-            Probability of an enemy spawning in an empty dungeon floor block
+        enemy_spawns    :   List[Tuple[Type[Enemy], float, float, bool]]
+            The type, x and y position of each enemy to spawn, and whether it is a boss.
         """
-        enemy_chance_cave = self.generate_enemy_chance(base_enemy_chance_cave)
-        enemy_chance_dungeon = self.generate_enemy_chance(base_enemy_chance_dungeon)
-        boss_chance = self.generate_enemy_chance(base_boss_chance)
-        for row in map_layer_configuration:
-            for block in row:
-                if block[0] == ' ':
-                    if np.random.rand() > (1 - enemy_chance_cave):
-                       if self.sprites.drill.center_x != block[1] or self.sprites.drill.center_y != block[2]:
-                            enemy_to_add = random.choice(potential_enemies)
-                            enemy_to_append = enemy_to_add(block[1], block[2], vision=200)
-                            self.sprites.entity_list.append(enemy_to_append)
-                            self.sprites.enemy_list.append(enemy_to_append)
-                elif block[0] == 'F':
-                    if np.random.rand() > (1 - enemy_chance_dungeon):
-                       if self.sprites.drill.center_x != block[1] or self.sprites.drill.center_y != block[2]:
-                            enemy_to_add = random.choice(potential_enemies)
-                            enemy_to_append = enemy_to_add(block[1], block[2], vision=200)
-                            self.sprites.entity_list.append(enemy_to_append)
-                            self.sprites.enemy_list.append(enemy_to_append)
-                    elif np.random.rand() > (1 - boss_chance):
-                       if self.sprites.drill.center_x != block[1] or self.sprites.drill.center_y != block[2]:
-                            enemy_to_add = random.choice(potential_bosses)
-                            enemy_to_append = enemy_to_add(block[1], block[2], vision=200, speed=0.7)
-                            self.sprites.entity_list.append(enemy_to_append)
-                            self.sprites.enemy_list.append(enemy_to_append)
+        for enemy_type, x, y, is_boss in enemy_spawns:
+            if self.sprites.drill.center_x != x or self.sprites.drill.center_y != y:
+                if is_boss:
+                    enemy_to_append = enemy_type(x, y, vision=200, speed=0.7)
+                else:
+                    enemy_to_append = enemy_type(x, y, vision=200)
+                self.sprites.entity_list.append(enemy_to_append)
+                self.sprites.enemy_list.append(enemy_to_append)
         self.sprites.drill_list.append(self.sprites.drill)
 
         for entity in self.sprites.entity_list:
             entity.setup_collision_engine([self.sprites.indestructible_blocks_list])
 
-    def generate_enemy_chance(self, base_enemy_chance: float):
+    def draw(self, view: View) -> None:
         """
-        Generates the odds of an enemy spawning in a given spot.
-        Enemy chance increases by a natural logarithmic scale.
+
+        Draws the map, and the entities and particles that are on the screen.
 
         Parameters
         ----------
-        base_enemy_chance   :   float
-            The minimum chance of this type of enemy
+        view    : View
+            The view the level is being drawn to.
 
-        Returns
-        -------
-        enemy_chance   :   float
-            The chance of this type of enemy on the current layer
         """
-        enemy_chance = base_enemy_chance * (1 + np.log(self.current_level + 1))
-        return enemy_chance
-
-    def draw(self) -> None:
         arcade.start_render()
-        self.block_grid.air_blocks.draw()
-        self.sprites.all_blocks_list.draw()
-        self.sprites.explosion_list.draw()
+        self.block_grid.chunks.draw()
+        self.sprites.explosion_list.draw()  # Every particle on the screen, see update_cosmetics.
+
+        entities, _ = view.visible_sprites(self.sprites)
+        # Every entity, child and bullet is drawn in a few batches rather than one draw call per sprite.
+        self.entity_renderer.draw((*entities, self.sprites.drill))
+
+    def update_cosmetics(self, delta_time: float, view: View) -> None:
+        """
+
+        Updates everything that only changes how the level looks, ie. entity animations and explosion particles, for
+        what is on the screen.
+
+        Notes
+        -----
+        Entities off the screen keep the texture they had when they left it. Particles off the screen are dropped, as
+        nobody would see them fade, so the particle system doesn't fill up with particles from bullets that hit far
+        away.
+
+        Parameters
+        ----------
+        delta_time  : float
+            The time in seconds since the last game loop iteration.
+        view        : View
+            The view the level is being drawn to.
+
+        """
+        entities, particles = view.visible_sprites(self.sprites)
+        for entity in (*entities, self.sprites.drill):
+            if entity.is_animated:
+                entity.update_animation(delta_time)
 
-        for entity in (*self.sprites.entity_list, self.sprites.drill):
-            entity.draw()
+        if len(particles) < len(self.sprites.particles):
+            self.sprites.particles.keep(particles)
+        self.sprites.particles.update()
 
     def update(self, time: float, delta_time: float, sprites, block_grid: BlockGrid):
         pass  # TODO currently this is all done in class: DrillDungeonGame
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from .entity.entities import Drill
+from .level import Level, potential_bosses, potential_enemies
+
+# Rough in-memory costs used to estimate how much a resident level takes up.
+BLOCK_SPRITE_BYTES = 2048
+ENTITY_BYTES = 8192
+
+_ENEMY_TYPES = {enemy_type.__name__: enemy_type for enemy_type in (*potential_enemies, *potential_bosses)}
+
+
+class LevelSnapshot:
+    """
+
+    A level that has been saved to disk, holding its block grid and enemies but none of its sprites.
+
+    Notes
+    -----
+    The block grid is saved as its tiles array. Broken blocks are already written into that array as air, so it is
+    all that is needed to rebuild the grid. Each enemy is saved as its type name and a row of floats.
+
+    Attributes
+    ----------
+    current_level   : int
+        The index of the saved level.
+    path            : str
+        The path of the snapshot file.
+    nbytes          : int
+        The size of the snapshot file in bytes.
+
+    Methods
+    -------
+    save(level: Level, directory: str)
+        Saves a level to a new snapshot file.
+    load(drill: Drill)
+        Recreates the saved level.
+    delete()
+        Deletes the snapshot file.
+
+    """
+    def __init__(self, current_level: int, path: str) -> None:
+        self.current_level = current_level
+        self.path = path
+        self.nbytes = os.path.getsize(path)
+
+    @classmethod
+    def save(cls, level: Level, directory: str) -> LevelSnapshot:
+        enemy_states = level.enemy_states()
+        path = os.path.join(directory, f'level_{level.current_level}.npz')
+        np.savez_compressed(path,
+                            tiles=level.block_grid.tiles,
+                            enemy_types=np.array([enemy_type.__name__ for enemy_type, *_ in enemy_states], dtype=str),
+                            enemy_states=np.array([state for _, *state in enemy_states], dtype=np.float64))
+        return cls(level.current_level, path)
+
+    def load(self, drill: Drill) -> Level:
+        with np.load(self.path) as snapshot:
+            tiles = snapshot['tiles']
+            enemy_states = [(_ENEMY_TYPES[str(enemy_type)], *state.tolist())
+                            for enemy_type, state in zip(snapshot['enemy_types'], snapshot['enemy_states'])]
+        return Level.from_state(drill, self.current_level, tiles, enemy_states)
+
+    def delete(self) -> None:
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class LevelStore:
+    """
+
+    Holds every level the drill has visited, only keeping the most recently used ones in memory.
+
+    Notes
+    -----
+    Every level can be returned to, but keeping all of their sprites around means memory grows the deeper the drill
+    goes. Once more than max_resident_levels levels (or more than max_resident_bytes of them) are resident, the least
+    recently used level is saved to a LevelSnapshot and its sprites released. Indexing the store with a hibernated
+    level loads it back in. The level most recently indexed is never hibernated, so the current level stays
+    resident.
+
+    Methods
+    -------
+    append(level: Level)
+        Adds a new level to the end of the store.
+    clear()
+        Removes every level and deletes their snapshots.
+    resident_bytes()
+        Returns an estimate of the memory used by the resident levels.
+
+    """
+    def __init__(self, drill: Drill, max_resident_levels: Optional[int] = 3,
+                 max_resident_bytes: Optional[int] = None) -> None:
+        """
+
+        Parameters
+        ----------
+        drill               : Drill
+            The drill instance to keep constant between levels.
+        max_resident_levels : Optional[int]
+            The most levels to keep in memory at once. None means no limit.
+        max_resident_bytes  : Optional[int]
+            The most estimated bytes of levels to keep in memory at once. None means no limit.
+
+        """
+        if max_resident_levels is not None and max_resident_levels < 1:
+            raise ValueError('At least one level must be able to stay resident.')
+
+        self.max_resident_levels = max_resident_levels
+        self.max_resident_bytes = max_resident_bytes
+        self._drill = drill
+        self._levels: List[Union[Level, LevelSnapshot]] = []
+        self._recently_used: Dict[int, None] = OrderedDict()
+        self._directory = tempfile.TemporaryDirectory(prefix='drill_dungeon_levels_')
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __getitem__(self, index: int) -> Level:
+        level = self._levels[index]
+        if isinstance(level, LevelSnapshot):
+            snapshot = level
+            level = self._levels[index] = snapshot.load(self._drill)
+            snapshot.delete()
+        self._touch(index)
+        return level
+
+    def append(self, level: Level) -> None:
+        self._levels.append(level)
+        self._touch(len(self._levels) - 1)
+
+    def clear(self) -> None:
+        for level in self._levels:
+            if isinstance(level, LevelSnapshot):
+                level.delete()
+        self._levels = []
+        self._recently_used = OrderedDict()
+
+    def resident_bytes(self) -> int:
+        return sum(self._estimate_bytes(self._levels[index]) for index in self._recently_used)
+
+    def _touch(self, index: int) -> None:
+        self._recently_used.pop(index, None)
+        self._recently_used[index] = None
+        self._hibernate_excess()
+
+    def _hibernate_excess(self) -> None:
+        while len(self._recently_used) > 1 and self._over_limit():
+            index = next(iter(self._recently_used))
+            del self._recently_used[index]
+            level = self._levels[index]
+            self._levels[index] = LevelSnapshot.save(level, self._directory.name)
+            level.release()
+
+    def _over_limit(self) -> bool:
+        if self.max_resident_levels is not None and len(self._recently_used) > self.max_resident_levels:
+            return True
+        return self.max_resident_bytes is not None and self.resident_bytes() > self.max_resident_bytes
+
+    @staticmethod
+    def _estimate_bytes(level: Level) -> int:
+        block_grid = level.block_grid
+        return (block_grid.tiles.nbytes + block_grid.exposed.nbytes + block_grid._registered.nbytes
+                + len(block_grid._block_sprites) * BLOCK_SPRITE_BYTES
+                + len(level.sprites.entity_list) * ENTITY_BYTES)
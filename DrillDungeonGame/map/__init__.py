@@ -1,4 +1,12 @@
 from .block import *
 from .block_grid import *
+from .chunk_manager import *
+from .connected_regions import *
 from .dungeon_generator import *
+from .field_of_view import *
+from .flow_field import *
+from .hierarchical_path_finder import *
+from .path_cache import *
+from .path_finder import *
+from .path_request_queue import *
 from .prefab_dungeon_rooms import *
@@ -1,23 +1,104 @@
 from __future__ import annotations
 
 import abc
-from typing import Union
+from typing import Dict, List, Tuple, Type, Union
 
 import arcade
 
 
+class BlockFlyweight:
+    """
+
+    The texture and hit box shared by every block of one type.
+
+    Attributes
+    ----------
+    texture         : arcade.Texture
+        The texture drawn for this block type.
+    width           : float
+        The width of a block of this type in pixels, after scaling.
+    height          : float
+        The height of a block of this type in pixels, after scaling.
+    hit_box         : Tuple[Tuple[float, float], ...]
+        The hit box of the texture, relative to the centre of the block and unscaled, as arcade expects it.
+    scaled_hit_box  : Tuple[Tuple[float, float], ...]
+        The hit box relative to the centre of the block with the block type's scale already applied.
+
+    """
+    def __init__(self, block_type: Type[Block]) -> None:
+        self.texture = arcade.load_texture(block_type.file)
+        self.textures = [self.texture]
+        self.width = self.texture.width * block_type.scale
+        self.height = self.texture.height * block_type.scale
+        self.hit_box = tuple(tuple(point) for point in self.texture.hit_box_points)
+        self.scaled_hit_box = tuple((x * block_type.scale, y * block_type.scale) for x, y in self.hit_box)
+
+
+_BLOCK_FLYWEIGHTS: Dict[Type[Block], BlockFlyweight] = {}
+
+
+def block_flyweight(block_type: Type[Block]) -> BlockFlyweight:
+    """Returns the shared texture and hit box for a block type, loading them the first time they are needed."""
+    flyweight = _BLOCK_FLYWEIGHTS.get(block_type)
+    if flyweight is None:
+        flyweight = _BLOCK_FLYWEIGHTS[block_type] = BlockFlyweight(block_type)
+    return flyweight
+
+
+def preload_block_flyweights() -> None:
+    """Loads the texture and hit box of every block type up front, so the first frames of a level don't have to."""
+    for block_type in BLOCK_BY_CODE.values():
+        block_flyweight(block_type)
+
+
 class Block(arcade.Sprite):
+    """
+
+    A single cell of the map.
+
+    Notes
+    -----
+    There are only a handful of block types but there can be tens of thousands of blocks, so blocks don't load
+    their own texture. Every block of a type shares the texture and hit box in its BlockFlyweight instead. Blocks
+    never rotate or change scale either, so the adjusted hit box is just the shared scaled hit box moved to the
+    block's position.
+
+    """
     def __init__(self, x: int, y: int, center_x: Union[float, int], center_y: Union[float, int]) -> None:
-        super().__init__(filename=self.file, scale=self.scale, center_x=center_x, center_y=center_y)
+        super().__init__(scale=self.scale, center_x=center_x, center_y=center_y)
+        self._apply_flyweight(block_flyweight(type(self)))
         self.x, self.y = x, y
         self.is_visible = False
 
-        self.adjacent_positions = (
-            (self.x, self.y + 1),
-            (self.x, self.y - 1),
-            (self.x + 1, self.y),
-            (self.x - 1, self.y),
-        )
+    def _apply_flyweight(self, flyweight: BlockFlyweight) -> None:
+        self._texture = flyweight.texture
+        self.textures = flyweight.textures
+        self._width, self._height = flyweight.width, flyweight.height
+        self._points = flyweight.hit_box
+        self._point_list_cache = None
+
+    def become(self, block_type: Type[Block]) -> None:
+        """
+
+        Turns this block into a block of another type in place, eg. when dirt is mined and becomes air. This reuses
+        the sprite rather than allocating a new one. The sprite lists it is in are not told about the new texture, so
+        it should be taken out of them before they are next drawn.
+
+        Parameters
+        ----------
+        block_type  :   Type[Block]
+            The type of block to become.
+
+        """
+        self.__class__ = block_type
+        self._apply_flyweight(block_flyweight(block_type))
+
+    def get_adjusted_hit_box(self) -> List[Tuple[float, float]]:
+        if self._point_list_cache is None:
+            center_x, center_y = self.center_x, self.center_y
+            self._point_list_cache = [(x + center_x, y + center_y)
+                                      for x, y in block_flyweight(type(self)).scaled_hit_box]
+        return self._point_list_cache
 
     @property
     @abc.abstractmethod
@@ -99,3 +180,10 @@ class _Block:
 
 
 BLOCK = _Block
+
+# BlockGrid stores each cell as the ordinal of its Block.char, so a whole map fits in a uint8 array.
+BLOCK_BY_CODE = {ord(block.char): block for block in (BLOCK.AIR, BLOCK.DIRT, BLOCK.COAL, BLOCK.GOLD, BLOCK.SHOP,
+                                                      BLOCK.BORDER, BLOCK.WALL, BLOCK.FLOOR, BLOCK.DRILLDOWN)}
+
+# Blocks which can be moved through. Any block next to one of these is exposed and needs a sprite.
+OPEN_BLOCK_CODES = (ord(BLOCK.AIR.char), ord(BLOCK.FLOOR.char), ord(BLOCK.DRILLDOWN.char))
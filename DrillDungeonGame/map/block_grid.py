@@ -1,53 +1,375 @@
-from typing import List, Tuple
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Tuple, Type
 
 import arcade
+import numpy as np
+
+from ..map.block import BLOCK, BLOCK_BY_CODE, OPEN_BLOCK_CODES, Block, preload_block_flyweights
+from ..map.chunk_manager import CHUNK_SIZE, ChunkManager
+from ..map.connected_regions import ConnectedRegions
+from ..map.field_of_view import _BLOCKS_SIGHT_BY_CODE, FieldOfView
+from ..map.flow_field import FlowField
+from ..map.path_cache import PathCache
+from ..map.hierarchical_path_finder import HierarchicalPathFinder
+from ..map.path_finder import GridPathFinder
+from ..map.path_request_queue import PathRequestQueue
+from ..utility import BLOCK_PIXEL_SIZE, pixel_to_tile, tile_to_pixel
 
-from ..map.block import BLOCK, Block
+# The codes of every block that belongs in SpriteContainer.all_blocks_list, ie. everything but air and floor.
+COLLIDABLE_BLOCK_CODES = tuple(code for code in BLOCK_BY_CODE if code not in (ord(BLOCK.AIR.char),
+                                                                              ord(BLOCK.FLOOR.char)))
 
 
 class BlockGrid:
-    def __init__(self, matrix: List[List[Tuple[str, float, float]]], sprites) -> None:
-        self.blocks = [[] for _ in range(len(matrix[0]))]
-        self.air_blocks = arcade.SpriteList()
+    """
+
+    Stores every block on a map layer.
+
+    Notes
+    -----
+    The tiles array is the source of truth for the grid. It holds the code of each block (the ordinal of its
+    Block.char) and is indexed as tiles[x, y]. Block sprites are only created for blocks that have to be drawn or
+    collided with, ie. the ones next to an open block, and are cached until that block changes. The chunks attribute
+    keeps the exposed blocks around the view resident for drawing. The path_finder attribute finds paths straight
+    from the tiles array, path_cache remembers the paths it has found, path_requests spreads the searches for paths
+    over several frames, hierarchical_path_finder finds paths right across the map, and the flow_field attribute
+    holds the paths every enemy shares towards the drill. field_of_view holds the blocks that can see the drill, and
+    sets the is_visible flag of their sprites. regions labels which blocks can reach each other at all, so hopeless
+    searches can be skipped. version counts every change to the tiles array, and region_versions counts them per
+    chunk sized region, so anything derived from the tiles can tell when it has gone stale.
+
+    Two boolean arrays of the same shape track the frontier of the map. exposed marks every block that has a sprite
+    to draw, and _registered marks the solid blocks that have been added to the SpriteContainer lists (which lists
+    follows from the block type). Keeping these up to date as blocks break means no sprite list ever has to be
+    searched to find out whether a block is already in it.
+
+    Methods
+    -------
+    from_tiles(tiles: np.ndarray, sprites: SpriteContainer)
+        Creates a block grid straight from a tiles array.
+    block_at(x: int, y: int)
+        Returns the sprite for the block at a position in the grid, creating it if needed.
+    exposed_blocks(left: int, bottom: int, right: int, top: int)
+        Returns the sprites of all exposed blocks within an area of the grid.
+    blocks_overlapping(sprite: arcade.Sprite, kinds: Optional[Iterable[Type[Block]]])
+        Returns the exposed blocks that a sprite is colliding with.
+    is_block_type_near(center_x: float, center_y: float, block_type: Type[Block], radius: int)
+        Returns whether there is a block of a type within a number of blocks of a position.
+    has_line_of_sight(start_x: float, start_y: float, end_x: float, end_y: float, max_distance: float)
+        Returns whether a straight line between two positions is clear of solid blocks.
+    regions_within(left: int, bottom: int, right: int, top: int)
+        Returns the index into region_versions of every region overlapping an area of the grid.
+    break_block(block: Block, sprites: SpriteContainer)
+        Replaces a block with air and exposes the blocks around it.
+    flush_breaks()
+        Removes the blocks broken since the last flush from their sprite lists.
+    initialise_blocks_adjacent_to_air(sprites: SpriteContainer)
+        Creates sprites for all blocks next to an open block and adds them to the sprite lists.
+
+    """
+    def __init__(self, map_layer_configuration: np.ndarray, sprites) -> None:
+        """
+
+        Parameters
+        ----------
+        map_layer_configuration :   np.ndarray
+            The block codes of the map, indexed as [y][x], as generated by MapLayer.
+        sprites                 :   SpriteContainer
+            The SpriteContainer to add the exposed blocks to.
+
+        """
+        self._initialise(np.asarray(map_layer_configuration, dtype=np.uint8).T.copy(), sprites)
+
+    @classmethod
+    def from_tiles(cls, tiles: np.ndarray, sprites) -> BlockGrid:
+        """
+
+        Creates a block grid straight from a tiles array, eg. one saved from another block grid.
+
+        Parameters
+        ----------
+        tiles   :   np.ndarray
+            The block codes of the grid, indexed as tiles[x, y].
+        sprites :   SpriteContainer
+            The SpriteContainer to add the exposed blocks to.
+
+        Returns
+        -------
+        BlockGrid
+            The new block grid.
+
+        """
+        block_grid = cls.__new__(cls)
+        block_grid._initialise(np.array(tiles, dtype=np.uint8), sprites)
+        return block_grid
+
+    def _initialise(self, tiles: np.ndarray, sprites) -> None:
+        unknown_codes = np.setdiff1d(tiles, list(BLOCK_BY_CODE))
+        if len(unknown_codes) > 0:
+            raise ValueError(f'Unknown char, {chr(unknown_codes[0])} for block type received.')
+
+        self.tiles = tiles
+        preload_block_flyweights()
+        self.exposed = np.zeros(self.tiles.shape, dtype=bool)
+        self._registered = np.zeros(self.tiles.shape, dtype=bool)
+        self.chunks = ChunkManager(self)
+        self.path_finder = GridPathFinder(self)
+        self.path_cache = PathCache(self)
+        self.path_requests = PathRequestQueue(self)
+        self.hierarchical_path_finder = HierarchicalPathFinder(self)
+        self.regions = ConnectedRegions(self)
+        self.flow_field = FlowField(self)
+        self.field_of_view = FieldOfView(self)
+        self._flat_tiles = memoryview(self.tiles.reshape(-1))  # Indexed by x * height + y, for quick single lookups.
+        self.version = 0  # Bumped whenever a block in the tiles array changes.
+        # One version per chunk sized region of the grid, bumped whenever a block in that region changes.
+        self.region_versions = np.zeros((-(-self.width // CHUNK_SIZE), -(-self.height // CHUNK_SIZE)), dtype=np.int64)
+        self._block_sprites: Dict[Tuple[int, int], Block] = {}
+        self._pending_breaks: List[Block] = []
         self._block_break_sound = arcade.load_sound("resources/sound/meele.wav")
-        for x in range(len(matrix)):
-            for y in range(len(matrix[0])):
-                b = matrix[y][x]
-                char = b[0]
-                block_x = b[1]
-                block_y = b[2]
-                if char == 'X':
-                    self.blocks[x].append(BLOCK.DIRT(x, y, block_x, block_y))
-                elif char == 'C':
-                    self.blocks[x].append(BLOCK.COAL(x, y, block_x, block_y))
-                elif char == 'G':
-                    self.blocks[x].append(BLOCK.GOLD(x, y, block_x, block_y))
-                elif char == 'O':
-                    self.blocks[x].append(BLOCK.BORDER(x, y, block_x, block_y))
-                elif char == ' ':
-                    self.blocks[x].append(BLOCK.AIR(x, y, block_x, block_y))
-                elif char == 'S':
-                    self.blocks[x].append(BLOCK.SHOP(x, y, block_x, block_y))
-                elif char == 'W':
-                    self.blocks[x].append(BLOCK.WALL(x, y, block_x, block_y))
-                elif char == 'F':
-                    self.blocks[x].append(BLOCK.FLOOR(x, y, block_x, block_y))
-                elif char == 'D':
-                    self.blocks[x].append(BLOCK.DRILLDOWN(x, y, block_x, block_y))
-                else:
-                    raise ValueError(f'Unknown char, {char} for block type received.')
 
         self.initialise_blocks_adjacent_to_air(sprites)
 
     @property
     def height(self) -> int:
-        return len(self.blocks)
+        return self.tiles.shape[1]
 
     @property
     def width(self) -> int:
-        return len(self.blocks[0])
+        return self.tiles.shape[0]
+
+    def block_at(self, x: int, y: int) -> Block:
+        """
+
+        Returns the sprite for the block at a position in the grid. The sprite is created the first time it is asked
+        for, or if the block has changed since.
+
+        Parameters
+        ----------
+        x   :   int
+            The x index of the block in the grid.
+        y   :   int
+            The y index of the block in the grid.
+
+        Returns
+        -------
+        Block
+            The sprite of the block at that position.
+
+        """
+        code = int(self.tiles[x, y])
+        block = self._block_sprites.get((x, y))
+        if block is None or ord(block.char) != code:
+            block = BLOCK_BY_CODE[code](x, y, tile_to_pixel(x), tile_to_pixel(y))
+            block.is_visible = self.field_of_view.is_visible(x, y)
+            self._block_sprites[(x, y)] = block
+        return block
+
+    def exposed_blocks(self, left: int, bottom: int, right: int, top: int) -> List[Block]:
+        """
+
+        Returns the sprites of all exposed blocks within an area of the grid. Blocks that have never been exposed
+        don't have a sprite and are skipped.
+
+        Parameters
+        ----------
+        left    :   int
+            The x index of the left-most column of the area.
+        bottom  :   int
+            The y index of the bottom row of the area.
+        right   :   int
+            The x index one past the right-most column of the area.
+        top     :   int
+            The y index one past the top row of the area.
+
+        Returns
+        -------
+        List[Block]
+            The sprites of the exposed blocks in the area.
+
+        """
+        left, bottom = max(0, left), max(0, bottom)
+        xs, ys = np.nonzero(self.exposed[left:right, bottom:top])
+        return [self.block_at(left + int(x), bottom + int(y)) for x, y in zip(xs, ys)]
+
+    def blocks_overlapping(self, sprite: arcade.Sprite,
+                           kinds: Optional[Iterable[Type[Block]]] = None) -> List[Block]:
+        """
+
+        Returns the exposed blocks that a sprite is colliding with. This is a drop in replacement for
+        arcade.check_for_collision_with_list against one of the block sprite lists.
+
+        Notes
+        -----
+        Blocks sit on a regular grid, so only the handful of cells under the sprite's bounding box need to be looked
+        at, rather than every block in a sprite list. This keeps the cost of a query the same however big the map
+        gets. The box is padded by one cell as the shop sprite is larger than a single block. Only exposed blocks are
+        returned, as those are the only blocks that would be in a sprite list.
+
+        Parameters
+        ----------
+        sprite  :   arcade.Sprite
+            The sprite to check for collisions.
+        kinds   :   Optional[Iterable[Type[Block]]]
+            The block types to check against, eg. (BLOCK.DIRT, BLOCK.COAL). Defaults to every block type in
+            SpriteContainer.all_blocks_list.
+
+        Returns
+        -------
+        List[Block]
+            The blocks that the sprite is colliding with.
+
+        """
+        codes = COLLIDABLE_BLOCK_CODES if kinds is None else [ord(kind.char) for kind in kinds]
+        left = max(0, pixel_to_tile(sprite.left) - 1)
+        bottom = max(0, pixel_to_tile(sprite.bottom) - 1)
+        right = min(self.width, pixel_to_tile(sprite.right) + 2)
+        top = min(self.height, pixel_to_tile(sprite.top) + 2)
+        if left >= right or bottom >= top:
+            return []
+
+        candidates = self.exposed[left:right, bottom:top] & np.isin(self.tiles[left:right, bottom:top], codes)
+        collisions = []
+        for x, y in zip(*np.nonzero(candidates)):
+            block = self.block_at(left + int(x), bottom + int(y))
+            if arcade.check_for_collision(sprite, block):
+                collisions.append(block)
+        return collisions
+
+    def is_block_type_near(self, center_x: float, center_y: float, block_type: Type[Block], radius: int) -> bool:
+        """
+
+        Returns whether there is a block of a type within a square of blocks around a position.
+
+        Parameters
+        ----------
+        center_x    :   float
+            The x pixel coordinate of the position.
+        center_y    :   float
+            The y pixel coordinate of the position.
+        block_type  :   Type[Block]
+            The type of block to look for.
+        radius      :   int
+            How many blocks to look in each direction.
+
+        Returns
+        -------
+        bool
+            True if a block of that type is near the position.
+
+        """
+        x, y = pixel_to_tile(center_x), pixel_to_tile(center_y)
+        area = self.tiles[max(0, x - radius):x + radius + 1, max(0, y - radius):y + radius + 1]
+        return bool(np.any(area == ord(block_type.char)))
+
+    def has_line_of_sight(self, start_x: float, start_y: float, end_x: float, end_y: float,
+                          max_distance: float = -1) -> bool:
+        """
+
+        Returns whether a straight line between two positions is clear of every block in all_blocks_list.
+
+        Notes
+        -----
+        Walks the blocks the line passes through one at a time, in order (Amanatides and Woo's grid traversal), and
+        stops at the first solid one. Only the blocks along the line are looked at, so the cost depends on the length
+        of the line rather than on how many blocks there are on the map. Each block is treated as a full square, and a
+        line leaving the grid is blocked.
+
+        Parameters
+        ----------
+        start_x         :   float
+            The x pixel coordinate to look from.
+        start_y         :   float
+            The y pixel coordinate to look from.
+        end_x           :   float
+            The x pixel coordinate to look at.
+        end_y           :   float
+            The y pixel coordinate to look at.
+        max_distance    :   float
+            How many pixels away the end can be and still be seen. Less than or equal to 0 means no limit, as with
+            arcade.has_line_of_sight.
+
+        Returns
+        -------
+        bool
+            True if nothing blocks the line.
+
+        """
+        delta_x, delta_y = end_x - start_x, end_y - start_y
+        if 0 < max_distance and max_distance * max_distance < delta_x * delta_x + delta_y * delta_y:
+            return False
+
+        x, y = pixel_to_tile(start_x), pixel_to_tile(start_y)
+        end_tile_x, end_tile_y = pixel_to_tile(end_x), pixel_to_tile(end_y)
+        width, height = self.width, self.height
+        tiles = self._flat_tiles
+
+        # The fraction of the line travelled before it crosses into the next column (or row), and how much further it
+        # goes between each column (or row) after that.
+        if delta_x > 0:
+            step_x, next_x = 1, ((x + 1) * BLOCK_PIXEL_SIZE - start_x) / delta_x
+        elif delta_x < 0:
+            step_x, next_x = -1, (x * BLOCK_PIXEL_SIZE - start_x) / delta_x
+        else:
+            step_x, next_x = 0, math.inf
+        if delta_y > 0:
+            step_y, next_y = 1, ((y + 1) * BLOCK_PIXEL_SIZE - start_y) / delta_y
+        elif delta_y < 0:
+            step_y, next_y = -1, (y * BLOCK_PIXEL_SIZE - start_y) / delta_y
+        else:
+            step_y, next_y = 0, math.inf
+        per_x = abs(BLOCK_PIXEL_SIZE / delta_x) if delta_x else math.inf
+        per_y = abs(BLOCK_PIXEL_SIZE / delta_y) if delta_y else math.inf
+
+        # A line can cross at most one block per column and row between its ends.
+        for _ in range(abs(end_tile_x - x) + abs(end_tile_y - y) + 1):
+            if not (0 <= x < width and 0 <= y < height) or _BLOCKS_SIGHT_BY_CODE[tiles[x * height + y]]:
+                return False
+            if next_x < next_y:
+                x += step_x
+                next_x += per_x
+            else:
+                y += step_y
+                next_y += per_y
+        return True
+
+    def regions_within(self, left: int, bottom: int, right: int, top: int) -> Tuple[slice, slice]:
+        """
+
+        Returns the index into region_versions of every region overlapping an area of the grid.
+
+        Parameters
+        ----------
+        left    :   int
+            The x index of the leftmost block in the area.
+        bottom  :   int
+            The y index of the bottom block in the area.
+        right   :   int
+            The x index of the rightmost block in the area (inclusive).
+        top     :   int
+            The y index of the top block in the area (inclusive).
+
+        Returns
+        -------
+        Tuple[slice, slice]
+            The slices of region_versions covering the area.
+
+        """
+        return (slice(max(0, left) // CHUNK_SIZE, max(0, right) // CHUNK_SIZE + 1),
+                slice(max(0, bottom) // CHUNK_SIZE, max(0, top) // CHUNK_SIZE + 1))
+
+    def _expose_block(self, block: Block) -> None:
+        self.exposed[block.x, block.y] = True
+        self.chunks.add_block(block)
 
     def _add_block_to_lists(self, block: Block, sprites) -> None:
+        if self._registered[block.x, block.y]:
+            return
+        self._registered[block.x, block.y] = True
+        self._expose_block(block)
+
         if type(block) == BLOCK.DIRT:
             sprites.destructible_blocks_list.append(block)
             sprites.all_blocks_list.append(block)
@@ -83,40 +405,111 @@ class BlockGrid:
             raise ValueError(f'Incorrect block type: {type(block)}!')
 
     def break_block(self, block: Block, sprites) -> None:
-        arcade.play_sound(self._block_break_sound, 0.005)
+        """
 
-        for adjacent_block in self._get_adjacent_blocks_to(block):
-            if type(adjacent_block) != BLOCK.AIR and type(adjacent_block) != BLOCK.FLOOR and type(adjacent_block) != BLOCK.DRILLDOWN:
-                self._add_block_to_lists(adjacent_block, sprites)
+        Replaces a block with air and exposes the blocks around it.
 
-        block.remove_from_sprite_lists()
+        Notes
+        -----
+        The grid is updated straight away, so the block stops colliding with anything as soon as this returns, and
+        the block's sprite is turned into an air block in place, so block_at keeps returning it. Taking it out of the
+        sprite lists it was in is left to flush_breaks, which handles every block broken in a frame at once, before
+        the lists are next drawn.
+
+        Parameters
+        ----------
+        block   :   Block
+            The block to break.
+        sprites :   SpriteContainer
+            The SpriteContainer to add the newly exposed blocks to.
+
+        """
         x, y = block.x, block.y
-        center_x, center_y = block.center_x, block.center_y
-        new_air_block = BLOCK.AIR(x, y, center_x, center_y)
-        self.blocks[x][y] = new_air_block
-        self.air_blocks.append(new_air_block)
-
-    def initialise_blocks_adjacent_to_air(self, sprites):
-        for x in range(self.width):
-            for y in range(self.height):
-                block = self.blocks[x][y]
-                if any(type(adjacent_block) in (BLOCK.AIR, BLOCK.DRILLDOWN, BLOCK.FLOOR) for adjacent_block in self._get_adjacent_blocks_to(block)):
-                    if type(block) in (BLOCK.FLOOR, BLOCK.AIR):
-                        self.air_blocks.append(block)
-                    elif type(block) == BLOCK.DRILLDOWN:
-                        self.air_blocks.append(block)
-                        if block not in sprites.all_blocks_list:
-                            self._add_block_to_lists(block, sprites)
-                    else:
-                        if block not in sprites.all_blocks_list:
-                            self._add_block_to_lists(block, sprites)
-
-    def _get_adjacent_blocks_to(self, block: Block) -> List[Block]:
-        """Returns a list of blocks (total: 4) that are adjacent to a block. Doesn't include diagonal blocks."""
-        adjacent_blocks = []
-        for x, y in block.adjacent_positions:
-            try:
-                adjacent_blocks.append(self.blocks[x][y])
-            except IndexError:
-                continue
-        return adjacent_blocks
+        if self.tiles[x, y] in OPEN_BLOCK_CODES:
+            return  # Already broken, eg. by two bullets in the same frame.
+
+        for adjacent_x, adjacent_y in self._get_adjacent_positions(x, y):
+            if self.tiles[adjacent_x, adjacent_y] not in OPEN_BLOCK_CODES:
+                self._add_block_to_lists(self.block_at(adjacent_x, adjacent_y), sprites)
+
+        self._registered[x, y] = False
+        self.tiles[x, y] = ord(BLOCK.AIR.char)
+        self.regions.open_block(x, y)
+        self.version += 1
+        self.region_versions[x // CHUNK_SIZE, y // CHUNK_SIZE] += 1
+        block.become(BLOCK.AIR)
+        self._pending_breaks.append(block)
+
+    def flush_breaks(self) -> None:
+        """
+
+        Removes every block broken since the last call from the sprite lists it was in, and adds it back to its chunk
+        as air. Called once per frame.
+
+        Notes
+        -----
+        arcade.SpriteList.remove rebuilds the list's whole index, so it costs as much as the list is long. Instead each
+        broken block is swapped with the last sprite of each list it is in and popped off the end, so the cost of a
+        break doesn't grow with the map. The break sound is also only played once however many blocks broke.
+
+        """
+        if not self._pending_breaks:
+            return
+
+        arcade.play_sound(self._block_break_sound, 0.005)
+        for block in self._pending_breaks:
+            for sprite_list in block.sprite_lists:
+                _swap_remove(sprite_list, block)
+            block.sprite_lists.clear()
+            self._expose_block(block)
+        self._pending_breaks.clear()
+
+    def initialise_blocks_adjacent_to_air(self, sprites) -> None:
+        """
+
+        Creates sprites for every block next to an open block, adding the solid ones to the sprite lists.
+
+        Notes
+        -----
+        The blocks next to an open block are found with a handful of whole-array operations, so this is linear in
+        the size of the map.
+
+        Parameters
+        ----------
+        sprites :   SpriteContainer
+            The SpriteContainer to add the blocks to.
+
+        """
+        open_blocks = np.isin(self.tiles, OPEN_BLOCK_CODES)
+        next_to_open = np.zeros_like(open_blocks)
+        next_to_open[1:, :] |= open_blocks[:-1, :]
+        next_to_open[:-1, :] |= open_blocks[1:, :]
+        next_to_open[:, 1:] |= open_blocks[:, :-1]
+        next_to_open[:, :-1] |= open_blocks[:, 1:]
+
+        for x, y in zip(*np.nonzero(next_to_open)):
+            block = self.block_at(int(x), int(y))
+            if type(block) in (BLOCK.FLOOR, BLOCK.AIR):
+                self._expose_block(block)
+            else:
+                self._add_block_to_lists(block, sprites)
+
+    def _get_adjacent_positions(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """Returns a list of positions (max: 4) that are adjacent to a block. Doesn't include diagonal blocks."""
+        adjacent_positions = []
+        for adjacent_x, adjacent_y in ((x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)):
+            if 0 <= adjacent_x < self.width and 0 <= adjacent_y < self.height:
+                adjacent_positions.append((adjacent_x, adjacent_y))
+        return adjacent_positions
+
+
+def _swap_remove(sprite_list: arcade.SpriteList, sprite: arcade.Sprite) -> None:
+    """Removes a sprite from a sprite list by moving the last sprite into its slot. Doesn't keep the list's order."""
+    index = sprite_list.sprite_idx.pop(sprite)
+    last_sprite = sprite_list.sprite_list.pop()
+    if last_sprite is not sprite:
+        sprite_list.sprite_list[index] = last_sprite
+        sprite_list.sprite_idx[last_sprite] = index
+    if sprite_list.spatial_hash is not None:
+        sprite_list.spatial_hash.remove_object(sprite)
+    sprite_list._vao1 = None
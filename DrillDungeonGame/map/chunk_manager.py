@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import arcade
+
+from ..map.block import OPEN_BLOCK_CODES, Block
+from ..utility import BLOCK_PIXEL_SIZE
+
+CHUNK_SIZE = 16  # The width and height of a chunk, in blocks.
+
+
+class Chunk:
+    """
+
+    Holds the sprite lists used to draw one square section of the block grid.
+
+    Attributes
+    ----------
+    floor_list  : arcade.SpriteList
+        The open blocks (air, dungeon floor and drill down blocks) in this chunk.
+    block_list  : arcade.SpriteList
+        The solid blocks in this chunk that are next to an open block.
+
+    """
+    def __init__(self) -> None:
+        self.floor_list = arcade.SpriteList(is_static=True)
+        self.block_list = arcade.SpriteList(is_static=True)
+
+    def add_block(self, block: Block) -> None:
+        if ord(block.char) in OPEN_BLOCK_CODES:
+            self.floor_list.append(block)
+        else:
+            self.block_list.append(block)
+
+    def release(self) -> None:
+        """Detaches every sprite from this chunk's sprite lists so that the lists can be garbage collected."""
+        for sprite_list in (self.floor_list, self.block_list):
+            for sprite in sprite_list:
+                sprite.sprite_lists.remove(sprite_list)
+
+
+class ChunkManager:
+    """
+
+    Splits a BlockGrid into fixed size chunks and only keeps the chunks around the view resident as sprite lists.
+
+    Notes
+    -----
+    This means drawing the map only costs as much as the blocks on and just around the screen, no matter how big
+    the map is. Chunks are loaded from the block grid when they scroll into range and dropped when they leave it.
+
+    Methods
+    -------
+    update(left: float, bottom: float, width: float, height: float)
+        Loads chunks that are now within range of the view and evicts those that are not.
+    add_block(block: Block)
+        Adds a newly exposed block to its chunk if that chunk is resident.
+    evict_all()
+        Drops every resident chunk.
+    draw()
+        Draws the resident chunks.
+
+    """
+    def __init__(self, block_grid, chunk_size: int = CHUNK_SIZE, margin: int = 1) -> None:
+        """
+
+        Parameters
+        ----------
+        block_grid  : BlockGrid
+            The block grid to split into chunks.
+        chunk_size  : int
+            The width and height of a chunk, in blocks.
+        margin      : int
+            The number of chunks to keep resident past each edge of the view, so blocks are ready before they
+            scroll on to the screen.
+
+        """
+        self.chunk_size = chunk_size
+        self._block_grid = block_grid
+        self._margin = margin
+        self._resident: Dict[Tuple[int, int], Chunk] = {}
+
+    @property
+    def resident_chunks(self) -> int:
+        return len(self._resident)
+
+    def chunk_of(self, x: int, y: int) -> Tuple[int, int]:
+        """Returns the index of the chunk containing the block at grid position x, y."""
+        return x // self.chunk_size, y // self.chunk_size
+
+    def update(self, left: float, bottom: float, width: float, height: float) -> None:
+        """
+
+        Loads the chunks that are within range of the view and evicts any that have gone out of range.
+
+        Parameters
+        ----------
+        left    : float
+            The x pixel coordinate of the left edge of the view.
+        bottom  : float
+            The y pixel coordinate of the bottom edge of the view.
+        width   : float
+            The width of the view in pixels.
+        height  : float
+            The height of the view in pixels.
+
+        """
+        chunk_pixels = self.chunk_size * BLOCK_PIXEL_SIZE
+        max_chunk_x = (self._block_grid.width - 1) // self.chunk_size
+        max_chunk_y = (self._block_grid.height - 1) // self.chunk_size
+        first_x = max(0, int(left // chunk_pixels) - self._margin)
+        last_x = min(max_chunk_x, int((left + width) // chunk_pixels) + self._margin)
+        first_y = max(0, int(bottom // chunk_pixels) - self._margin)
+        last_y = min(max_chunk_y, int((bottom + height) // chunk_pixels) + self._margin)
+
+        for chunk_x, chunk_y in list(self._resident):
+            if not (first_x <= chunk_x <= last_x and first_y <= chunk_y <= last_y):
+                self._resident.pop((chunk_x, chunk_y)).release()
+
+        for chunk_x in range(first_x, last_x + 1):
+            for chunk_y in range(first_y, last_y + 1):
+                if (chunk_x, chunk_y) not in self._resident:
+                    self._resident[(chunk_x, chunk_y)] = self._load_chunk(chunk_x, chunk_y)
+
+    def add_block(self, block: Block) -> None:
+        """
+
+        Adds a block that has just been exposed to the chunk it belongs to. Blocks in chunks which aren't resident
+        are picked up from the block grid when that chunk is loaded instead.
+
+        Parameters
+        ----------
+        block   : Block
+            The newly exposed block.
+
+        """
+        chunk = self._resident.get(self.chunk_of(block.x, block.y))
+        if chunk is not None:
+            chunk.add_block(block)
+
+    def evict_all(self) -> None:
+        """Drops every resident chunk. Used when the level stops being drawn."""
+        for chunk in self._resident.values():
+            chunk.release()
+        self._resident = {}
+
+    def draw(self) -> None:
+        """Draws the floor of every resident chunk, followed by the blocks on top of it."""
+        for chunk in self._resident.values():
+            chunk.floor_list.draw()
+        for chunk in self._resident.values():
+            chunk.block_list.draw()
+
+    def _load_chunk(self, chunk_x: int, chunk_y: int) -> Chunk:
+        chunk = Chunk()
+        left, bottom = chunk_x * self.chunk_size, chunk_y * self.chunk_size
+        for block in self._block_grid.exposed_blocks(left, bottom, left + self.chunk_size, bottom + self.chunk_size):
+            chunk.add_block(block)
+        return chunk
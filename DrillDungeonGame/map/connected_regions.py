@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+import numpy as np
+
+from ..map.path_finder import MOVE_COST_BY_CODE
+
+# Whether each block code can be walked or dug through, ie. whether a path can go through it.
+_PASSABLE_BY_CODE = np.isfinite(np.array(MOVE_COST_BY_CODE))
+
+
+class ConnectedRegions:
+    """
+
+    Labels every block of a BlockGrid that a path can go through with the connected region it belongs to, so it can
+    be told straight away whether there is any path at all between two blocks.
+
+    Notes
+    -----
+    Dungeon rooms and caves sealed off by blocks that can't be dug through (walls, borders and shops) end up in their
+    own region, and no search can ever get out of them. Checking the regions first saves the search from exploring
+    everything it can reach before giving up.
+
+    Diagonal moves can't cut corners, so two blocks that touch diagonally are only connected if one of the blocks
+    beside them both is too, and four way connectivity is enough. The labels are found with a vectorised union-find:
+    every pair of neighbouring passable blocks hooks the larger of their roots on to the smaller, and the roots are
+    then found by pointer jumping, repeating until nothing changes. As breaking a block can only join regions, it is
+    handled with an ordinary union-find on top of those labels rather than labelling the whole grid again.
+
+    Methods
+    -------
+    region_of(x: int, y: int)
+        Returns the label of the region a block is in.
+    connected(start: Tuple[int, int], goal: Tuple[int, int])
+        Returns whether a path could possibly exist between two blocks.
+    open_block(x: int, y: int)
+        Joins the regions around a block that has just been broken.
+
+    """
+    def __init__(self, block_grid) -> None:
+        """
+
+        Parameters
+        ----------
+        block_grid  :   BlockGrid
+            The block grid to label. Its tiles array is labelled straight away.
+
+        """
+        self._merged: Dict[int, int] = {}  # Maps a label that has been merged away to the label it was merged into.
+        self.labels = self._label(block_grid.tiles)
+
+    @property
+    def region_count(self) -> int:
+        """The number of separate regions on the grid."""
+        return int(np.count_nonzero(np.unique(self.labels) >= 0)) - len(self._merged)
+
+    def region_of(self, x: int, y: int) -> int:
+        """Returns the label of the region the block at x, y is in, or -1 if no path can go through it."""
+        width, height = self.labels.shape
+        if not (0 <= x < width and 0 <= y < height):
+            return -1
+        return self._find(int(self.labels[x, y]))
+
+    def connected(self, start: Tuple[int, int], goal: Tuple[int, int]) -> bool:
+        """
+
+        Returns whether a path could possibly exist between two blocks. A start block that no path can go through,
+        eg. one an entity has ended up overlapping, is given the benefit of the doubt.
+
+        Parameters
+        ----------
+        start   :   Tuple[int, int]
+            The x and y index of the block the path would start from.
+        goal    :   Tuple[int, int]
+            The x and y index of the block the path would lead to.
+
+        Returns
+        -------
+        bool
+            False if the two blocks are certainly in separate regions.
+
+        """
+        start_region = self.region_of(*start)
+        return start_region < 0 or start_region == self.region_of(*goal)
+
+    def open_block(self, x: int, y: int) -> None:
+        """
+
+        Joins the regions around a block that has just been broken into one. Should be called after the tiles array
+        has been updated.
+
+        Parameters
+        ----------
+        x   :   int
+            The x index of the broken block.
+        y   :   int
+            The y index of the broken block.
+
+        """
+        if self.labels[x, y] >= 0:
+            return  # Could already be dug through, so no regions have joined.
+
+        width, height = self.labels.shape
+        label = x * height + y
+        self.labels[x, y] = label
+        for adjacent_x, adjacent_y in ((x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)):
+            if 0 <= adjacent_x < width and 0 <= adjacent_y < height and self.labels[adjacent_x, adjacent_y] >= 0:
+                adjacent_root = self._find(int(self.labels[adjacent_x, adjacent_y]))
+                root = self._find(label)
+                if adjacent_root != root:
+                    self._merged[max(root, adjacent_root)] = min(root, adjacent_root)
+
+    def _find(self, label: int) -> int:
+        root = label
+        while root in self._merged:
+            root = self._merged[root]
+        while label != root:  # Point everything on the way straight at the root, so the next find is quicker.
+            self._merged[label], label = root, self._merged[label]
+        return root
+
+    @staticmethod
+    def _label(tiles: np.ndarray) -> np.ndarray:
+        width, height = tiles.shape
+        passable = _PASSABLE_BY_CODE[tiles]
+        # Each passable block starts as its own root, labelled with its flat index.
+        parent = np.arange(width * height, dtype=np.int64)
+        index = parent.reshape(width, height)
+        joined_right = passable[:-1, :] & passable[1:, :]
+        joined_up = passable[:, :-1] & passable[:, 1:]
+        first = np.concatenate((index[:-1, :][joined_right], index[:, :-1][joined_up]))
+        second = np.concatenate((index[1:, :][joined_right], index[:, 1:][joined_up]))
+
+        while True:
+            first_root, second_root = parent[first], parent[second]
+            joining = first_root != second_root
+            if not joining.any():
+                break
+            low = np.minimum(first_root[joining], second_root[joining])
+            high = np.maximum(first_root[joining], second_root[joining])
+            np.minimum.at(parent, high, low)
+            while True:  # Pointer jumping until every block points straight at its root.
+                jumped = parent[parent]
+                if np.array_equal(jumped, parent):
+                    break
+                parent = jumped
+
+        labels = parent.reshape(width, height)
+        labels[~passable] = -1
+        return labels
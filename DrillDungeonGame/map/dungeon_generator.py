@@ -3,10 +3,14 @@ import random
 import numpy as np
 
 from ..map.prefab_dungeon_rooms import *
+from ..utility import tile_to_pixel
 
 MAP_WIDTH = 2400
 MAP_HEIGHT = 2400
 
+# How each walk direction moves a block: 0 = Upwards (y + 1), 1 = Right (x + 1), 2 = Downwards (y - 1), 3 = Left (x - 1)
+_WALK_X_STEPS = np.array([0, 1, 0, -1])
+_WALK_Y_STEPS = np.array([1, 0, -1, 0])
 
 
 class MapLayer:
@@ -20,8 +24,8 @@ class MapLayer:
         Generates a map layer configuration from scratch.
     generate_map_layer_configuration()
         Generates a map layer configuration from the pre-existing map layer matrix.
-    load_row_from_matrix(row: list, y_block_center: float, block_width: float, block_height: float)
-        Loads a single row from the map layer matrix to the configuration matrix.
+    create_space_for_drill(drillX: float, drillY: float)
+        Clears out empty space around the drill in the map layer configuration.
     generate_dungeon(enemy_chance: float=0.1)
         Generates a single dungeon on a map layer matrix
     generate_coal()
@@ -39,17 +43,14 @@ class MapLayer:
     generate_blank_map()
         Generates a blank (dirt filled) map layer matrix.
         Blank blocks are represented by the character 'X'
-    generate_blank_row()
-        Generates a blank (dirt filled) map layer row.
-        Blank blocks are represented by the character 'X'
     generate_random_start_point()
         Generates a random location in the.map_layer_matrix
     generate_patch_size(mean_size: int)
         Generates the size of the dungeon using a poisson distribution with mean self.mean_dungeon_size
-    update_dungeon_coords(x : int, y : int, walkDirection : int)
-        Moves the.map_layer_matrix block coordinate in the direction dictated by the walkDirection
-    get_walk_direction(x : int, y : int)
-        Generates the walk direction for the.map_layer_matrix's random walk.
+    generate_patch(char: str, x: int, y: int, patch_size: int)
+        Paints a patch of blocks on the map layer matrix with a random walk.
+    get_walk_positions(x: int, y: int, steps: int)
+        Generates the positions of a random walk that stays within the map layer matrix.
 
     """
 
@@ -70,14 +71,14 @@ class MapLayer:
             The mean size of gold patches in blocks
 
         """
-        self.map_layer_matrix = []
+        self.map_layer_matrix = np.empty((0, 0), dtype='<U1')
         self.height = height
         self.width = width
         self.mean_dungeon_size = mean_dungeon_size
         self.mean_coal_size = mean_coal_size # coal
         self.mean_gold_size = mean_gold_size # gold
         self.mean_drillable_size = mean_drillable_size #Size of drillable patches
-        self.map_layer_configuration = []
+        self.map_layer_configuration = np.empty((0, 0), dtype=np.uint8)
 
     def __repr__(self) -> str:
         """
@@ -101,16 +102,16 @@ class MapLayer:
             map_layer_matrixString += "\n"
         return map_layer_matrixString
 
-    def get_full_map_layer_configuration(self, number_of_dungeons: int, number_of_coal_patches: int, number_of_gold_patches: int, number_of_shops: int, drillX, drillY, number_of_drillable_patches: int=8) -> list:
+    def get_full_map_layer_configuration(self, number_of_dungeons: int, number_of_coal_patches: int, number_of_gold_patches: int, number_of_shops: int, drillX=None, drillY=None, number_of_drillable_patches: int=8) -> np.ndarray:
         """
 
         Generates a map layer configuration from scratch
 
         Notes
         -----
-        Map layer configuration is different from map layer matrix because it includes the locations of
-        each component of the map layer. While the map layer matrix has just the type of block, the
-        configuration also includes the block's x and y location in a tuple.
+        Map layer configuration is different from map layer matrix because it holds the code of each block
+        (the ordinal of its char) in a uint8 array, which is what BlockGrid is built from. The location of a
+        block doesn't need storing as it follows from its index, see utility.tile_to_pixel.
 
         Parameters
         ----------
@@ -120,14 +121,16 @@ class MapLayer:
             Number of coal patches to add to map layer.
         number_of_gold_patches   :   int
             Number of gold patches to add to map layer.
+        drillX                   :   int, float, optional
+            The X coordinate of the drill. If this and drillY aren't given, no space is cleared for the drill.
+        drillY                   :   int, float, optional
+            The Y coordinate of the drill.
 
         Returns
         -------
-        List[List[Tuple]]
-            The map layer configuration. Each item in the matrix is a tuple of:
-            1 - the block type,
-            2 - the block's X location
-            3 - the block's Y location
+        np.ndarray
+            The map layer configuration. A uint8 array of block codes, indexed as [y][x] like the map layer
+            matrix.
 
         """
 
@@ -147,7 +150,8 @@ class MapLayer:
         self.generate_advanced_dungeon()
         self.generate_map_layer_configuration()
         self.generate_drillable_zones()
-        self.create_space_for_drill(drillX, drillY)
+        if drillX is not None and drillY is not None:
+            self.create_space_for_drill(drillX, drillY)
         return self.map_layer_configuration
 
     def generate_map_layer_configuration(self):
@@ -164,15 +168,7 @@ class MapLayer:
         None
 
         """
-        block_height = 20
-        block_width = 20
-
-        y_block_center = 0.5 * block_height
-        for row in self.map_layer_matrix:
-            configuration_row = self.load_row_from_matrix(row, y_block_center, block_width, block_height)
-            self.map_layer_configuration.append(configuration_row)
-            y_block_center += block_height
-
+        self.map_layer_configuration = self.map_layer_matrix.view(np.uint32).astype(np.uint8)
 
     def generate_drillable_zones(self):
         """
@@ -181,46 +177,9 @@ class MapLayer:
         x = np.random.choice([np.random.randint(0, 10), np.random.randint(self.width-11, self.width-1)])
         y = np.random.choice([np.random.randint(0, 10), np.random.randint(self.height-11, self.height-1)])
         drillable_size = self.generate_patch_size(self.mean_drillable_size)
-        while drillable_size > 0:
-            if self.map_layer_matrix[y][x] != 'D':
-                self.map_layer_matrix[y][x] = 'D'
-                drillable_size -= 1
-            walkDirection = self.get_walk_direction(x, y)
-            x, y = self.update_dungeon_coords(x, y, walkDirection)
-
-    def load_row_from_matrix(self, row: list, y_block_center: float, block_width: float, block_height: float) -> list:
-        """
-
-        Loads a single row from the map layer matrix to the configuration matrix
-
-        Parameters
-        ----------
-        row              :   list
-            The row of the map layer matrix currently being loaded
-        y_block_center   :   float
-            Y location of the current row.
-        block_width      :   float
-            Width of the blocks to be loaded.
-        block_height     :   float
-            Height of the blocks to be loaded.
-
-        Returns
-        -------
-        List[Tuple]
-            The row loaded into configuration format. Each item in the row is a tuple of:
-            1 - the block type,
-            2 - the block's X location and
-            3 - the block's Y location
-
-        """
-        x_block_center = 0.5 * block_width
-        configuration_row = []
-        for item in row:
-            configuration_row.append((item, x_block_center, y_block_center))
-            x_block_center += block_width
-        return configuration_row
+        self.generate_patch('D', x, y, drillable_size)
 
-    def create_space_for_drill(self, drillX, drillY) -> None:
+    def create_space_for_drill(self, drillX, drillY) -> np.ndarray:
         """
         Clears out empty space for when the drill goes down or up a layer.
 
@@ -230,13 +189,17 @@ class MapLayer:
             The X coordinate of the drill
         drillY   :   int, float
             The Y coordinate of the drill
+
+        Returns
+        -------
+        np.ndarray
+            The updated map layer configuration.
         """
-        for i, row in enumerate(self.map_layer_configuration):
-            for j, item in enumerate(row):
-                distance_from_drill = np.sqrt((drillX - item[1])**2 + (drillY - item[2])**2)
-                if distance_from_drill < 50:
-                    new_item = (" ", item[1], item[2])
-                    self.map_layer_configuration[i][j] = new_item
+        y_block_centers = tile_to_pixel(np.arange(self.map_layer_configuration.shape[0]))[:, np.newaxis]
+        x_block_centers = tile_to_pixel(np.arange(self.map_layer_configuration.shape[1]))[np.newaxis, :]
+        distance_from_drill = np.sqrt((drillX - x_block_centers)**2 + (drillY - y_block_centers)**2)
+        self.map_layer_configuration[distance_from_drill < 50] = ord(" ")
+        return self.map_layer_configuration
 
     def generate_advanced_dungeon(self) -> None:
         """
@@ -258,12 +221,7 @@ class MapLayer:
         """
         x, y = self.generate_random_start_point()
         dungeonSize = self.generate_patch_size(self.mean_dungeon_size)
-        while dungeonSize > 0:
-            if self.map_layer_matrix[y][x] != ' ':
-                self.map_layer_matrix[y][x] = ' '
-                dungeonSize -= 1
-            walkDirection = self.get_walk_direction(x, y)
-            x, y = self.update_dungeon_coords(x, y, walkDirection)
+        self.generate_patch(' ', x, y, dungeonSize)
 
     def generate_coal(self) -> None:
         """
@@ -278,12 +236,7 @@ class MapLayer:
         """
         x, y = self.generate_random_start_point()
         dungeonSize = self.generate_patch_size(self.mean_coal_size)
-        while dungeonSize > 0:
-            if self.map_layer_matrix[y][x] != 'C':
-                self.map_layer_matrix[y][x] = 'C'
-                dungeonSize -= 1
-            walkDirection = self.get_walk_direction(x, y)
-            x, y = self.update_dungeon_coords(x, y, walkDirection)
+        self.generate_patch('C', x, y, dungeonSize)
 
     def generate_gold(self) -> None: # gold
         """
@@ -298,12 +251,7 @@ class MapLayer:
         """
         x, y = self.generate_random_start_point()
         dungeonSize = self.generate_patch_size(self.mean_gold_size)
-        while dungeonSize > 0:
-            if self.map_layer_matrix[y][x] != 'G':
-                self.map_layer_matrix[y][x] = 'G'
-                dungeonSize -= 1
-            walkDirection = self.get_walk_direction(x, y)
-            x, y = self.update_dungeon_coords(x, y, walkDirection)
+        self.generate_patch('G', x, y, dungeonSize)
 
     def generate_shop(self) -> None:
         """
@@ -330,13 +278,8 @@ class MapLayer:
         None
 
         """
-        for i, row in enumerate(self.map_layer_matrix):
-            if i == 0 or i == len(self.map_layer_matrix) - 1:
-                for j, item in enumerate(row):
-                    row[j] = 'O'
-            else:
-                row[0] = 'O'
-                row[-1] = 'O'
+        self.map_layer_matrix[[0, -1], :] = 'O'
+        self.map_layer_matrix[:, [0, -1]] = 'O'
 
     def generate_blank_map(self) -> None:
         """
@@ -349,24 +292,7 @@ class MapLayer:
         None
 
         """
-        for i in range(self.height):
-            self.generate_blank_row()
-
-    def generate_blank_row(self) -> None:
-        """
-
-        Generates a blank (dirt filled) map layer row.
-        Blank blocks are represented by the character 'X'
-
-        Parameters
-        ----------
-        None
-
-        """
-        row = []
-        for i in range(self.width):
-            row.append('X')
-        self.map_layer_matrix.append(row)
+        self.map_layer_matrix = np.full((self.height, self.width), 'X', dtype='<U1')
 
     def generate_random_start_point(self) -> tuple:
         """
@@ -410,85 +336,86 @@ class MapLayer:
         patch_size = rng.poisson(mean_size)
         return patch_size
 
-    def update_dungeon_coords(self, x : int, y : int, walkDirection : int) -> tuple:
+    def generate_patch(self, char: str, x: int, y: int, patch_size: int) -> None:
         """
 
-        Moves the.map_layer_matrix block coordinate in the direction dictated by the
-        walkDirection.
+        Paints a patch of blocks on the map layer matrix with a random walk, starting at x, y. The walk carries on
+        until patch_size blocks that weren't already the char have been painted.
+
+        Notes
+        -----
+        Rather than taking one step at a time, the walk is generated in batches with numpy. Each batch paints the
+        first visit of every cell it passes that isn't already the char, stopping once the patch is big enough. If
+        the batch didn't paint enough cells, the next batch carries on from where it ended.
 
         Parameters
         ----------
-        x               : int
-            The x (horizontal) coordinate of the current block
-        y               : int
-            The y (vertical) coordinate of the current block
-        walkDirection   : int
-            The direction of the random walk where:
-            0 = Upwards     (y + 1)
-            1 = Right       (x + 1)
-            2 = Downwards   (y - 1)
-            3 = Left        (x - 1)
-
-        Returns
-        -------
-        x   : int
-            The updated x coordinate of the current block.
-        y   : int
-            The updated y coordinate of the current block.
+        char        :   str
+            The character of the block to paint.
+        x           :   int
+            The x (horizontal) coordinate of the start of the walk.
+        y           :   int
+            The y (vertical) coordinate of the start of the walk.
+        patch_size  :   int
+            The number of blocks to paint.
 
         """
-        if walkDirection == 0:
-            y += 1
-        if walkDirection == 1:
-            x += 1
-        if walkDirection == 2:
-            y -= 1
-        if walkDirection == 3:
-            x -= 1
-        return x, y
+        if x not in range(0, self.width) or y not in range(0, self.height):
+            raise ValueError("Row or column out of range")
+
+        remaining = patch_size
+        while remaining > 0:
+            xs, ys = self.get_walk_positions(x, y, max(2 * remaining, 16))
+            cells = ys * self.width + xs
+            _, first_visits = np.unique(cells, return_index=True)
+            first_visits.sort()
+            new_cells = cells[first_visits]
+            new_cells = new_cells[self.map_layer_matrix.flat[new_cells] != char][:remaining]
+
+            self.map_layer_matrix.flat[new_cells] = char
+            remaining -= len(new_cells)
+            next_xs, next_ys = self.get_walk_positions(xs[-1], ys[-1], 2)
+            x, y = int(next_xs[-1]), int(next_ys[-1])
 
-    def get_walk_direction(self, x : int, y : int) -> int:
+    def get_walk_positions(self, x: int, y: int, steps: int) -> tuple:
         """
 
-        Generates the walk direction for the.map_layer_matrix's random walk.
+        Generates the positions of a random walk that stays within the map layer matrix.
+
+        Notes
+        -----
+        Each step moves one block up, right, down or left at random. The walk is worked out as if the map had no
+        edges and then reflected back on to it, so a step that would leave the map bounces back inwards.
 
         Parameters
         ----------
-        x   :   int
-            The x (horizontal) coordinate of the current block
-        y   :   int
-            The y (vertical) coordinate of the current block
+        x       :   int
+            The x (horizontal) coordinate of the start of the walk.
+        y       :   int
+            The y (vertical) coordinate of the start of the walk.
+        steps   :   int
+            The number of positions to generate, including the start.
 
         Returns
-        --------
-        walkDirection   :   int
-            The direction of the random walk where:
-            0 = Upwards     (y + 1)
-            1 = Right       (x + 1)
-            2 - Downwards   (y - 1)
-            3 = Left        (x - 1)
-
-        """
-        if x not in range(0, self.width) or y not in range(0, self.height):
-            raise ValueError("Row or column out of range")
-        elif x == 0:
-            if y == 0:
-                return random.choice([0, 1])
-            elif y == self.height - 1:
-                return random.choice([1, 2])
-            else:
-                return random.choice([0, 1, 2])
-        elif y == 0:
-            if x == self.width - 1:
-                return random.choice([0, 3])
-            else:
-                return random.choice([0, 1, 3])
-        elif x == self.width - 1:
-            if y == self.height - 1:
-                return random.choice([2, 3])
-            else:
-                return random.choice([0,2,3])
-        elif y == self.height -1:
-            return random.choice([1,2,3])
-        else:
-            return random.choice([0, 1, 2, 3])
+        -------
+        xs  :   np.ndarray
+            The x coordinate of each position in the walk.
+        ys  :   np.ndarray
+            The y coordinate of each position in the walk.
+
+        """
+        directions = np.random.randint(0, 4, size=steps - 1)
+        xs = np.empty(steps, dtype=np.int64)
+        ys = np.empty(steps, dtype=np.int64)
+        xs[0], ys[0] = x, y
+        xs[1:] = x + np.cumsum(_WALK_X_STEPS[directions])
+        ys[1:] = y + np.cumsum(_WALK_Y_STEPS[directions])
+        return _reflect(xs, self.width), _reflect(ys, self.height)
+
+
+def _reflect(positions: np.ndarray, size: int) -> np.ndarray:
+    """Folds positions on an unbounded line back on to 0 to size - 1, as if the ends were mirrors."""
+    if size == 1:
+        return np.zeros_like(positions)
+    period = 2 * (size - 1)
+    return (size - 1) - np.abs(np.mod(positions, period) - (size - 1))
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from ..map.block import BLOCK_BY_CODE, BLOCK
+from ..utility import BLOCK_PIXEL_SIZE
+
+FIELD_OF_VIEW_RADIUS = 200 // BLOCK_PIXEL_SIZE  # How many blocks away can be seen, matching the enemies' 200 pixels.
+
+# Whether each block code blocks sight, ie. everything but air and floor, as with BlockGrid.has_line_of_sight.
+_BLOCKS_SIGHT_BY_CODE = [code in BLOCK_BY_CODE and code not in (ord(BLOCK.AIR.char), ord(BLOCK.FLOOR.char))
+                         for code in range(256)]
+
+# How far x and y move for each column and for each row of a quadrant: north, east, south and west.
+_QUADRANTS = ((1, 0, 0, 1), (0, 1, 1, 0), (1, 0, 0, -1), (0, 1, -1, 0))
+
+
+class FieldOfView:
+    """
+
+    The blocks that can be seen from one origin block, shared by everything that wants to know whether it can see
+    that block.
+
+    Notes
+    -----
+    Rather than every enemy casting its own ray to the drill, the blocks visible from the drill's block are worked
+    out once with symmetric shadowcasting. Each quadrant around the origin is scanned row by row, and the slopes
+    either side of each run of solid blocks narrow the rows behind it. The result is symmetric: an open block can be
+    seen from the origin exactly when the origin can be seen from it, so the bitmap also answers whether anything
+    standing in a block can see the drill, and each enemy's check becomes a single lookup. Solid blocks are visible
+    when their face is, and the is_visible flag of their sprites is kept up to date.
+
+    The field is only cast again when the origin moves to another block or the block grid has changed. Slopes are
+    kept as integer fractions, so no rounding can let sight leak through the corner between two blocks.
+
+    Methods
+    -------
+    update(origin_x: int, origin_y: int)
+        Moves the origin of the field, casting it again if needed.
+    is_visible(x: int, y: int)
+        Returns whether a block can be seen from the origin.
+
+    """
+    def __init__(self, block_grid, radius: int = FIELD_OF_VIEW_RADIUS) -> None:
+        """
+
+        Parameters
+        ----------
+        block_grid  :   BlockGrid
+            The block grid to look across.
+        radius      :   int
+            How many blocks away from the origin can be seen.
+
+        """
+        self.radius = radius
+        self.origin: Optional[Tuple[int, int]] = None
+        self.searches = 0
+        self._block_grid = block_grid
+        self._grid_version = -1
+        self._height = block_grid.height
+        self._tiles = memoryview(block_grid.tiles.reshape(-1))
+        # Holds the search number for every visible block, indexed by x * height + y, so nothing has to be cleared.
+        self._visible = [0] * (block_grid.width * block_grid.height)
+        self._flagged_blocks: List = []
+
+    def update(self, origin_x: int, origin_y: int) -> None:
+        """
+
+        Moves the origin of the field to a block. The field is cast again if the origin has moved to a different
+        block or the block grid has changed since it was last cast.
+
+        Parameters
+        ----------
+        origin_x    :   int
+            The x index of the block to look from.
+        origin_y    :   int
+            The y index of the block to look from.
+
+        """
+        if (origin_x, origin_y) == self.origin and self._block_grid.version == self._grid_version:
+            return
+        self.origin = (origin_x, origin_y)
+        self._grid_version = self._block_grid.version
+        self._cast(origin_x, origin_y)
+
+    def is_visible(self, x: int, y: int) -> bool:
+        """Returns whether the block at x, y can be seen from the origin. False before the field is first cast."""
+        if not (0 <= x < self._block_grid.width and 0 <= y < self._height):
+            return False
+        return self.searches > 0 and self._visible[x * self._height + y] == self.searches
+
+    def _cast(self, origin_x: int, origin_y: int) -> None:
+        self.searches += 1
+        search, visible, tiles = self.searches, self._visible, self._tiles
+        width, height, radius = self._block_grid.width, self._height, self.radius
+        if not (0 <= origin_x < width and 0 <= origin_y < height):
+            self._flag_blocks([])
+            return
+
+        seen = [(origin_x, origin_y)]
+        visible[origin_x * height + origin_y] = search
+        for column_dx, column_dy, row_dx, row_dy in _QUADRANTS:
+            # Each row to scan is (depth, start slope, end slope), with a slope held as numerator and denominator.
+            rows = [(1, -1, 1, 1, 1)]
+            while rows:
+                depth, start_numerator, start_denominator, end_numerator, end_denominator = rows.pop()
+                if depth > radius:
+                    continue
+                # Columns whose centres lie within the slopes, rounding ties outwards.
+                min_column = (2 * depth * start_numerator + start_denominator) // (2 * start_denominator)
+                max_column = -((end_denominator - 2 * depth * end_numerator) // (2 * end_denominator))
+                previous_blocks = None
+                for column in range(min_column, max_column + 1):
+                    x = origin_x + column * column_dx + depth * row_dx
+                    y = origin_y + column * column_dy + depth * row_dy
+                    inside = 0 <= x < width and 0 <= y < height
+                    blocks = not inside or _BLOCKS_SIGHT_BY_CODE[tiles[x * height + y]]
+                    # Open blocks are only seen if their centre is within the slopes, which keeps sight symmetric.
+                    if inside and column * column + depth * depth <= radius * radius and (
+                            blocks or (column * start_denominator >= depth * start_numerator and
+                                       column * end_denominator <= depth * end_numerator)):
+                        if visible[x * height + y] != search:
+                            visible[x * height + y] = search
+                            seen.append((x, y))
+                    if previous_blocks and not blocks:
+                        start_numerator, start_denominator = 2 * column - 1, 2 * depth
+                    if previous_blocks is False and blocks:
+                        rows.append((depth + 1, start_numerator, start_denominator, 2 * column - 1, 2 * depth))
+                    previous_blocks = blocks
+                if previous_blocks is False:
+                    rows.append((depth + 1, start_numerator, start_denominator, end_numerator, end_denominator))
+        self._flag_blocks(seen)
+
+    def _flag_blocks(self, seen: List[Tuple[int, int]]) -> None:
+        for block in self._flagged_blocks:
+            block.is_visible = False
+        exposed = self._block_grid.exposed
+        self._flagged_blocks = [self._block_grid.block_at(x, y) for x, y in seen if exposed[x, y]]
+        for block in self._flagged_blocks:
+            block.is_visible = True
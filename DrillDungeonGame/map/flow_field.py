@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..map.path_finder import MOVE_COST_BY_CODE, SQRT_2
+
+FLOW_FIELD_RADIUS = 16  # How many blocks past the target, in each direction, the flow field reaches.
+
+_MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+class FlowField:
+    """
+
+    A map of the cheapest way to reach one target block from every block around it, shared by every entity heading
+    for that target.
+
+    Notes
+    -----
+    Rather than every enemy running its own A* towards the drill, one Dijkstra search is run outwards from the
+    drill's block, recording for each block it reaches the neighbour to step to next. Any number of enemies can then
+    read their path off the field, so the cost of path finding no longer grows with the number of enemies chasing
+    the player. The field is only searched again when the target has moved to another block or a block within the
+    field's reach has changed, and even then not until an entity next reads from it, so no search is made while
+    nothing is chasing. Changes are spotted through the block grid's region_versions, so blocks dug out elsewhere on
+    the map leave the field alone.
+
+    Move costs are the same as GridPathFinder's, so an entity following the field takes the same route A* would
+    find. The search is limited to the blocks within radius blocks of the target.
+
+    Methods
+    -------
+    update(target_x: int, target_y: int)
+        Moves the target of the field.
+    next_step(x: int, y: int)
+        Returns the block to move to next from a block.
+    path_from(x: int, y: int)
+        Returns the blocks along the path from a block to the target.
+
+    """
+    def __init__(self, block_grid, radius: int = FLOW_FIELD_RADIUS) -> None:
+        """
+
+        Parameters
+        ----------
+        block_grid  :   BlockGrid
+            The block grid the field is laid over.
+        radius      :   int
+            How many blocks past the target, in each direction, the field reaches.
+
+        """
+        self.radius = radius
+        self.target: Optional[Tuple[int, int]] = None
+        self.searches = 0
+        self._searched_target: Optional[Tuple[int, int]] = None
+        self._block_grid = block_grid
+        self._regions: Optional[Tuple[slice, slice]] = None
+        self._region_versions: Optional[np.ndarray] = None
+        self._height = block_grid.height
+        self._tiles = memoryview(block_grid.tiles.reshape(-1))
+
+        # Per block search state, indexed by the flat index x * height + y and allocated once. _next_index holds the
+        # flat index of the block to step to next, and is only valid where _reached holds the current search number.
+        size = block_grid.width * block_grid.height
+        self._cost = [0.0] * size
+        self._next_index = [0] * size
+        self._reached = [0] * size
+        self._closed = [0] * size
+
+    def update(self, target_x: int, target_y: int) -> None:
+        """
+
+        Moves the target of the field to a block. The field is searched again the next time it is read if the target
+        has moved to a different block or a block within the field's reach has changed since the last search.
+
+        Parameters
+        ----------
+        target_x    :   int
+            The x index of the block to head for.
+        target_y    :   int
+            The y index of the block to head for.
+
+        """
+        self.target = (target_x, target_y)
+
+    def next_step(self, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """
+
+        Returns the x and y index of the block to move to next from a block, to get closer to the target.
+
+        Parameters
+        ----------
+        x   :   int
+            The x index of the block to step from.
+        y   :   int
+            The y index of the block to step from.
+
+        Returns
+        -------
+        Optional[Tuple[int, int]]
+            The block to step to. None if the block is the target, or the target can't be reached from it within the
+            field.
+
+        """
+        self._refresh()
+        index = x * self._height + y
+        if not self._steps_from(index):
+            return None
+        return divmod(self._next_index[index], self._height)
+
+    def path_from(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """
+
+        Returns the x and y index of every block along the path from a block to the target, including both ends.
+        Empty if the target can't be reached from the block within the field.
+
+        """
+        self._refresh()
+        index = x * self._height + y
+        if not self._steps_from(index):
+            return [(x, y)] if (x, y) == self.target else []
+
+        path = [(x, y)]
+        while self._steps_from(index):
+            index = self._next_index[index]
+            path.append(divmod(index, self._height))
+        return path
+
+    def _steps_from(self, index: int) -> bool:
+        return self.searches > 0 and 0 <= index < len(self._reached) and self._reached[index] == self.searches
+
+    def _refresh(self) -> None:
+        if self.target is None:
+            return
+        region_versions = self._block_grid.region_versions
+        if self.target == self._searched_target and \
+                np.array_equal(region_versions[self._regions], self._region_versions):
+            return
+        self._searched_target = self.target
+        self._regions = self._block_grid.regions_within(*self._bounds(*self.target))
+        self._region_versions = region_versions[self._regions].copy()
+        self._search(*self.target)
+
+    def _bounds(self, target_x: int, target_y: int) -> Tuple[int, int, int, int]:
+        """Returns the left, bottom, right and top block (inclusive) the search from a target is limited to."""
+        left, bottom = max(0, target_x - self.radius), max(0, target_y - self.radius)
+        right = min(self._block_grid.width - 1, target_x + self.radius)
+        top = min(self._height - 1, target_y + self.radius)
+        return left, bottom, right, top
+
+    def _search(self, target_x: int, target_y: int) -> None:
+        self.searches += 1
+        height = self._height
+        tiles = self._tiles
+        left, bottom, right, top = self._bounds(target_x, target_y)
+
+        if not (left <= target_x <= right and bottom <= target_y <= top):
+            return
+
+        search = self.searches
+        cost, next_index, reached, closed = self._cost, self._next_index, self._reached, self._closed
+        target_index = target_x * height + target_y
+        open_heap = [(0.0, target_x, target_y)]
+        while open_heap:
+            current_cost, x, y = heapq.heappop(open_heap)
+            index = x * height + y
+            if closed[index] == search:
+                continue
+            closed[index] = search
+            # Stepping from a neighbour into this block costs as much as moving into this block.
+            move_cost = MOVE_COST_BY_CODE[tiles[index]]
+            if move_cost == math.inf:
+                continue  # The target itself is solid, so nothing can reach it.
+
+            for dx, dy in _MOVES:
+                previous_x, previous_y = x + dx, y + dy
+                if not (left <= previous_x <= right and bottom <= previous_y <= top):
+                    continue
+                previous_index = previous_x * height + previous_y
+                if closed[previous_index] == search or MOVE_COST_BY_CODE[tiles[previous_index]] == math.inf:
+                    continue
+                step_cost = move_cost
+                if dx and dy:
+                    # Don't cut the corner of a block that can't be walked through.
+                    if MOVE_COST_BY_CODE[tiles[x * height + previous_y]] == math.inf or \
+                            MOVE_COST_BY_CODE[tiles[previous_x * height + y]] == math.inf:
+                        continue
+                    step_cost *= SQRT_2
+
+                previous_cost = current_cost + step_cost
+                if previous_index == target_index or \
+                        (reached[previous_index] == search and previous_cost >= cost[previous_index]):
+                    continue
+                reached[previous_index] = search
+                cost[previous_index] = previous_cost
+                next_index[previous_index] = index
+                heapq.heappush(open_heap, (previous_cost, previous_x, previous_y))
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..map.chunk_manager import CHUNK_SIZE
+from ..map.path_finder import MOVE_COST_BY_CODE, SQRT_2, _octile_distance
+
+# Entrances at least this many blocks wide get a transition at each end, rather than one in the middle.
+LONG_ENTRANCE_LENGTH = 6
+
+_MOVE_COSTS = np.array(MOVE_COST_BY_CODE)
+_MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, 1), (1, -1), (-1, -1))
+
+_Cell = Tuple[int, int]
+_Edge = Tuple[_Cell, float, List[_Cell]]
+
+
+class _Cluster:
+    __slots__ = ('version', 'edges')
+
+    def __init__(self, version: tuple, edges: Dict[_Cell, List[_Edge]]) -> None:
+        self.version = version
+        self.edges = edges
+
+
+class HierarchicalPathFinder:
+    """
+
+    Finds long paths across a BlockGrid cheaply, by first planning a route between chunks and then only searching
+    block by block within each chunk along it (HPA*).
+
+    Notes
+    -----
+    The grid is split into clusters the size of a chunk. Wherever blocks on either side of the border between two
+    clusters can both be walked (or dug) through, that stretch of border is an entrance, and one or two transitions
+    are placed across it. The transitions in a cluster are joined by the cost of the cheapest path between them
+    inside that cluster, which gives a small graph of the whole map. A path is found by joining the start and goal to
+    the transitions in their clusters, running A* over that graph, and stitching together the block paths already
+    stored for each edge.
+
+    A cluster's graph is built the first time a search reaches it, and kept until its region version in
+    BlockGrid.region_versions changes or a block just outside its borders does (as those decide its entrances).
+    Breaking a block therefore only rebuilds the cluster it is in, and the one across the border if it is on one.
+
+    Move costs are the same as GridPathFinder's, and diagonal movement is always allowed. Paths are close to, though
+    not always exactly, the cheapest.
+
+    Methods
+    -------
+    find_path(start: Tuple[int, int], goal: Tuple[int, int])
+        Returns the blocks along a path between two blocks anywhere on the grid.
+
+    """
+    def __init__(self, block_grid, cluster_size: int = CHUNK_SIZE) -> None:
+        """
+
+        Parameters
+        ----------
+        block_grid      :   BlockGrid
+            The block grid to find paths through.
+        cluster_size    :   int
+            The width and height of a cluster, in blocks. Must match the size of the grid's regions.
+
+        """
+        self.cluster_size = cluster_size
+        self.clusters_built = 0
+        self._block_grid = block_grid
+        self._clusters: Dict[_Cell, _Cluster] = {}
+        self._columns = -(-block_grid.width // cluster_size)
+        self._rows = -(-block_grid.height // cluster_size)
+
+    def find_path(self, start: _Cell, goal: _Cell) -> Optional[List[_Cell]]:
+        """
+
+        Returns the blocks along a path between two blocks anywhere on the grid.
+
+        Parameters
+        ----------
+        start   :   Tuple[int, int]
+            The x and y index of the block to start from.
+        goal    :   Tuple[int, int]
+            The x and y index of the block to find a path to.
+
+        Returns
+        -------
+        Optional[List[Tuple[int, int]]]
+            The x and y index of every block on the path, from start to goal. None if there is no path.
+
+        """
+        start_cluster, goal_cluster = self._cluster_of(*start), self._cluster_of(*goal)
+        if start_cluster == goal_cluster:
+            path = self._block_grid.path_finder.find_path(start, goal, True, self._bounds(*start_cluster))
+            if path is not None:
+                return path
+
+        # Join the start and goal to the transitions of their own clusters.
+        start_nodes = self._cluster(*start_cluster).edges
+        start_edges = self._search_cluster(start, start_cluster, start_nodes, reverse=False)
+        start_edges.extend(start_nodes.get(start, []))
+        goal_edges = {node: (cost, path) for node, cost, path
+                      in self._search_cluster(goal, goal_cluster, self._cluster(*goal_cluster).edges, reverse=True)}
+
+        open_heap = [(_octile_distance(*start, *goal), 0.0, start)]
+        cost_to: Dict[_Cell, float] = {start: 0.0}
+        came_from: Dict[_Cell, Tuple[_Cell, List[_Cell]]] = {}
+        closed = set()
+        while open_heap:
+            _, current_cost, node = heapq.heappop(open_heap)
+            if node in closed:
+                continue
+            if node == goal:
+                return self._stitch_path(came_from, start, goal)
+            closed.add(node)
+
+            if node == start:
+                edges = start_edges
+            else:
+                edges = self._cluster(*self._cluster_of(*node)).edges.get(node, [])
+            if node in goal_edges:
+                edges = edges + [(goal, *goal_edges[node])]
+
+            for next_node, edge_cost, edge_path in edges:
+                next_cost = current_cost + edge_cost
+                if next_node in closed or next_cost >= cost_to.get(next_node, math.inf):
+                    continue
+                cost_to[next_node] = next_cost
+                came_from[next_node] = (node, edge_path)
+                heapq.heappush(open_heap, (next_cost + _octile_distance(*next_node, *goal), next_cost, next_node))
+        return None
+
+    @staticmethod
+    def _stitch_path(came_from: Dict[_Cell, Tuple[_Cell, List[_Cell]]], start: _Cell, goal: _Cell) -> List[_Cell]:
+        segments = []
+        node = goal
+        while node != start:
+            node, edge_path = came_from[node]
+            segments.append(edge_path)
+        path = [start]
+        for edge_path in reversed(segments):
+            path.extend(edge_path[1:])  # Each edge's path starts where the last one ended.
+        return path
+
+    def _cluster_of(self, x: int, y: int) -> _Cell:
+        return x // self.cluster_size, y // self.cluster_size
+
+    def _bounds(self, cluster_x: int, cluster_y: int) -> Tuple[int, int, int, int]:
+        left, bottom = cluster_x * self.cluster_size, cluster_y * self.cluster_size
+        return (left, bottom, min(left + self.cluster_size, self._block_grid.width) - 1,
+                min(bottom + self.cluster_size, self._block_grid.height) - 1)
+
+    def _cluster(self, cluster_x: int, cluster_y: int) -> _Cluster:
+        # A cluster's graph depends on its own blocks, and on the blocks just outside its borders as they decide where
+        # its entrances are. Blocks further into the clusters around it don't matter.
+        left, bottom, right, top = self._bounds(cluster_x, cluster_y)
+        tiles = self._block_grid.tiles
+        version = (int(self._block_grid.region_versions[cluster_x, cluster_y]),
+                   tiles[max(0, left - 1), bottom:top + 1].tobytes(),
+                   tiles[right + 1:right + 2, bottom:top + 1].tobytes(),
+                   tiles[left:right + 1, max(0, bottom - 1)].tobytes(),
+                   tiles[left:right + 1, top + 1:top + 2].tobytes())
+        cluster = self._clusters.get((cluster_x, cluster_y))
+        if cluster is None or cluster.version != version:
+            cluster = self._clusters[(cluster_x, cluster_y)] = self._build_cluster(cluster_x, cluster_y, version)
+        return cluster
+
+    def _build_cluster(self, cluster_x: int, cluster_y: int, version: tuple) -> _Cluster:
+        self.clusters_built += 1
+        edges: Dict[_Cell, List[_Edge]] = {}
+        move_costs = self._move_costs((cluster_x, cluster_y))
+        for inside, outside in self._transitions(cluster_x, cluster_y):
+            edges.setdefault(inside, []).append((outside, MOVE_COST_BY_CODE[self._block_grid.tiles[outside]],
+                                                 [inside, outside]))
+        for node in list(edges):
+            edges[node].extend(self._search_cluster(node, (cluster_x, cluster_y), edges, False, move_costs))
+        return _Cluster(version, edges)
+
+    def _transitions(self, cluster_x: int, cluster_y: int) -> List[Tuple[_Cell, _Cell]]:
+        """Returns a pair of blocks, one inside the cluster and one outside it, for each transition on its borders."""
+        left, bottom, right, top = self._bounds(cluster_x, cluster_y)
+        borders = []
+        if cluster_x > 0:
+            borders.append([((left, y), (left - 1, y)) for y in range(bottom, top + 1)])
+        if cluster_x < self._columns - 1:
+            borders.append([((right, y), (right + 1, y)) for y in range(bottom, top + 1)])
+        if cluster_y > 0:
+            borders.append([((x, bottom), (x, bottom - 1)) for x in range(left, right + 1)])
+        if cluster_y < self._rows - 1:
+            borders.append([((x, top), (x, top + 1)) for x in range(left, right + 1)])
+
+        tiles = self._block_grid.tiles
+        transitions = []
+        for border in borders:
+            run: List[Tuple[_Cell, _Cell]] = []
+            for inside, outside in border + [(None, None)]:
+                if inside is not None and MOVE_COST_BY_CODE[tiles[inside]] != math.inf and \
+                        MOVE_COST_BY_CODE[tiles[outside]] != math.inf:
+                    run.append((inside, outside))
+                    continue
+                if len(run) >= LONG_ENTRANCE_LENGTH:
+                    transitions.extend((run[0], run[-1]))
+                elif run:
+                    transitions.append(run[len(run) // 2])
+                run = []
+        return transitions
+
+    def _move_costs(self, cluster: _Cell) -> List[List[float]]:
+        """Returns the cost of moving into each block of a cluster, indexed from its bottom left block."""
+        left, bottom, right, top = self._bounds(*cluster)
+        return _MOVE_COSTS[self._block_grid.tiles[left:right + 1, bottom:top + 1]].tolist()
+
+    def _search_cluster(self, source: _Cell, cluster: _Cell, nodes, reverse: bool,
+                        move_costs: Optional[List[List[float]]] = None) -> List[_Edge]:
+        """
+
+        Runs Dijkstra from a block across its cluster, returning an edge to each of the transition blocks in nodes that
+        it reaches. With reverse set, the edges are the paths from each transition to the block instead.
+
+        """
+        left, bottom, right, top = self._bounds(*cluster)
+        if move_costs is None:
+            move_costs = self._move_costs(cluster)
+        width, height = right - left + 1, top - bottom + 1
+        source_x, source_y = source[0] - left, source[1] - bottom
+        cost: Dict[_Cell, float] = {(source_x, source_y): 0.0}
+        parent: Dict[_Cell, _Cell] = {}
+        closed = set()
+        open_heap = [(0.0, source_x, source_y)]
+        while open_heap:
+            current_cost, x, y = heapq.heappop(open_heap)
+            if (x, y) in closed:
+                continue
+            closed.add((x, y))
+            # Going forwards, a move costs as much as the block it moves into. In reverse each move is from the next
+            # block into this one, so costs as much as this block.
+            reverse_cost = move_costs[x][y]
+            for dx, dy in _MOVES:
+                next_x, next_y = x + dx, y + dy
+                if not (0 <= next_x < width and 0 <= next_y < height) or (next_x, next_y) in closed:
+                    continue
+                move_cost = move_costs[next_x][next_y]
+                if move_cost == math.inf:
+                    continue
+                if reverse:
+                    move_cost = reverse_cost
+                if dx and dy:
+                    if move_costs[x][next_y] == math.inf or move_costs[next_x][y] == math.inf:
+                        continue
+                    move_cost *= SQRT_2
+                next_cost = current_cost + move_cost
+                if next_cost >= cost.get((next_x, next_y), math.inf):
+                    continue
+                cost[(next_x, next_y)] = next_cost
+                parent[(next_x, next_y)] = (x, y)
+                heapq.heappush(open_heap, (next_cost, next_x, next_y))
+
+        edges = []
+        for node in nodes:
+            local_node = node[0] - left, node[1] - bottom
+            if node == source or local_node not in closed:
+                continue
+            path = [local_node]
+            while path[-1] != (source_x, source_y):
+                path.append(parent[path[-1]])
+            if not reverse:
+                path.reverse()
+            edges.append((node, cost[local_node], [(x + left, y + bottom) for x, y in path]))
+        return edges
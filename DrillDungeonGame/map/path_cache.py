@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+PATH_CACHE_SIZE = 256  # The most paths to keep cached at once.
+
+_Key = Tuple[Tuple[int, int], Tuple[int, int], bool, Tuple[int, int, int, int]]
+
+
+class _CachedPath:
+    __slots__ = ('path', 'regions', 'region_versions', 'search_time')
+
+    def __init__(self, path: Optional[List[Tuple[int, int]]], regions: Tuple[slice, slice],
+                 region_versions: np.ndarray, search_time: float) -> None:
+        self.path = path
+        self.regions = regions
+        self.region_versions = region_versions
+        self.search_time = search_time
+
+
+class PathCache:
+    """
+
+    Remembers the paths found by a BlockGrid's GridPathFinder, so asking for the same path again is served from
+    memory rather than searched again.
+
+    Notes
+    -----
+    Paths are keyed by their start and goal blocks, whether diagonal movement was allowed and the bounds they were
+    searched within. The block grid is split into regions the size of a chunk, each with a version number that
+    BlockGrid.break_block bumps. A cached path records the versions of every region its search could have looked at,
+    and is only served while none of them have changed; breaking a block elsewhere on the map leaves it valid.
+
+    The least recently used path is dropped once more than max_size are cached.
+
+    Attributes
+    ----------
+    hits        : int
+        The number of paths served from the cache.
+    misses      : int
+        The number of paths that had to be searched for.
+    saved_time  : float
+        The total seconds of searching saved by hits, going by how long each path originally took to find.
+
+    Methods
+    -------
+    find_path(start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool, bounds: Tuple[int, int, int, int])
+        Returns the blocks along the cheapest path between two blocks, searching only if it isn't cached.
+    get(start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool, bounds: Tuple[int, int, int, int])
+        Returns the cached path between two blocks if it is still valid.
+    snapshot(bounds: Tuple[int, int, int, int])
+        Returns the regions within some bounds and their current versions.
+    put(start, goal, diagonal_movement, bounds, path, search_time, snapshot)
+        Caches a path that has been searched for.
+    clear()
+        Drops every cached path and resets the counters.
+
+    """
+    def __init__(self, block_grid, max_size: int = PATH_CACHE_SIZE) -> None:
+        """
+
+        Parameters
+        ----------
+        block_grid  :   BlockGrid
+            The block grid whose path finder and region versions to use.
+        max_size    :   int
+            The most paths to keep cached at once.
+
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self.saved_time = 0.0
+        self._block_grid = block_grid
+        self._paths: Dict[_Key, _CachedPath] = OrderedDict()
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of requests served from the cache, or 0 if there haven't been any."""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool = True,
+                  bounds: Optional[Tuple[int, int, int, int]] = None) -> Optional[List[Tuple[int, int]]]:
+        """
+
+        Returns the blocks along the cheapest path between two blocks. See GridPathFinder.find_path.
+
+        Notes
+        -----
+        The returned list is shared with the cache, so it mustn't be changed.
+
+        """
+        bounds = self._full_bounds(bounds)
+        cached = self.get(start, goal, diagonal_movement, bounds)
+        if cached is not None:
+            return cached.path
+
+        snapshot = self.snapshot(bounds)
+        start_time = time.perf_counter()
+        path = self._block_grid.path_finder.find_path(start, goal, diagonal_movement, bounds)
+        self.put(start, goal, diagonal_movement, bounds, path, time.perf_counter() - start_time, snapshot)
+        return path
+
+    def get(self, start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool = True,
+            bounds: Optional[Tuple[int, int, int, int]] = None) -> Optional[_CachedPath]:
+        """
+
+        Returns the cached path between two blocks if it is still valid, counting a hit, or None after counting a
+        miss. The path itself is in the path attribute of the returned entry.
+
+        """
+        key = (start, goal, diagonal_movement, self._full_bounds(bounds))
+        cached = self._paths.get(key)
+        if cached is not None:
+            if np.array_equal(self._block_grid.region_versions[cached.regions], cached.region_versions):
+                self._paths.move_to_end(key)
+                self.hits += 1
+                self.saved_time += cached.search_time
+                return cached
+            del self._paths[key]
+        self.misses += 1
+        return None
+
+    def snapshot(self, bounds: Optional[Tuple[int, int, int, int]] = None) -> Tuple[Tuple[slice, slice], np.ndarray]:
+        """Returns the regions within some bounds and their current versions, to take before searching them."""
+        regions = self._block_grid.regions_within(*self._full_bounds(bounds))
+        return regions, self._block_grid.region_versions[regions].copy()
+
+    def put(self, start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool,
+            bounds: Optional[Tuple[int, int, int, int]], path: Optional[List[Tuple[int, int]]], search_time: float,
+            snapshot: Tuple[Tuple[slice, slice], np.ndarray]) -> None:
+        """
+
+        Caches a path that has been searched for.
+
+        Parameters
+        ----------
+        start               :   Tuple[int, int]
+            The x and y index of the block the path starts from.
+        goal                :   Tuple[int, int]
+            The x and y index of the block the path leads to.
+        diagonal_movement   :   bool
+            Whether or not the path could include diagonal movement.
+        bounds              :   Optional[Tuple[int, int, int, int]]
+            The bounds the path was searched within.
+        path                :   Optional[List[Tuple[int, int]]]
+            The path found, or None if there wasn't one.
+        search_time         :   float
+            How many seconds it took to find the path.
+        snapshot            :   Tuple[Tuple[slice, slice], np.ndarray]
+            The snapshot of the bounds taken before the search started, so a block broken mid search makes the path
+            stale straight away.
+
+        """
+        key = (start, goal, diagonal_movement, self._full_bounds(bounds))
+        self._paths[key] = _CachedPath(path, *snapshot, search_time)
+        self._paths.move_to_end(key)
+        if len(self._paths) > self.max_size:
+            self._paths.popitem(last=False)
+
+    def clear(self) -> None:
+        self._paths.clear()
+        self.hits = 0
+        self.misses = 0
+        self.saved_time = 0.0
+
+    def _full_bounds(self, bounds: Optional[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+        if bounds is None:
+            return 0, 0, self._block_grid.width - 1, self._block_grid.height - 1
+        return bounds
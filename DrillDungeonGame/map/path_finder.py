@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import heapq
+import math
+from typing import Generator, List, Optional, Tuple
+
+from ..map.block import BLOCK, BLOCK_BY_CODE, OPEN_BLOCK_CODES
+
+SQRT_2 = math.sqrt(2)
+
+# The cost of moving into a block. Open blocks cost 1. Blocks that can be dug through cost as much as arcade's A*
+# charges for a barrier, so paths go around them where they can. Anything else can't be entered at all.
+DIG_COST = 50
+MOVE_COST_BY_CODE = [math.inf] * 256
+for _code in BLOCK_BY_CODE:
+    if _code in OPEN_BLOCK_CODES:
+        MOVE_COST_BY_CODE[_code] = 1
+    elif BLOCK_BY_CODE[_code] in (BLOCK.DIRT, BLOCK.COAL, BLOCK.GOLD):
+        MOVE_COST_BY_CODE[_code] = DIG_COST
+
+SEARCH_SLICE = 64  # How many blocks a time sliced search expands between each chance to pause.
+
+_STRAIGHT_MOVES = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_DIAGONAL_MOVES = ((1, 1), (-1, 1), (1, -1), (-1, -1))
+
+
+class GridPathFinder:
+    """
+
+    Finds paths between blocks of a BlockGrid using A*, working straight from the grid's tiles array.
+
+    Notes
+    -----
+    All of the per-block search state (the cost to reach a block, which block it was reached from and whether it
+    has been closed) is kept in flat lists the size of the grid, allocated once. Rather than clearing them before
+    every search, each entry is stamped with the number of the search that last wrote it, and entries from older
+    searches are treated as unvisited. The open set is a binary heap.
+
+    A search can also be run a slice at a time with search, so it can be spread over several frames. As the buffers
+    are shared, a paused search that finds another search has run in the meantime starts again from scratch.
+
+    The heuristic is the octile distance, which is exact on an open grid where diagonal moves cost sqrt(2), or the
+    manhattan distance without diagonal movement. Diagonal moves aren't allowed to cut the corner of a block that
+    can't be walked through.
+
+    Methods
+    -------
+    find_path(start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool, bounds: Tuple[int, int, int, int])
+        Returns the blocks along the cheapest path between two blocks.
+    search(start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool, bounds: Tuple[int, int, int, int])
+        Returns a generator that finds the same path as find_path a slice at a time.
+
+    """
+    def __init__(self, block_grid) -> None:
+        """
+
+        Parameters
+        ----------
+        block_grid  :   BlockGrid
+            The block grid to find paths through. Blocks it breaks are seen by the next search.
+
+        """
+        self._width = block_grid.width
+        self._height = block_grid.height
+        # A flat view of the tiles array, so reading a tile doesn't have to go through numpy's indexing. The grid is
+        # indexed as tiles[x, y], so the flat index of x, y is x * height + y.
+        self._tiles = memoryview(block_grid.tiles.reshape(-1))
+
+        size = self._width * self._height
+        self._cost = [0.0] * size
+        self._parent = [0] * size
+        self._seen = [0] * size
+        self._closed = [0] * size
+        self._search = 0
+
+    def find_path(self, start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool = True,
+                  bounds: Optional[Tuple[int, int, int, int]] = None) -> Optional[List[Tuple[int, int]]]:
+        """
+
+        Returns the blocks along the cheapest path between two blocks.
+
+        Parameters
+        ----------
+        start               :   Tuple[int, int]
+            The x and y index of the block to start from.
+        goal                :   Tuple[int, int]
+            The x and y index of the block to find a path to.
+        diagonal_movement   :   bool
+            Whether or not the path can include diagonal movement. Defaults to True.
+        bounds              :   Optional[Tuple[int, int, int, int]]
+            The left, bottom, right and top index (inclusive) of the blocks that the path can go through, eg. the
+            blocks an entity can see. Defaults to the whole grid.
+
+        Returns
+        -------
+        Optional[List[Tuple[int, int]]]
+            The x and y index of every block on the path, from start to goal. None if there is no path.
+
+        """
+        search = self.search(start, goal, diagonal_movement, bounds)
+        try:
+            while True:
+                next(search)
+        except StopIteration as finished:
+            return finished.value
+
+    def search(self, start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool = True,
+               bounds: Optional[Tuple[int, int, int, int]] = None
+               ) -> Generator[None, None, Optional[List[Tuple[int, int]]]]:
+        """
+
+        Returns a generator that finds the same path as find_path, yielding every SEARCH_SLICE blocks it expands so
+        the caller can pause the search and pick it up again later. The path is the generator's return value, ie. the
+        value of the StopIteration it finishes with.
+
+        """
+        left, bottom, right, top = 0, 0, self._width - 1, self._height - 1
+        if bounds is not None:
+            left, bottom = max(left, bounds[0]), max(bottom, bounds[1])
+            right, top = min(right, bounds[2]), min(top, bounds[3])
+
+        (start_x, start_y), (goal_x, goal_y) = start, goal
+        if not (left <= start_x <= right and bottom <= start_y <= top and
+                left <= goal_x <= right and bottom <= goal_y <= top):
+            return None
+
+        height = self._height
+        tiles, cost, parent, seen, closed = self._tiles, self._cost, self._parent, self._seen, self._closed
+        moves = _STRAIGHT_MOVES + _DIAGONAL_MOVES if diagonal_movement else _STRAIGHT_MOVES
+        heuristic = _octile_distance if diagonal_movement else _manhattan_distance
+        start_index = start_x * height + start_y
+        goal_index = goal_x * height + goal_y
+
+        restart = True
+        while restart:
+            restart = False
+            self._search += 1
+            search = self._search
+            cost[start_index] = 0.0
+            seen[start_index] = search
+            open_heap = [(heuristic(start_x, start_y, goal_x, goal_y), 0.0, start_x, start_y)]
+            expanded = 0
+
+            while open_heap:
+                expanded += 1
+                if expanded % SEARCH_SLICE == 0:
+                    yield
+                    if self._search != search:
+                        restart = True  # Another search has reused the buffers while this one was paused.
+                        break
+
+                _, current_cost, x, y = heapq.heappop(open_heap)
+                index = x * height + y
+                if closed[index] == search:
+                    continue  # A stale heap entry for a block that has since been reached more cheaply.
+                if index == goal_index:
+                    return self._trace_path(index, start_index)
+                closed[index] = search
+
+                for dx, dy in moves:
+                    next_x, next_y = x + dx, y + dy
+                    if not (left <= next_x <= right and bottom <= next_y <= top):
+                        continue
+                    next_index = next_x * height + next_y
+                    if closed[next_index] == search:
+                        continue
+                    move_cost = MOVE_COST_BY_CODE[tiles[next_index]]
+                    if move_cost == math.inf:
+                        continue
+                    if dx and dy:
+                        # Don't cut the corner of a block that can't be walked through.
+                        if MOVE_COST_BY_CODE[tiles[x * height + next_y]] == math.inf or \
+                                MOVE_COST_BY_CODE[tiles[next_x * height + y]] == math.inf:
+                            continue
+                        move_cost *= SQRT_2
+
+                    next_cost = current_cost + move_cost
+                    if seen[next_index] == search and next_cost >= cost[next_index]:
+                        continue
+                    seen[next_index] = search
+                    cost[next_index] = next_cost
+                    parent[next_index] = index
+                    heapq.heappush(open_heap, (next_cost + heuristic(next_x, next_y, goal_x, goal_y),
+                                               next_cost, next_x, next_y))
+        return None
+
+    def _trace_path(self, index: int, start_index: int) -> List[Tuple[int, int]]:
+        path = []
+        while index != start_index:
+            path.append(divmod(index, self._height))
+            index = self._parent[index]
+        path.append(divmod(start_index, self._height))
+        path.reverse()
+        return path
+
+
+def _octile_distance(x: int, y: int, goal_x: int, goal_y: int) -> float:
+    dx, dy = abs(x - goal_x), abs(y - goal_y)
+    return (dx + dy) + (SQRT_2 - 2) * min(dx, dy)
+
+
+def _manhattan_distance(x: int, y: int, goal_x: int, goal_y: int) -> float:
+    return abs(x - goal_x) + abs(y - goal_y)
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import time
+import weakref
+from typing import Callable, Dict, List, Optional, Tuple
+
+STALENESS_WEIGHT = 0.1  # How many blocks closer a request is treated as for every frame its owner's path has aged.
+
+
+class _PathRequest:
+    __slots__ = ('owner', 'start', 'goal', 'diagonal_movement', 'bounds', 'callback', 'search', 'snapshot',
+                 'search_time', 'cancelled')
+
+    def __init__(self, owner, start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool,
+                 bounds: Tuple[int, int, int, int],
+                 callback: Callable[[Optional[List[Tuple[int, int]]]], None]) -> None:
+        self.owner = owner
+        self.start = start
+        self.goal = goal
+        self.diagonal_movement = diagonal_movement
+        self.bounds = bounds
+        self.callback = callback
+        self.search = None
+        self.snapshot = None
+        self.search_time = 0.0
+        self.cancelled = False
+
+
+class PathRequestQueue:
+    """
+
+    Queues path finding requests on a BlockGrid and works through them under a time budget each frame.
+
+    Notes
+    -----
+    Enemies re-path on a timer, so on some frames many of them ask for a path at once. Rather than searching for
+    every path the moment it is asked for, requests are queued and process works through them, most urgent first,
+    until that frame's budget is spent. A search that runs out of budget is paused and picked up again next frame,
+    using GridPathFinder.search. Each owner has at most one request queued; asking again replaces it.
+
+    Requests are ordered by the distance in blocks between the start and goal (normally the drill), less
+    STALENESS_WEIGHT for every frame since the owner last had a path delivered, so nearby enemies are served first
+    but far away ones are never starved. Finished paths are stored in the grid's PathCache.
+
+    Methods
+    -------
+    request(owner, start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool,
+            bounds: Tuple[int, int, int, int], callback: Callable)
+        Queues a request for a path, replacing any request already queued for the owner.
+    cancel(owner)
+        Drops the request queued for an owner, if there is one.
+    process(budget_ms: Optional[float])
+        Works through the queued requests until the budget is spent.
+
+    """
+    def __init__(self, block_grid) -> None:
+        """
+
+        Parameters
+        ----------
+        block_grid  :   BlockGrid
+            The block grid whose path finder and path cache to use.
+
+        """
+        self.frame = 0
+        self._block_grid = block_grid
+        self._heap: List[Tuple[float, int, _PathRequest]] = []
+        self._counter = itertools.count()  # Breaks ties between requests with the same priority in queued order.
+        self._queued: Dict[object, _PathRequest] = {}
+        self._current: Optional[_PathRequest] = None
+        self._last_served = weakref.WeakKeyDictionary()
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def request(self, owner, start: Tuple[int, int], goal: Tuple[int, int], diagonal_movement: bool,
+                bounds: Tuple[int, int, int, int], callback: Callable[[Optional[List[Tuple[int, int]]]], None]) -> None:
+        """
+
+        Queues a request for a path, replacing any request already queued for the owner.
+
+        Parameters
+        ----------
+        owner               :   Entity
+            The entity that wants the path.
+        start               :   Tuple[int, int]
+            The x and y index of the block to start from.
+        goal                :   Tuple[int, int]
+            The x and y index of the block to find a path to.
+        diagonal_movement   :   bool
+            Whether or not the path can include diagonal movement.
+        bounds              :   Tuple[int, int, int, int]
+            The left, bottom, right and top index (inclusive) of the blocks that the path can go through.
+        callback            :   Callable[[Optional[List[Tuple[int, int]]]], None]
+            Called with the path (see GridPathFinder.find_path) once it has been found.
+
+        """
+        self.cancel(owner)
+        request = _PathRequest(owner, start, goal, diagonal_movement, bounds, callback)
+        self._queued[owner] = request
+        staleness = self.frame - self._last_served.get(owner, 0)
+        distance = max(abs(start[0] - goal[0]), abs(start[1] - goal[1]))
+        priority = distance - STALENESS_WEIGHT * staleness
+        heapq.heappush(self._heap, (priority, next(self._counter), request))
+
+    def cancel(self, owner) -> None:
+        request = self._queued.pop(owner, None)
+        if request is not None:
+            request.cancelled = True  # Left in the heap, and skipped when it reaches the top.
+            if request is self._current:
+                self._current = None
+
+    def process(self, budget_ms: Optional[float] = None) -> int:
+        """
+
+        Works through the queued requests, most urgent first, until the budget for this frame is spent. Should be
+        called once a frame.
+
+        Parameters
+        ----------
+        budget_ms   :   Optional[float]
+            How many milliseconds to spend searching. None means keep going until the queue is empty.
+
+        Returns
+        -------
+        int
+            The number of requests that were finished.
+
+        """
+        self.frame += 1
+        deadline = time.perf_counter() + budget_ms / 1000 if budget_ms is not None else None
+        path_cache = self._block_grid.path_cache
+        finished = 0
+        searched = False  # Every frame gets at least one slice, however small the budget, so searches always finish.
+
+        while True:
+            if searched and deadline is not None and time.perf_counter() >= deadline:
+                return finished
+            request = self._current or self._next_request()
+            if request is None:
+                return finished
+            self._current = request
+            if request.search is None:
+                request.snapshot = path_cache.snapshot(request.bounds)
+                request.search = self._block_grid.path_finder.search(request.start, request.goal,
+                                                                     request.diagonal_movement, request.bounds)
+
+            slice_start = time.perf_counter()
+            try:
+                while True:
+                    next(request.search)
+                    searched = True
+                    if deadline is not None and time.perf_counter() >= deadline:
+                        break
+            except StopIteration as done:
+                searched = True
+                request.search_time += time.perf_counter() - slice_start
+                self._current = None
+                del self._queued[request.owner]
+                self._last_served[request.owner] = self.frame
+                path_cache.put(request.start, request.goal, request.diagonal_movement, request.bounds, done.value,
+                               request.search_time, request.snapshot)
+                request.callback(done.value)
+                finished += 1
+                continue
+
+            request.search_time += time.perf_counter() - slice_start
+            return finished  # Out of budget, so the search carries on next frame.
+
+    def _next_request(self) -> Optional[_PathRequest]:
+        while self._heap:
+            _, _, request = heapq.heappop(self._heap)
+            if not request.cancelled:
+                return request
+        return None
@@ -1,10 +1,13 @@
 import math
+from functools import lru_cache
 from typing import Union
 
 import arcade
 
 from .utility import make_vignette, SCREEN_HEIGHT, SCREEN_WIDTH, VIEWPOINT_MARGIN
 
+VIGNETTE_CACHE_SIZE = 32  # How many vignette textures are kept, so going back to a recent vision is free.
+
 
 class ObscuredVision:
     """
@@ -114,8 +117,7 @@ class ObscuredVision:
         self._outer_alpha = 255
         self._center_alpha = 0
         new_radius = self.vision + amount
-        self.vision = min(self._image_diagonal_diameter // 2, new_radius, self._max_vision)
-        self._reload_image()
+        self.vision = min(self._image_diagonal_diameter // 2, new_radius, self._max_vision)  # Reloads the image.
 
     def decrease_vision(self, amount: int = 50) -> None:
         """Decreases the vision by a given amount.
@@ -129,8 +131,7 @@ class ObscuredVision:
         self._outer_alpha = 255
         self._center_alpha = 0
         new_radius = self.vision - amount
-        self.vision = max(0, new_radius)
-        self._reload_image()
+        self.vision = max(0, new_radius)  # Reloads the image.
 
     def blind(self) -> None:
         """Fills the vision with a black image so that you can't see anything."""
@@ -145,8 +146,15 @@ class ObscuredVision:
         self._reload_image()
 
     def _reload_image(self) -> None:
-        self._image = make_vignette(diameter=self._image_diagonal_diameter,
-                                    color=arcade.color.BLACK,
-                                    vignette_radius=self.vision,
-                                    center_alpha=self._center_alpha,
-                                    outer_alpha=self._outer_alpha)
+        self._image = _vignette_texture(self._image_diagonal_diameter, self.vision, self._center_alpha,
+                                        self._outer_alpha)
+
+
+@lru_cache(maxsize=VIGNETTE_CACHE_SIZE)
+def _vignette_texture(diameter: int, radius: int, center_alpha: int, outer_alpha: int) -> arcade.Texture:
+    """Returns the black vignette texture for a vision, making it only if it isn't one of the recently used ones."""
+    return make_vignette(diameter=diameter,
+                         color=arcade.color.BLACK,
+                         vignette_radius=radius,
+                         center_alpha=center_alpha,
+                         outer_alpha=outer_alpha)
@@ -1,7 +1,8 @@
-import math
-import random
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
 
 import arcade
+import numpy as np
 
 PARTICLE_FADE_RATE = 12
 
@@ -42,320 +43,272 @@ SMOKE_RISE_RATE = 0.5
 SMOKE_CHANCE = 0.25  
 
 
-class Smoke(arcade.SpriteCircle):
-    """
+SMOKE_SIZES = (5, 50)  # The radii of the smoke textures baked up front. Other sizes are baked when first used.
+SMOKE_PARTICLE_SIZE = 5  # The radius of the smoke given off by coal particles.
 
-    Creation of smoke when block is hit.
 
-    Notes
-    -----
-    Only used for coal blocks. \n
-    Source: https://arcade.academy/examples/sprite_explosion_particles.html
+class ParticleKind(Enum):
+    DIRT = 0
+    COAL = 1
+    GOLD = 2
+    SHIELD = 3
+    SMOKE = 4
 
-    Methods
-    -------
-    update()
-        Update current sprite lists for particle and smoke fade effect.
-    draw()
-        Display the effects on the screen.
 
-    """
-    def __init__(self, size) -> None:
-        """
-
-        Parameters
-        ----------
-        size: int
+_PARTICLE_COLORS = {ParticleKind.DIRT: PARTICLE_COLORS_DIRT,
+                    ParticleKind.COAL: PARTICLE_COLORS_COAL,
+                    ParticleKind.GOLD: PARTICLE_COLORS_GOLD,
+                    ParticleKind.SHIELD: PARTICLE_COLORS_SHIELD}
+_SPARKLE_COLORS = {ParticleKind.GOLD: arcade.color.WHITE,
+                   ParticleKind.SHIELD: arcade.color.SAPPHIRE_BLUE}
+# How much each kind of particle fades and grows by each frame, indexed by ParticleKind.value.
+_FADE_RATES = np.array([PARTICLE_FADE_RATE] * 4 + [SMOKE_FADE_RATE], dtype=np.float64)
+_EXPANSION_RATES = np.array([0.0] * 4 + [SMOKE_EXPANSION_RATE], dtype=np.float64)
 
-        """
-        super().__init__(size, arcade.color.BLACK, soft=True)
-        self.change_y = SMOKE_RISE_RATE
-        self.scale = SMOKE_START_SCALE
 
-    def update(self):
-        """
-
-        Update sprite lists for particle and smoke fade effects.
-
-        """
-        if self.alpha <= PARTICLE_FADE_RATE:
-            self.remove_from_sprite_lists()
-        else:
-            self.alpha -= SMOKE_FADE_RATE
-            self.center_x += self.change_x
-            self.center_y += self.change_y
-            self.scale += SMOKE_EXPANSION_RATE
-            
-    def draw(self):
-        """
-
-        Display effects on the screen.
-
-        """
-        for item in self.sprite_list:
-            item.draw()
-
-
-class ParticleDirt(arcade.SpriteCircle):
+class ParticleSystem:
     """
 
-    Explosion particle for dirt blocks.
+    Holds every explosion particle and smoke puff of a level in NumPy arrays, and moves and fades them all at once.
 
     Notes
     -----
-    Source: https://arcade.academy/examples/sprite_explosion_particles.html
+    Particles used to be a SpriteCircle each, making its own texture when created and running its own update with
+    its own random calls. Here the position, velocity, alpha, scale and texture of each particle are rows of a few
+    arrays, so a frame is a handful of vectorized operations whatever the number of particles. Particles look and
+    behave as before (see arcade's sprite_explosion_particles example): they fly out at a random speed and angle
+    and fade out, coal particles give off smoke, and gold and shield particles sparkle.
+
+    Every particle is drawn with one of a set of textures baked when the system is made, one for each particle
+    colour, sparkle and smoke size, instead of each particle making its own. The particles are drawn through a pool
+    of plain sprites in a SpriteList, one per live particle, which is brought in line with the arrays at the end of
+    each update.
 
     Methods
     -------
+    emit(kind: ParticleKind, position: Tuple[float, float], count: int)
+        Adds particles flying out from a point.
+    emit_smoke(position: Tuple[float, float], size: int)
+        Adds a puff of smoke at a point.
     update()
-        Update dirt particles.
-    draw()
-        Draw effects onto the screen.
+        Moves and fades every particle by one frame, removing those that have faded out.
+    inside(left: float, bottom: float, right: float, top: float)
+        Returns the indices of the particles inside an area.
+    keep(indices: np.ndarray)
+        Removes every particle but those given.
+    clear()
+        Removes every particle.
 
     """
-    def __init__(self, my_list):
+    def __init__(self, sprite_list: Optional[arcade.SpriteList] = None, seed: Optional[int] = None) -> None:
         """
 
         Parameters
         ----------
-        my_list: List[]
-            Dirt particles added here.
-
-        """
-        color = random.choice(PARTICLE_COLORS_DIRT)
+        sprite_list :   Optional[arcade.SpriteList]
+            The SpriteList to draw the particles through. The system owns the sprites it puts in it.
+        seed        :   Optional[int]
+            Seeds the random speeds, directions, colours, sparkles and smoke of the particles.
 
-        super().__init__(PARTICLE_RADIUS, color)
-
-        self.normal_texture = self.texture
-
-        self.my_list = my_list
-
-        speed = random.random() * PARTICLE_SPEED_RANGE + PARTICLE_MIN_SPEED
-        direction = random.randrange(360)
-        self.change_x = math.sin(math.radians(direction)) * speed
-        self.change_y = math.cos(math.radians(direction)) * speed
-
-        self.my_alpha = 255
-
-        self.my_list = my_list
-
-    def update(self) -> None:
         """
-
-        Update the dirt particles.
-
-        """
-        if self.my_alpha <= PARTICLE_FADE_RATE:
-            # Faded out, remove
-            self.remove_from_sprite_lists()
-        else:
-            # Update
-            self.my_alpha -= PARTICLE_FADE_RATE
-            self.alpha = self.my_alpha
-            self.center_x += self.change_x
-            self.center_y += self.change_y
-
-    def draw(self) -> None:
-        """
-
-        Draw effects onto the screen.
-
+        self.sprite_list = sprite_list if sprite_list is not None else arcade.SpriteList()
+        self._rng = np.random.default_rng(seed)
+        self._count = 0
+        self._x = np.zeros(0)
+        self._y = np.zeros(0)
+        self._change_x = np.zeros(0)
+        self._change_y = np.zeros(0)
+        self._alpha = np.zeros(0)
+        self._scale = np.zeros(0)
+        self._kind = np.zeros(0, dtype=np.int8)
+        self._texture = np.zeros(0, dtype=np.int16)
+        self._sparkle_texture = np.zeros(0, dtype=np.int16)  # -1 if the particle doesn't sparkle.
+        self._sparkling = np.zeros(0, dtype=bool)
+
+        self._textures: List[arcade.Texture] = []
+        self._texture_indices: Dict[tuple, int] = {}
+        for colors in _PARTICLE_COLORS.values():
+            for color in colors:
+                self._texture_index(('circle', color))
+        for color in _SPARKLE_COLORS.values():
+            self._texture_index(('circle', color))
+        for size in SMOKE_SIZES:
+            self._texture_index(('smoke', size))
+        self._spare_sprites: List[arcade.Sprite] = []
+        self._sprite_textures: List[int] = []  # The texture each sprite in the pool is showing.
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def positions(self) -> np.ndarray:
+        """The x and y pixel coordinates of every particle, as an array of shape (len(self), 2)."""
+        return np.column_stack((self._x[:self._count], self._y[:self._count]))
+
+    def emit(self, kind: ParticleKind, position: Tuple[float, float], count: int = PARTICLE_COUNT) -> None:
         """
-        for item in self.sprite_list:
-            item.draw()
-            
 
-class ParticleCoal(arcade.SpriteCircle):
-    """
-
-    Explosion particle for coal blocks.
-
-    Notes
-    -----
-    Source: https://arcade.academy/examples/sprite_explosion_particles.html
-
-    Methods
-    -------
-    update()
-        Update dirt particles.
-    draw()
-        Draw effects onto the screen.
-
-    """
-    def __init__(self, my_list):
-        """
+        Adds particles flying out from a point, each at a random speed and direction and in a random colour of
+        their kind.
 
         Parameters
         ----------
-        my_list: List[]
-            Coal particles added here.
+        kind        :   ParticleKind
+            The kind of particle to add. Use emit_smoke for smoke.
+        position    :   Tuple[float, float]
+            The x and y pixel coordinates to add the particles at.
+        count       :   int
+            How many particles to add.
 
         """
-        color = random.choice(PARTICLE_COLORS_COAL)
-        super().__init__(PARTICLE_RADIUS, color)
-     
-        self.normal_texture = self.texture
-        self.my_list = my_list
-        speed = random.random() * PARTICLE_SPEED_RANGE + PARTICLE_MIN_SPEED
-        direction = random.randrange(360)
-        self.change_x = math.sin(math.radians(direction)) * speed
-        self.change_y = math.cos(math.radians(direction)) * speed
-        self.my_alpha = 255
-        self.my_list = my_list
-
-    def update(self) -> None:
+        if kind is ParticleKind.SMOKE:
+            raise ValueError('Smoke has a size, use emit_smoke instead.')
+        speed = self._rng.random(count) * PARTICLE_SPEED_RANGE + PARTICLE_MIN_SPEED
+        direction = np.radians(self._rng.integers(0, 360, count))
+        colors = _PARTICLE_COLORS[kind]
+        textures = np.array([self._texture_index(('circle', color)) for color in colors], dtype=np.int16)
+        sparkle = _SPARKLE_COLORS.get(kind)
+        sparkle_texture = -1 if sparkle is None else self._texture_index(('circle', sparkle))
+        self._append(count, position, np.sin(direction) * speed, np.cos(direction) * speed, 1.0, kind,
+                     textures[self._rng.integers(0, len(colors), count)], sparkle_texture)
+
+    def emit_smoke(self, position: Tuple[float, float], size: int) -> None:
         """
 
-        Update the coal particles.
-
-        """
-        if self.my_alpha <= PARTICLE_FADE_RATE:
-            self.remove_from_sprite_lists()
-        else:
-            self.my_alpha -= PARTICLE_FADE_RATE
-            self.alpha = self.my_alpha
-            self.center_x += self.change_x
-            self.center_y += self.change_y
-            
-
-            if random.random() <= SMOKE_CHANCE:
-                smoke = Smoke(5)
-                smoke.position = self.position
-                self.my_list.append(smoke)
-                
-    def draw(self) -> None:
-        """
-
-        Draw effects onto the screen.
-
-        """
-        for item in self.sprite_list:
-            item.draw()
-
-
-class ParticleGold(arcade.SpriteCircle):
-    """
-
-    Explosion particle for gold blocks.
-
-    Notes
-    -----
-    Source: https://arcade.academy/examples/sprite_explosion_particles.html
-
-    Methods
-    -------
-    update()
-        Update dirt particles.
-    draw()
-        Draw effects onto the screen.
-
-    """
-    def __init__(self, my_list) -> None:
-        """
+        Adds a puff of smoke at a point, which rises, grows and fades out.
 
         Parameters
         ----------
-        my_list: List[]
-            Gold particles added here.
+        position    :   Tuple[float, float]
+            The x and y pixel coordinates to add the smoke at.
+        size        :   int
+            The radius of the smoke texture, before it is scaled.
 
         """
-        color = random.choice(PARTICLE_COLORS_GOLD)
-        super().__init__(PARTICLE_RADIUS, color)
-        self.normal_texture = self.texture
-        self.my_list = my_list
-        speed = random.random() * PARTICLE_SPEED_RANGE + PARTICLE_MIN_SPEED
-        direction = random.randrange(360)
-        self.change_x = math.sin(math.radians(direction)) * speed
-        self.change_y = math.cos(math.radians(direction)) * speed
-        self.my_alpha = 255
-        self.my_list = my_list
+        self._append(1, position, 0.0, SMOKE_RISE_RATE, SMOKE_START_SCALE, ParticleKind.SMOKE,
+                     self._texture_index(('smoke', size)), -1)
 
     def update(self) -> None:
         """
 
-        Update the gold particles.
-
-        """
-        if self.my_alpha <= PARTICLE_FADE_RATE:
-            self.remove_from_sprite_lists()
-        else:
-            self.my_alpha -= PARTICLE_FADE_RATE
-            self.alpha = self.my_alpha
-            self.center_x += self.change_x
-            self.center_y += self.change_y
-        
-
-            if random.random() <= PARTICLE_SPARKLE_CHANCE:
-                self.alpha = 255
-                self.texture = arcade.make_circle_texture(int(self.width), arcade.color.WHITE)
-            else:
-                self.texture = self.normal_texture
+        Moves and fades every particle by one frame. Particles that have faded out are removed first, coal
+        particles may give off smoke, and gold and shield particles may sparkle for the frame.
 
-    def draw(self) -> None:
         """
-
-        Draw effects onto the screen.
-
+        n = self._count
+        alive = self._alpha[:n] > PARTICLE_FADE_RATE
+        if not alive.all():
+            self.keep(np.flatnonzero(alive))
+            n = self._count
+
+        kind = self._kind[:n]
+        self._alpha[:n] -= _FADE_RATES[kind]
+        self._x[:n] += self._change_x[:n]
+        self._y[:n] += self._change_y[:n]
+        self._scale[:n] += _EXPANSION_RATES[kind]
+
+        rolls = self._rng.random(n)
+        self._sparkling[:n] = (self._sparkle_texture[:n] >= 0) & (rolls <= PARTICLE_SPARKLE_CHANCE)
+        smoking = np.flatnonzero((kind == ParticleKind.COAL.value) & (rolls <= SMOKE_CHANCE))
+        if len(smoking):
+            texture = self._texture_index(('smoke', SMOKE_PARTICLE_SIZE))
+            self._append(len(smoking), (self._x[smoking], self._y[smoking]), 0.0, SMOKE_RISE_RATE,
+                         SMOKE_START_SCALE, ParticleKind.SMOKE, texture, -1)
+
+        self._sync_sprites()
+
+    def inside(self, left: float, bottom: float, right: float, top: float) -> np.ndarray:
         """
-        for item in self.sprite_list:
-            item.draw()
 
+        Returns the indices of the particles whose centre is inside an area.
 
-class ParticleShield(arcade.SpriteCircle):
-    """
-
-    Explosion particle for shield.
-
-    Notes
-    -----
-    Source: https://arcade.academy/examples/sprite_explosion_particles.html
-
-    Methods
-    -------
-    update()
-        Update dirt particles.
-    draw()
-        Draw effects onto the screen.
-
-    """
-
-    def __init__(self, my_list) -> None:
-        color = random.choice(PARTICLE_COLORS_SHIELD)
-        super().__init__(PARTICLE_RADIUS, color)
-        self.normal_texture = self.texture
-        self.my_list = my_list
-        speed = random.random() * PARTICLE_SPEED_RANGE + PARTICLE_MIN_SPEED
-        direction = random.randrange(360)
-        self.change_x = math.sin(math.radians(direction)) * speed
-        self.change_y = math.cos(math.radians(direction)) * speed
-        self.my_alpha = 255
-        self.my_list = my_list
-
-    def update(self) -> None:
-        """
-
-        Update the shield particles.
+        Parameters
+        ----------
+        left    :   float
+            The x pixel coordinate of the left edge of the area.
+        bottom  :   float
+            The y pixel coordinate of the bottom edge of the area.
+        right   :   float
+            The x pixel coordinate of the right edge of the area.
+        top     :   float
+            The y pixel coordinate of the top edge of the area.
+
+        Returns
+        -------
+        np.ndarray
+            The indices of the particles in the area, in order.
 
         """
-        if self.my_alpha <= PARTICLE_FADE_RATE:
-            self.remove_from_sprite_lists()
-        else:
-            self.my_alpha -= PARTICLE_FADE_RATE
-            self.alpha = self.my_alpha
-            self.center_x += self.change_x
-            self.center_y += self.change_y
-
-            if random.random() <= PARTICLE_SPARKLE_CHANCE:
-                self.alpha = 255
-                self.texture = arcade.make_circle_texture(int(self.width), arcade.color.SAPPHIRE_BLUE)
+        x, y = self._x[:self._count], self._y[:self._count]
+        return np.flatnonzero((left <= x) & (x <= right) & (bottom <= y) & (y <= top))
+
+    def keep(self, indices: np.ndarray) -> None:
+        """Removes every particle except those at the given indices, which must be in increasing order."""
+        count = len(indices)
+        for array in self._arrays():
+            array[:count] = array[indices]
+        self._count = count
+
+    def clear(self) -> None:
+        self._count = 0
+        self._sync_sprites()
+
+    def _arrays(self) -> Tuple[np.ndarray, ...]:
+        return (self._x, self._y, self._change_x, self._change_y, self._alpha, self._scale, self._kind,
+                self._texture, self._sparkle_texture, self._sparkling)
+
+    def _append(self, count: int, position, change_x, change_y, scale, kind: ParticleKind, texture,
+                sparkle_texture) -> None:
+        start, end = self._count, self._count + count
+        if end > len(self._x):
+            capacity = max(64, 2 * end)
+            self._x, self._y, self._change_x, self._change_y, self._alpha, self._scale, self._kind, self._texture, \
+                self._sparkle_texture, self._sparkling = (np.resize(array, capacity) for array in self._arrays())
+        self._x[start:end], self._y[start:end] = position
+        self._change_x[start:end] = change_x
+        self._change_y[start:end] = change_y
+        self._alpha[start:end] = 255
+        self._scale[start:end] = scale
+        self._kind[start:end] = kind.value
+        self._texture[start:end] = texture
+        self._sparkle_texture[start:end] = sparkle_texture
+        self._sparkling[start:end] = False
+        self._count = end
+
+    def _texture_index(self, key: tuple) -> int:
+        index = self._texture_indices.get(key)
+        if index is None:
+            shape, value = key
+            if shape == 'circle':
+                texture = arcade.make_circle_texture(PARTICLE_RADIUS * 2, value)
             else:
-                self.texture = self.normal_texture
-
-    def draw(self) -> None:
-        """
-
-        Draw effects onto the screen.
-
-        """
-        for item in self.sprite_list:
-            item.draw()
+                texture = arcade.make_soft_circle_texture(value * 2, arcade.color.BLACK)
+            index = self._texture_indices[key] = len(self._textures)
+            self._textures.append(texture)
+        return index
+
+    def _sync_sprites(self) -> None:
+        """Brings the pool of sprites in the sprite list in line with the particles, one sprite per particle."""
+        n = self._count
+        sprite_list = self.sprite_list
+        while len(sprite_list) > n:
+            self._spare_sprites.append(sprite_list.pop())
+            self._sprite_textures.pop()
+        while len(sprite_list) < n:
+            sprite = self._spare_sprites.pop() if self._spare_sprites else arcade.Sprite()
+            sprite_list.append(sprite)
+            self._sprite_textures.append(-1)
+
+        sparkling = self._sparkling[:n]
+        textures = np.where(sparkling, self._sparkle_texture[:n], self._texture[:n]).tolist()
+        alphas = np.where(sparkling, 255, self._alpha[:n]).astype(int).tolist()
+        sprite_textures = self._sprite_textures
+        for i, (sprite, x, y, alpha, scale, texture) in enumerate(zip(
+                sprite_list, self._x[:n].tolist(), self._y[:n].tolist(), alphas, self._scale[:n].tolist(),
+                textures)):
+            if sprite_textures[i] != texture:
+                sprite.texture = self._textures[texture]
+                sprite_textures[i] = texture
+            sprite.scale = scale
+            sprite.position = x, y
+            sprite.alpha = alpha
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Tuple
+
+import arcade
+
+from .utility import BLOCK_PIXEL_SIZE
+
+SPATIAL_HASH_CELL_SIZE = 4 * BLOCK_PIXEL_SIZE  # The width and height of a cell of the hash, in pixels.
+
+_CellBounds = Tuple[int, int, int, int]
+
+
+class SpatialHash:
+    """
+
+    Buckets sprites into a uniform grid of cells by position, so the sprites near a point can be found without
+    looking at every sprite.
+
+    Notes
+    -----
+    Each sprite is stored in every cell its bounding box overlaps. The box is taken as a square as wide as the
+    sprite's diagonal, so it still holds the sprite whatever angle it is turned to and no hit box has to be worked
+    out. Queries return every sprite in the cells overlapping an area: the candidates that might overlap it, which
+    still need an exact check.
+
+    The hash doesn't notice sprites moving by itself. Anything that moves a sprite should call move on it (which
+    does nothing unless it has crossed into another cell), or call sync with every sprite once a frame.
+
+    Methods
+    -------
+    add(sprite: arcade.Sprite)
+        Adds a sprite to the hash, or moves it if it is already in it.
+    move(sprite: arcade.Sprite)
+        Updates the cells a sprite is in after it has moved.
+    remove(sprite: arcade.Sprite)
+        Takes a sprite out of the hash, if it is in it.
+    sync(sprites: Iterable[arcade.Sprite])
+        Makes the hash hold exactly these sprites, at their current positions.
+    query(left: float, bottom: float, right: float, top: float)
+        Returns the sprites in the cells overlapping an area.
+    query_radius(x: float, y: float, radius: float)
+        Returns the sprites in the cells within a radius of a point.
+    near(sprite: arcade.Sprite)
+        Returns the sprites in the cells a sprite overlaps, other than the sprite itself.
+
+    """
+    def __init__(self, cell_size: int = SPATIAL_HASH_CELL_SIZE) -> None:
+        """
+
+        Parameters
+        ----------
+        cell_size   :   int
+            The width and height of a cell, in pixels.
+
+        """
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[arcade.Sprite]] = {}
+        self._bounds: Dict[arcade.Sprite, _CellBounds] = {}  # The range of cells each sprite is stored in.
+
+    def __len__(self) -> int:
+        return len(self._bounds)
+
+    def __contains__(self, sprite: arcade.Sprite) -> bool:
+        return sprite in self._bounds
+
+    def add(self, sprite: arcade.Sprite) -> None:
+        """Adds a sprite to the hash at its current position, or moves it if it is already in the hash."""
+        self.move(sprite)
+
+    def move(self, sprite: arcade.Sprite) -> None:
+        """
+
+        Updates the cells a sprite is in after it has moved. Cheap if it is still in the same cells, so can be called
+        every frame. A sprite that isn't in the hash is added.
+
+        """
+        bounds = self._cell_bounds(sprite)
+        old_bounds = self._bounds.get(sprite)
+        if bounds == old_bounds:
+            return
+        if old_bounds is not None:
+            self._unlink(sprite, old_bounds)
+        self._bounds[sprite] = bounds
+        left, bottom, right, top = bounds
+        for cell_x in range(left, right + 1):
+            for cell_y in range(bottom, top + 1):
+                self._cells.setdefault((cell_x, cell_y), []).append(sprite)
+
+    def remove(self, sprite: arcade.Sprite) -> None:
+        bounds = self._bounds.pop(sprite, None)
+        if bounds is not None:
+            self._unlink(sprite, bounds)
+
+    def sync(self, sprites: Iterable[arcade.Sprite]) -> None:
+        """Makes the hash hold exactly the given sprites, moving those already in it and dropping any others."""
+        sprites = list(sprites)
+        keep = set(sprites)
+        for sprite in [sprite for sprite in self._bounds if sprite not in keep]:
+            self.remove(sprite)
+        for sprite in sprites:
+            self.move(sprite)
+
+    def query(self, left: float, bottom: float, right: float, top: float) -> List[arcade.Sprite]:
+        """
+
+        Returns every sprite in the cells overlapping an area, each once. These are only candidates: a sprite is
+        returned if it is near the area, not necessarily in it.
+
+        Parameters
+        ----------
+        left    :   float
+            The x pixel coordinate of the left edge of the area.
+        bottom  :   float
+            The y pixel coordinate of the bottom edge of the area.
+        right   :   float
+            The x pixel coordinate of the right edge of the area.
+        top     :   float
+            The y pixel coordinate of the top edge of the area.
+
+        Returns
+        -------
+        List[arcade.Sprite]
+            The sprites near the area.
+
+        """
+        cell_size = self.cell_size
+        cells = self._cells
+        found: Dict[arcade.Sprite, None] = {}
+        for cell_x in range(math.floor(left / cell_size), math.floor(right / cell_size) + 1):
+            for cell_y in range(math.floor(bottom / cell_size), math.floor(top / cell_size) + 1):
+                cell = cells.get((cell_x, cell_y))
+                if cell:
+                    found.update(dict.fromkeys(cell))
+        return list(found)
+
+    def query_radius(self, x: float, y: float, radius: float) -> List[arcade.Sprite]:
+        """Returns every sprite in the cells within a square around a point, as candidates for being in range."""
+        return self.query(x - radius, y - radius, x + radius, y + radius)
+
+    def near(self, sprite: arcade.Sprite) -> List[arcade.Sprite]:
+        """Returns every other sprite in the cells a sprite overlaps, as candidates for colliding with it."""
+        half_size = math.hypot(sprite.width, sprite.height) / 2
+        return [other for other in self.query(sprite.center_x - half_size, sprite.center_y - half_size,
+                                              sprite.center_x + half_size, sprite.center_y + half_size)
+                if other is not sprite]
+
+    def _cell_bounds(self, sprite: arcade.Sprite) -> _CellBounds:
+        half_size = math.hypot(sprite.width, sprite.height) / 2
+        cell_size = self.cell_size
+        return (math.floor((sprite.center_x - half_size) / cell_size),
+                math.floor((sprite.center_y - half_size) / cell_size),
+                math.floor((sprite.center_x + half_size) / cell_size),
+                math.floor((sprite.center_y + half_size) / cell_size))
+
+    def _unlink(self, sprite: arcade.Sprite, bounds: _CellBounds) -> None:
+        left, bottom, right, top = bounds
+        for cell_x in range(left, right + 1):
+            for cell_y in range(bottom, top + 1):
+                cell = self._cells[(cell_x, cell_y)]
+                cell.remove(sprite)
+                if not cell:
+                    del self._cells[(cell_x, cell_y)]
@@ -3,6 +3,8 @@ from typing import List
 import arcade
 
 from .entity.entities import Drill
+from .particles.explosion import ParticleSystem
+from .spatial_hash import SpatialHash
 
 
 class SpriteContainer:
@@ -19,6 +21,10 @@ class SpriteContainer:
     -------
     extend(other)
         Defines additional behaviour of the class.
+    update_entity_hash()
+        Brings entity_hash back in line with entity_list after entities have been added or removed.
+    entities_near(sprite: arcade.Sprite)
+        Returns the entities that could be colliding with a sprite.
     all()
         Returns a list containing all SpriteLists.
 
@@ -39,7 +45,7 @@ class SpriteContainer:
         shop_list                   : arcade.SpriteList
             List containing all shops on the map.
         explosion_list              : arcade.SpriteList
-            List containing all explosion elements.
+            List the explosion particles are drawn through. Owned by the particle system.
         entity_list                 : arcade.SpriteList
             List containing all entities on map.
         drill_list                  : arcade.SpriteList
@@ -75,6 +81,11 @@ class SpriteContainer:
         self.indestructible_blocks_list = indestructible_blocks_list
         self.drill_down_list = drill_down_list
 
+        # The entities in entity_list bucketed by position, so the ones near a point can be found quickly.
+        self.entity_hash = SpatialHash()
+        # Every explosion particle and puff of smoke, drawn through explosion_list.
+        self.particles = ParticleSystem(explosion_list)
+
     def extend(self, other):
         """
 
@@ -96,7 +107,6 @@ class SpriteContainer:
 
         """
         self.border_wall_list.extend(other.border_wall_list)
-        self.explosion_list.extend(other.explosion_list)
         self.entity_list.extend(other.entity_list)
         self.bullet_list.extend(other.bullet_list)
 
@@ -104,6 +114,36 @@ class SpriteContainer:
         self.destructible_blocks_list.extend(other.destructible_blocks_list)
         self.indestructible_blocks_list.extend(other.indestructible_blocks_list)
 
+    def update_entity_hash(self) -> None:
+        """
+
+        Brings entity_hash back in line with entity_list if entities have been added or removed. Entities that move
+        should be moved in the hash by whatever moves them, see AILevelOfDetail.update.
+
+        """
+        if len(self.entity_hash) != len(self.entity_list):
+            self.entity_hash.sync(self.entity_list)
+
+    def entities_near(self, sprite: arcade.Sprite) -> List[arcade.Sprite]:
+        """
+
+        Returns the entities in entity_list that are near enough to a sprite that they could be colliding with it,
+        looking only in the cells of entity_hash around it.
+
+        Parameters
+        ----------
+        sprite  :   arcade.Sprite
+            The sprite to find the entities near.
+
+        Returns
+        -------
+        List[arcade.Sprite]
+            The entities to check for a collision with the sprite.
+
+        """
+        self.update_entity_hash()
+        return self.entity_hash.near(sprite)
+
     @property
     def all(self) -> List[arcade.SpriteList]:
         """
@@ -10,6 +10,8 @@ MAP_WIDTH = 2400
 MAP_HEIGHT = 2400
 BLOCK_PIXEL_SIZE = 20
 
+PATH_FINDING_BUDGET_MS = 2.0  # How many milliseconds each frame can spend searching for queued paths.
+
 
 class FaceDirection(Enum):
     RIGHT = 0
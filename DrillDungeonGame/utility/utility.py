@@ -1,12 +1,13 @@
 import math
 import random
+from functools import lru_cache
 from typing import Union, Tuple
 
 import PIL.Image
-import PIL.ImageDraw
 import arcade
 import numpy as np
 
+from .constants import BLOCK_PIXEL_SIZE
 from ..particles.explosion import PARTICLE_COUNT
 
 
@@ -88,25 +89,56 @@ def is_near(a_x: float, a_y: float, b_x: float, b_y: float, distance: Union[floa
     return True if length < distance else False
 
 
+def tile_to_pixel(index: int) -> float:
+    """
+    Returns the pixel coordinate of the center of the block at a given grid index.
+
+    Parameters
+    ----------
+    index   : int
+        The x or y index of the block in the block grid.
+
+    Returns
+    -------
+    float
+        The x or y pixel coordinate of the center of that block.
+    """
+    return index * BLOCK_PIXEL_SIZE + BLOCK_PIXEL_SIZE / 2
+
+
+def pixel_to_tile(coordinate: float) -> int:
+    """
+    Returns the grid index of the block containing a given pixel coordinate.
+
+    Parameters
+    ----------
+    coordinate  : float
+        The x or y pixel coordinate on the map.
+
+    Returns
+    -------
+    int
+        The x or y index of the block in the block grid.
+    """
+    return int(coordinate // BLOCK_PIXEL_SIZE)
+
+
 def make_explosion_particles(particle, position: Tuple[float, float], time: float, sprites) -> None:
     """
     Function that creates explosion particle effects.
 
     Parameters
     ----------
-    particle
-        Particles generated.
+    particle    : ParticleKind
+        The kind of particles generated.
     position    : Tuple[float, float]
         Position of the center of the explosion.
     time        : float
         Time of explosion.
-    sprites     : arcade.Sprite
-        Sprites affected by the explosion.
+    sprites     : SpriteContainer
+        The SpriteContainer holding the particle system of the level.
     """
-    for i in range(PARTICLE_COUNT):
-        p = particle(sprites.explosion_list)
-        p.position = position
-        sprites.explosion_list.append(p)
+    sprites.particles.emit(particle, position, PARTICLE_COUNT)
 
 
 def make_vignette(diameter: int, color: arcade.Color, vignette_radius, center_alpha: int = 255, outer_alpha: int = 255):
@@ -120,6 +152,8 @@ def make_vignette(diameter: int, color: arcade.Color, vignette_radius, center_al
     In our implementation, we want the surrounding vignette to be filled, not empty.
     Otherwise we won't be blocking any
     vision for the drill to see.
+    Rather than drawing a ring at a time, the alpha of each ring is worked out once and looked up for every pixel
+    at once, from the ring it falls in.
 
     Parameters
     ----------
@@ -143,25 +177,35 @@ def make_vignette(diameter: int, color: arcade.Color, vignette_radius, center_al
     max_radius = diameter // 2
     assert vignette_radius <= max_radius
 
-    bg_colour = (0, 0, 0, 0)  # Make background transparent.
-    image = PIL.Image.new("RGBA", (diameter, diameter), bg_colour)
-    draw = PIL.ImageDraw.Draw(image)
-
-    for point in range(max_radius, 0, -1):
-        if point < vignette_radius:
-            alpha = int(arcade.lerp(center_alpha, outer_alpha, point / vignette_radius))
-            point_color = (color[0], color[1], color[2], alpha)
-            draw.ellipse((max_radius - point, max_radius - point, max_radius + point - 1, max_radius + point - 1),
-                         fill=point_color)
-        else:
-            point_color = (color[0], color[1], color[2], outer_alpha)
-            draw.rectangle((max_radius - point, max_radius - point, max_radius + point - 1, max_radius + point - 1),
-                           fill=point_color)
-
-    name = f"vignette_circle_texture:{diameter}:{color}:{center_alpha}:{outer_alpha}"
+    # The alpha of each ring of the image, from the centre out. Rings past the vignette_radius are filled.
+    points = np.arange(max_radius + 1)
+    ring_alphas = np.full(max_radius + 1, outer_alpha, dtype=np.uint8)
+    inside = points < vignette_radius
+    ring_alphas[inside] = center_alpha + (outer_alpha - center_alpha) * points[inside] / vignette_radius
+
+    pixels = np.empty((diameter, diameter, 4), dtype=np.uint8)
+    pixels[..., :3] = color[:3]
+    pixels[..., 3] = ring_alphas[_vignette_rings(diameter)]
+    image = PIL.Image.fromarray(pixels, "RGBA")
+
+    name = f"vignette_circle_texture:{diameter}:{color}:{vignette_radius}:{center_alpha}:{outer_alpha}"
     return arcade.Texture(name, image)
 
 
+@lru_cache(maxsize=4)
+def _vignette_rings(diameter: int) -> np.ndarray:
+    """
+    Returns which ring of a vignette image each pixel is in, ie. its distance from the centre rounded up. Only
+    depends on the size of the image, so is worked out once and shared by every vignette.
+    """
+    max_radius = diameter // 2
+    offsets = np.arange(diameter) - (max_radius - 0.5)
+    rings = np.ceil(np.hypot(offsets[:, np.newaxis], offsets[np.newaxis, :])).astype(np.intp)
+    np.clip(rings, 1, max_radius, out=rings)
+    rings.flags.writeable = False
+    return rings
+
+
 def load_mirrored_textures(filename) -> Tuple[arcade.Texture, arcade.Texture]:
     """
     Loads a file and its flipped equivalent
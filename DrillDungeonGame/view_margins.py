@@ -1,7 +1,13 @@
+import math
+from typing import List, Tuple
+
 import arcade
+import numpy as np
 
 from .utility import SCREEN_WIDTH, SCREEN_HEIGHT, VIEWPOINT_MARGIN
 
+VIEW_PADDING = 100  # How many pixels past the edge of the screen sprites still count as visible.
+
 
 class View:
     """
@@ -12,6 +18,12 @@ class View:
     -------
     update(centre_sprite: arcade.Sprite)
         Update any changes in the game by updating the view.
+    visible_bounds(padding: float)
+        Returns the left, bottom, right and top of the padded viewport.
+    is_visible(sprite: arcade.Sprite, padding: float)
+        Checks if any of a sprite is inside the padded viewport.
+    visible_sprites(sprites: SpriteContainer, padding: float)
+        Returns the entities and particles inside the padded viewport.
     _check_for_scroll_left()
         Scrolls window to the left if player moves to the left.
     _check_for_scroll_right()
@@ -51,6 +63,82 @@ class View:
             arcade.set_viewport(self.left_offset, SCREEN_WIDTH + self.left_offset,
                                 self.bottom_offset, SCREEN_HEIGHT + self.bottom_offset)
 
+    def visible_bounds(self, padding: float = VIEW_PADDING) -> Tuple[float, float, float, float]:
+        """
+
+        Returns the area of the map on the screen, grown by padding on every side.
+
+        Parameters
+        ----------
+        padding : float
+            How many pixels to grow the area by on each side.
+
+        Returns
+        -------
+        Tuple[float, float, float, float]
+            The left, bottom, right and top pixel coordinates of the area.
+
+        """
+        return (self.left_offset - padding, self.bottom_offset - padding,
+                self.left_offset + SCREEN_WIDTH + padding, self.bottom_offset + SCREEN_HEIGHT + padding)
+
+    def is_visible(self, sprite: arcade.Sprite, padding: float = VIEW_PADDING) -> bool:
+        """
+
+        Checks if any of a sprite, whatever angle it is turned to, is inside the padded viewport.
+
+        Parameters
+        ----------
+        sprite  : arcade.Sprite
+            The sprite to check.
+        padding : float
+            How many pixels past the edge of the screen the sprite still counts as visible.
+
+        Returns
+        -------
+        bool
+            True if the sprite could be seen.
+
+        """
+        left, bottom, right, top = self.visible_bounds(padding)
+        half_size = math.hypot(sprite.width, sprite.height) / 2
+        return (left - half_size <= sprite.center_x <= right + half_size and
+                bottom - half_size <= sprite.center_y <= top + half_size)
+
+    def visible_sprites(self, sprites, padding: float = VIEW_PADDING) -> Tuple[List[arcade.Sprite], np.ndarray]:
+        """
+
+        Returns the entities and particles inside the padded viewport, so that work which only changes how things
+        look can be skipped for everything off the screen.
+
+        Notes
+        -----
+        Entities are found through SpriteContainer.entity_hash, so only the cells under the screen are looked at
+        however many entities there are on the map. Particles are rows of NumPy arrays in SpriteContainer.particles,
+        so they are checked against the area all at once. Level.update_cosmetics drops any that are off the screen.
+
+        Parameters
+        ----------
+        sprites : SpriteContainer
+            The SpriteContainer holding the entities and particles of the level.
+        padding : float
+            How many pixels past the edge of the screen sprites still count as visible.
+
+        Returns
+        -------
+        Tuple[List[arcade.Sprite], np.ndarray]
+            The visible entities, and the indices of the visible particles in the particle system.
+
+        """
+        sprites.update_entity_hash()
+        entities = [entity for entity in sprites.entity_hash.query(*self.visible_bounds(padding))
+                    if self.is_visible(entity, padding)]
+        # The hash returns entities in an order that changes as they move between cells, so put them back in the order
+        # of the entity list, which is the order they are drawn in (the drill last, over the enemies).
+        entities.sort(key=sprites.entity_list.sprite_idx.__getitem__)
+        particles = sprites.particles.inside(*self.visible_bounds(padding))
+        return entities, particles
+
     def _check_for_scroll_left(self) -> bool:
         """
 
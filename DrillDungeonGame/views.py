@@ -143,6 +143,7 @@ class MyFlatButtonExit(arcade.gui.UIFlatButton):
         Closes the game (ends the running program).
 
         """
+        self.window.close()
         quit()
 
 
@@ -48,3 +48,10 @@ class Window(arcade.Window):
         # and on_update will think the music is over and advance us to the next
         # song before starting this one.
         # time.sleep(0.03)
+
+    def close(self) -> None:
+        """
+        Stops the game's background work, then closes the window.
+        """
+        self.game_view.shutdown()
+        super().close()
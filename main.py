@@ -1,3 +1,5 @@
+import multiprocessing
+
 from DrillDungeonGame import *
 
 
@@ -22,4 +24,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
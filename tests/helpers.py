@@ -0,0 +1,25 @@
+import arcade
+import numpy as np
+
+from DrillDungeonGame.map import BlockGrid
+from DrillDungeonGame.sprite_container import SpriteContainer
+
+DRILL_SPRITE = 'resources/images/drills/drill_v3/drill_both_1.png'
+
+
+def make_sprites(drill=None, entities=()):
+    """Builds a SpriteContainer of empty sprite lists, with any entities given in its entity list."""
+    sprites = SpriteContainer(drill, arcade.SpriteList(), arcade.SpriteList(),
+                              arcade.SpriteList(), arcade.SpriteList(), arcade.SpriteList(),
+                              arcade.SpriteList(), arcade.SpriteList(), arcade.SpriteList(),
+                              arcade.SpriteList(), arcade.SpriteList(), arcade.SpriteList(),)
+    sprites.entity_list.extend(entities)
+    return sprites
+
+
+def make_block_grid(rows, sprites=None):
+    """Builds a block grid from rows of block chars, with the first row at the bottom of the map."""
+    if sprites is None:
+        sprites = make_sprites()
+    configuration = np.array([[ord(char) for char in row] for row in rows], dtype=np.uint8)
+    return BlockGrid(configuration, sprites), sprites
@@ -0,0 +1,80 @@
+import unittest
+
+import arcade
+
+from DrillDungeonGame.ai_level_of_detail import AILevelOfDetail, AITier
+from DrillDungeonGame.entity.entity import Entity
+from tests.helpers import DRILL_SPRITE, make_sprites
+
+class FakeEnemy(arcade.Sprite):
+    def __init__(self, x, y):
+        super().__init__(center_x=x, center_y=y)
+        self.children = []
+        self.updates = 0
+        self.delta_time = 0.0
+
+    def update(self, time, delta_time, sprites, block_grid):
+        self.updates += 1
+        self.delta_time += delta_time
+        self.center_x += 1
+
+    def update_collision_engine(self, time, delta_time, sprites, block_grid):
+        pass
+
+
+class AILevelOfDetailTestCase(unittest.TestCase):
+    def test_tiers(self):
+        near, middle, far = FakeEnemy(100, 0), FakeEnemy(0, 500), FakeEnemy(2000, 2000)
+        sprites = make_sprites(arcade.Sprite(center_x=0, center_y=0), [near, middle, far])
+        level_of_detail = AILevelOfDetail(full_distance=300, reduced_distance=1000, reduced_interval=4)
+        self.assertEqual(level_of_detail.tier_of(near, 0, 0), AITier.FULL)
+        self.assertEqual(level_of_detail.tier_of(middle, 0, 0), AITier.REDUCED)
+        self.assertEqual(level_of_detail.tier_of(far, 0, 0), AITier.FROZEN)
+
+        for _ in range(8):
+            level_of_detail.update(0, 1 / 60, sprites, None)
+        self.assertEqual(near.updates, 8)
+        self.assertEqual(middle.updates, 2)
+        self.assertAlmostEqual(middle.delta_time, 8 / 60)  # Reduced enemies are given the time they missed.
+        self.assertEqual(far.updates, 0)
+
+        # Killed enemies are dropped from the hash.
+        near.remove_from_sprite_lists()
+        level_of_detail.update(0, 1 / 60, sprites, None)
+        self.assertNotIn(near, sprites.entity_hash)
+        self.assertEqual(len(sprites.entity_hash), 2)
+
+    def test_reduced_enemies_travel_as_far_as_full_ones(self):
+        near, middle = Entity(DRILL_SPRITE, 0.3, 100, 0), Entity(DRILL_SPRITE, 0.3, 0, 500)
+        for enemy in (near, middle):
+            enemy.set_velocity((1.0, 0.0))
+            enemy.children.append(Entity(DRILL_SPRITE, 0.3, enemy.center_x, enemy.center_y))  # Like a bullet.
+            enemy.children[0].set_velocity((0.0, 2.0))
+        sprites = make_sprites(arcade.Sprite(center_x=0, center_y=0), [near, middle])
+        level_of_detail = AILevelOfDetail(full_distance=300, reduced_distance=1000, reduced_interval=4)
+
+        for _ in range(8):
+            level_of_detail.update(0, 1 / 60, sprites, None)
+        self.assertEqual(level_of_detail.tier_of(middle, 0, 0), AITier.REDUCED)
+        self.assertEqual(near.center_x - 100, 8)
+        self.assertEqual(middle.center_x, near.center_x - 100)
+        self.assertGreater(near.children[0].center_y, 16)
+        self.assertEqual(middle.children[0].center_y - 500, near.children[0].center_y)
+
+    def test_invalid_distances(self):
+        self.assertRaises(ValueError, AILevelOfDetail, full_distance=500, reduced_distance=100)
+        self.assertRaises(ValueError, AILevelOfDetail, reduced_interval=0)
+
+    def test_work_does_not_grow_with_enemies_out_of_range(self):
+        updated = []
+        for size in (10, 40):
+            # Enemies spread evenly over a map that grows with their number, so the drill only ever has the same
+            # number of enemies around it.
+            enemies = [FakeEnemy(x * 100, y * 100) for x in range(size) for y in range(size)]
+            sprites = make_sprites(arcade.Sprite(center_x=0, center_y=0), enemies)
+            level_of_detail = AILevelOfDetail(full_distance=300, reduced_distance=600, reduced_interval=4)
+            for _ in range(4):
+                level_of_detail.update(0, 1 / 60, sprites, None)
+            updated.append(sum(enemy.updates for enemy in enemies))
+        self.assertGreater(updated[0], 0)
+        self.assertEqual(updated[0], updated[1])
@@ -0,0 +1,68 @@
+import gc
+import time
+import tracemalloc
+import unittest
+
+import arcade
+
+from DrillDungeonGame.map import BLOCK, block_flyweight, preload_block_flyweights
+from tests.helpers import make_block_grid
+
+
+def load_block_from_file(x, y):
+    """Creates a dirt block sprite the way blocks used to be created, by loading it from its file."""
+    return arcade.Sprite(filename=BLOCK.DIRT.file, scale=BLOCK.DIRT.scale, center_x=x, center_y=y)
+
+
+def create_block(x, y):
+    return BLOCK.DIRT(x, y, x, y)
+
+
+class BlockTestCase(unittest.TestCase):
+    def test_blocks_of_a_type_share_a_texture_and_hit_box(self):
+        block_grid, sprites = make_block_grid(['OOOOOO',
+                                               'OXC CO',
+                                               'OX  CO',
+                                               'OOOOOO'])
+        dirt = [block_grid.block_at(1, 1), block_grid.block_at(1, 2)]
+        coal = [block_grid.block_at(2, 1), block_grid.block_at(4, 1), block_grid.block_at(4, 2)]
+        for blocks, block_type in ((dirt, BLOCK.DIRT), (coal, BLOCK.COAL)):
+            flyweight = block_flyweight(block_type)
+            for block in blocks:
+                self.assertIsInstance(block, block_type)
+                self.assertIs(block.texture, flyweight.texture)
+                self.assertIs(block.get_hit_box(), flyweight.hit_box)
+        self.assertIsNot(dirt[0].texture, coal[0].texture)
+
+        # Breaking a block swaps it over to the shared air texture and hit box.
+        block_grid.break_block(dirt[0], sprites)
+        block_grid.flush_breaks()
+        self.assertIs(dirt[0].texture, block_flyweight(BLOCK.AIR).texture)
+        self.assertIs(dirt[0].get_hit_box(), block_flyweight(BLOCK.AIR).hit_box)
+
+    def test_creating_blocks_is_faster_and_smaller_than_loading_them(self):
+        preload_block_flyweights()
+        count, repeats = 1000, 5
+
+        def time_per_block(create):
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                [create(x, 0) for x in range(count)]
+                times.append(time.perf_counter() - start)
+            return min(times) / count
+
+        def memory_per_block(create):
+            tracemalloc.start()
+            blocks = [create(x, 0) for x in range(count)]
+            size, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del blocks
+            return size / count
+
+        gc.disable()
+        try:
+            self.assertLess(time_per_block(create_block), time_per_block(load_block_from_file))
+            self.assertLess(memory_per_block(create_block), memory_per_block(load_block_from_file))
+        finally:
+            gc.enable()
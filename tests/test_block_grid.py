@@ -0,0 +1,212 @@
+import time
+import unittest
+
+import numpy as np
+
+from DrillDungeonGame.entity.entity import Entity
+from DrillDungeonGame.map import BLOCK, OPEN_BLOCK_CODES, BlockGrid
+from tests.helpers import DRILL_SPRITE, make_block_grid, make_sprites
+
+def make_pillared_rows(size):
+    """Builds the rows of a square map with a clear corridor along the bottom and pillars of dirt above it."""
+    rows = ['O' * size, 'O' + ' ' * (size - 2) + 'O']
+    rows += ['O' + ''.join('X' if x % 2 else ' ' for x in range(1, size - 1)) + 'O' for _ in range(size - 3)]
+    return rows + ['O' * size]
+
+
+class BlockGridTestCase(unittest.TestCase):
+    def test_only_blocks_next_to_air_are_exposed(self):
+        block_grid, sprites = make_block_grid(['XXXXX',
+                                               'XX XX',
+                                               'XXXXX'])
+        self.assertEqual(block_grid.width, 5)
+        self.assertEqual(block_grid.height, 3)
+        self.assertEqual(len(sprites.destructible_blocks_list), 4)
+        self.assertTrue(block_grid.exposed[1, 1])
+        self.assertTrue(block_grid.exposed[2, 0])
+        self.assertFalse(block_grid.exposed[0, 0])
+
+    def test_unknown_char(self):
+        self.assertRaises(ValueError, make_block_grid, ['XXZ'])
+
+    def test_blocks_overlapping(self):
+        block_grid, sprites = make_block_grid(['XXXXX',
+                                               'XC XX',
+                                               'XXXXX'])
+        entity = Entity(DRILL_SPRITE, 0.05, 50, 30)  # 11x4 pixels.
+        self.assertEqual(block_grid.blocks_overlapping(entity), [])  # Air doesn't collide.
+
+        entity.center_x = 30
+        self.assertEqual(block_grid.blocks_overlapping(entity), [block_grid.block_at(1, 1)])
+        self.assertEqual(block_grid.blocks_overlapping(entity, (BLOCK.COAL,)), [block_grid.block_at(1, 1)])
+        self.assertEqual(block_grid.blocks_overlapping(entity, (BLOCK.DIRT,)), [])
+
+    def test_break_block(self):
+        block_grid, sprites = make_block_grid(['XXXXX',
+                                               'XX XX',
+                                               'XXXXX'])
+        block_grid.chunks.update(0, 0, 100, 100)
+        block = block_grid.block_at(1, 1)
+        block_grid.break_block(block, sprites)
+        self.assertEqual(block_grid.tiles[1, 1], ord(' '))
+        self.assertIn(block_grid.block_at(0, 1), sprites.destructible_blocks_list)
+        # The sprite is reused as air straight away, so looking the block up before the flush doesn't make another.
+        self.assertIsInstance(block, BLOCK.AIR)
+        self.assertIs(block_grid.block_at(1, 1), block)
+
+        # The block only leaves its sprite lists once the frame's breaks are flushed.
+        self.assertIn(block, sprites.destructible_blocks_list)
+        block_grid.flush_breaks()
+        self.assertNotIn(block, sprites.destructible_blocks_list)
+        self.assertIs(block_grid.block_at(1, 1), block)
+        floor_list = block_grid.chunks._resident[block_grid.chunks.chunk_of(1, 1)].floor_list
+        self.assertEqual([floor for floor in floor_list if (floor.x, floor.y) == (1, 1)], [block])
+
+        # Breaking the same block twice does nothing.
+        length = len(sprites.destructible_blocks_list)
+        block_grid.break_block(block, sprites)
+        block_grid.flush_breaks()
+        self.assertEqual(len(sprites.destructible_blocks_list), length)
+
+    def test_breaks_sharing_neighbours_add_each_block_once(self):
+        block_grid, sprites = make_block_grid(['OOOOOOOO',
+                                               'OXXXXXXO',
+                                               'OXX XXXO',
+                                               'OXXXXXXO',
+                                               'OXXXXXXO',
+                                               'OOOOOOOO'])
+
+        def check_lists():
+            for sprite_list in (sprites.all_blocks_list, sprites.destructible_blocks_list):
+                self.assertEqual(len(set(sprite_list)), len(sprite_list))
+            self.assertEqual(len(sprites.all_blocks_list), np.count_nonzero(block_grid._registered))
+            destructible = block_grid._registered & (block_grid.tiles == ord('X'))
+            self.assertEqual(len(sprites.destructible_blocks_list), np.count_nonzero(destructible))
+
+        # Two adjacent blocks, which share most of their neighbours, with the breaks flushed in between.
+        check_lists()
+        block_grid.break_block(block_grid.block_at(4, 2), sprites)
+        block_grid.flush_breaks()
+        check_lists()
+        block_grid.break_block(block_grid.block_at(5, 2), sprites)
+        block_grid.flush_breaks()
+        check_lists()
+
+        # A whole row, broken in one frame.
+        for x in range(1, 7):
+            block_grid.break_block(block_grid.block_at(x, 3), sprites)
+        block_grid.flush_breaks()
+        check_lists()
+        self.assertNotIn(block_grid.block_at(3, 3), sprites.all_blocks_list)
+        self.assertIn(block_grid.block_at(3, 4), sprites.destructible_blocks_list)
+
+    def test_from_tiles(self):
+        block_grid, sprites = make_block_grid(['XXXXX',
+                                               'XX XX',
+                                               'XXXXX'])
+        block_grid.break_block(block_grid.block_at(1, 1), sprites)
+        block_grid.flush_breaks()
+        copy = BlockGrid.from_tiles(block_grid.tiles, make_sprites())
+        self.assertTrue(np.array_equal(copy.tiles, block_grid.tiles))
+        # Open blocks are only exposed once a block next to them breaks, so only solid blocks are compared.
+        solid = ~np.isin(block_grid.tiles, OPEN_BLOCK_CODES)
+        self.assertTrue(np.array_equal(copy.exposed[solid], block_grid.exposed[solid]))
+        self.assertTrue(copy.exposed[1, 1])
+
+    def test_is_block_type_near(self):
+        block_grid, sprites = make_block_grid(['XXXXXXXXXX',
+                                               'X       DX',
+                                               'XXXXXXXXXX'])
+        self.assertTrue(block_grid.is_block_type_near(30, 30, BLOCK.DRILLDOWN, radius=7))
+        self.assertFalse(block_grid.is_block_type_near(30, 30, BLOCK.DRILLDOWN, radius=5))
+
+    def test_connected_regions(self):
+        block_grid, sprites = make_block_grid(['OOOOOOOOO',
+                                               'O  W XW O',
+                                               'O  W  W O',
+                                               'OOOOOOOOO'])
+        regions = block_grid.regions
+        self.assertEqual(regions.region_count, 3)
+        self.assertTrue(regions.connected((1, 1), (2, 2)))
+        self.assertTrue(regions.connected((4, 1), (5, 2)))  # Dirt can be dug through.
+        self.assertFalse(regions.connected((1, 1), (4, 1)))
+        self.assertFalse(regions.connected((1, 1), (20, 20)))
+        self.assertEqual(regions.region_of(3, 1), -1)
+
+        # Breaking through a wall joins the regions either side of it.
+        block_grid.break_block(block_grid.block_at(3, 1), sprites)
+        self.assertEqual(regions.region_count, 2)
+        self.assertTrue(regions.connected((1, 1), (5, 2)))
+        self.assertFalse(regions.connected((1, 1), (7, 1)))
+
+    def test_has_line_of_sight(self):
+        block_grid, sprites = make_block_grid(['OOOOOOOO',
+                                               'O   X  O',
+                                               'O      O',
+                                               'OOOOOOOO'])
+        self.assertTrue(block_grid.has_line_of_sight(30, 50, 130, 50))
+        self.assertFalse(block_grid.has_line_of_sight(30, 30, 130, 30))
+        self.assertFalse(block_grid.has_line_of_sight(30, 30, 130, 45))  # Clips the dirt block on the way.
+        self.assertTrue(block_grid.has_line_of_sight(30, 30, 70, 50))
+        self.assertFalse(block_grid.has_line_of_sight(30, 50, 130, 50, max_distance=50))
+        self.assertFalse(block_grid.has_line_of_sight(30, 30, -30, 30))  # Out through the border.
+
+        block_grid.break_block(block_grid.block_at(4, 1), sprites)
+        self.assertTrue(block_grid.has_line_of_sight(30, 30, 130, 30))
+
+        e1 = Entity(DRILL_SPRITE, 0.05, 30, 30)
+        e2 = Entity(DRILL_SPRITE, 0.05, 130, 50)
+        self.assertTrue(e1.has_line_of_sight_with(e2, block_grid))
+
+    def test_line_of_sight_cost_does_not_depend_on_map_size(self):
+        repeats = 200
+
+        def time_line_of_sight(size):
+            block_grid, sprites = make_block_grid(make_pillared_rows(size))
+            e1, e2 = Entity(DRILL_SPRITE, 0.05, 30, 30), Entity(DRILL_SPRITE, 0.05, 210, 30)
+            start = time.perf_counter()
+            for _ in range(repeats):
+                self.assertTrue(e1.has_line_of_sight_with(e2, block_grid))
+            grid_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                self.assertTrue(e1.has_line_of_sight_with(e2, sprites.all_blocks_list))
+            return grid_time, time.perf_counter() - start
+
+        small_grid_time, _ = time_line_of_sight(16)
+        large_grid_time, large_arcade_time = time_line_of_sight(96)
+        self.assertLess(large_grid_time, small_grid_time * 3)
+        self.assertLess(large_grid_time, large_arcade_time)
+
+    def test_field_of_view(self):
+        block_grid, sprites = make_block_grid(['OOOOOOOOOOOO',
+                                               'O    X     O',
+                                               'O    X     O',
+                                               'O          O',
+                                               'O          O',
+                                               'OOOOOOOOOOOO'])
+        field_of_view = block_grid.field_of_view
+        self.assertFalse(field_of_view.is_visible(2, 1))  # Not cast yet.
+
+        field_of_view.update(2, 1)
+        self.assertTrue(field_of_view.is_visible(4, 3))
+        self.assertTrue(field_of_view.is_visible(5, 1))  # The face of the dirt is seen, but not what is behind it.
+        self.assertFalse(field_of_view.is_visible(7, 1))
+        self.assertTrue(field_of_view.is_visible(8, 4))
+        self.assertFalse(field_of_view.is_visible(7, 3))
+        self.assertFalse(field_of_view.is_visible(-1, 2))
+        self.assertTrue(block_grid.block_at(5, 1).is_visible)
+        self.assertFalse(block_grid.block_at(11, 1).is_visible)
+
+        # Sight is symmetric, so casting from another open block gives the same answer for the origin.
+        for x, y in ((4, 3), (7, 1), (8, 4), (7, 3)):
+            visible = field_of_view.is_visible(x, y)
+            field_of_view.update(x, y)
+            self.assertEqual(field_of_view.is_visible(2, 1), visible)
+            field_of_view.update(2, 1)
+
+        block_grid.break_block(block_grid.block_at(5, 1), sprites)
+        field_of_view.update(2, 1)
+        self.assertTrue(field_of_view.is_visible(7, 1))
+        self.assertTrue(block_grid.block_at(11, 1).is_visible)
@@ -0,0 +1,63 @@
+import unittest
+
+from DrillDungeonGame.map import BLOCK
+from DrillDungeonGame.utility import BLOCK_PIXEL_SIZE
+from tests.helpers import make_block_grid
+
+
+def make_corridor_rows(size):
+    """A square of dirt inside a border, with a corridor of air along the bottom and up the left side."""
+    rows = ['O' * size, 'O' + ' ' * (size - 2) + 'O']
+    rows += ['O ' + 'X' * (size - 3) + 'O' for _ in range(size - 3)]
+    return rows + ['O' * size]
+
+
+class ChunkManagerTestCase(unittest.TestCase):
+    def test_update_loads_and_evicts_chunks_around_the_view(self):
+        block_grid, sprites = make_block_grid(make_corridor_rows(64))
+        chunks = block_grid.chunks
+        chunk_pixels = chunks.chunk_size * BLOCK_PIXEL_SIZE
+        self.assertEqual(chunks.resident_chunks, 0)
+
+        # A view inside the bottom left chunk, so one chunk past each edge of it is loaded as well.
+        chunks.update(0, 0, chunk_pixels / 2, chunk_pixels / 2)
+        self.assertEqual(set(chunks._resident), {(0, 0), (0, 1), (1, 0), (1, 1)})
+        corner = chunks._resident[(0, 0)]
+        self.assertIn(block_grid.block_at(1, 1), corner.floor_list)
+        self.assertIn(block_grid.block_at(2, 2), corner.block_list)
+        self.assertNotIn(block_grid.block_at(3, 3), corner.block_list)  # Not next to air, so not exposed.
+
+        # Scrolling to the top right corner evicts the chunks that are now out of range.
+        chunks.update(3 * chunk_pixels, 3 * chunk_pixels, chunk_pixels / 2, chunk_pixels / 2)
+        self.assertEqual(set(chunks._resident), {(2, 2), (2, 3), (3, 2), (3, 3)})
+        self.assertNotIn(corner.floor_list, block_grid.block_at(1, 1).sprite_lists)
+
+        chunks.evict_all()
+        self.assertEqual(chunks.resident_chunks, 0)
+
+    def test_add_block_puts_exposed_blocks_in_their_chunk(self):
+        block_grid, sprites = make_block_grid(make_corridor_rows(64))
+        chunks = block_grid.chunks
+        chunk_pixels = chunks.chunk_size * BLOCK_PIXEL_SIZE
+        chunks.update(0, 0, chunk_pixels / 2, chunk_pixels / 2)
+        self.assertEqual(chunks.chunk_of(17, 2), (1, 0))
+
+        # Breaking a block exposes the blocks around it, and the broken block is moved over to the floor once flushed.
+        block = block_grid.block_at(17, 2)
+        block_grid.break_block(block, sprites)
+        block_grid.flush_breaks()
+        chunk = chunks._resident[(1, 0)]
+        self.assertIsInstance(block, BLOCK.AIR)
+        self.assertIn(block, chunk.floor_list)
+        self.assertNotIn(block, chunk.block_list)
+        self.assertIn(block_grid.block_at(17, 3), chunk.block_list)
+        self.assertNotIn(block_grid.block_at(17, 3), chunks._resident[(0, 0)].block_list)
+
+        # Blocks exposed in a chunk that isn't resident are picked up when it is loaded.
+        far_block = block_grid.block_at(60, 2)
+        block_grid.break_block(far_block, sprites)
+        block_grid.flush_breaks()
+        self.assertNotIn((3, 0), chunks._resident)
+        chunks.update(3 * chunk_pixels, 0, chunk_pixels / 2, chunk_pixels / 2)
+        self.assertIn(far_block, chunks._resident[(3, 0)].floor_list)
+        self.assertIn(block_grid.block_at(60, 3), chunks._resident[(3, 0)].block_list)
@@ -20,6 +20,13 @@ class FakeDiggingEntity(Entity, DiggingMixin):
 
 
 class FakeBlockGrid:
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def blocks_overlapping(self, sprite, kinds=None):
+        return [block for block in arcade.check_for_collision_with_list(sprite, self.blocks)
+                if kinds is None or type(block) in kinds]
+
     def break_block(self, block, sprites):
         block.remove_from_sprite_lists()
 
@@ -33,7 +40,7 @@ class DiggingMixinTestCase(unittest.TestCase):
                                   arcade.SpriteList(), arcade.SpriteList(), arcade.SpriteList(),)
         b = DirtBlock(0, 0, 100, 100)  # One dirt block horizontal
         sprites.destructible_blocks_list.append(b)
-        block_grid = FakeBlockGrid()
+        block_grid = FakeBlockGrid(sprites.destructible_blocks_list)
         e = FakeDiggingEntity()
         e.set_velocity((1, 0))
         self.assertIn(b, sprites.destructible_blocks_list)
@@ -59,7 +66,7 @@ class DiggingMixinTestCase(unittest.TestCase):
         sprites.destructible_blocks_list.append(b1)
         sprites.destructible_blocks_list.append(b2)
 
-        block_grid = FakeBlockGrid()
+        block_grid = FakeBlockGrid(sprites.destructible_blocks_list)
         e = FakeDiggingEntity()
         e.set_velocity((1, 0))
         self.assertIn(b1, sprites.destructible_blocks_list)
@@ -4,36 +4,31 @@ from DrillDungeonGame.map.dungeon_generator import *
 
 
 class DungeonGeneratorTestCase(unittest.TestCase):
-    def test_get_walk_direction_input(self):
+    def test_generate_patch_input(self):
         map_layer = MapLayer()
-        self.assertRaises(ValueError, map_layer.get_walk_direction, -10, -10)
+        map_layer.generate_blank_map()
+        self.assertRaises(ValueError, map_layer.generate_patch, 'C', -10, -10, 5)
 
-    def test_get_walk_direction_output_ranges(self):
+    def test_get_walk_positions_output_ranges(self):
         map_layer = MapLayer()
-        top_left = map_layer.get_walk_direction(0, map_layer.height - 1)
-        top_right = map_layer.get_walk_direction(map_layer.width-1, map_layer.height - 1)
-        bottom_left = map_layer.get_walk_direction(0, 0)
-        bottom_right = map_layer.get_walk_direction(map_layer.width-1, 0)
-        center = map_layer.get_walk_direction(int(map_layer.width/2), int(map_layer.height/2))
-        self.assertIn(top_left, [1, 2])
-        self.assertIn(top_right, [2, 3])
-        self.assertIn(bottom_left, [0, 1])
-        self.assertIn(bottom_right, [0, 3])
-        self.assertIn(center, [0, 1, 2, 3])
-
-    def test_update_dungeon_coords(self):
+        for x, y in ((0, map_layer.height - 1), (map_layer.width - 1, map_layer.height - 1), (0, 0),
+                     (map_layer.width - 1, 0), (int(map_layer.width/2), int(map_layer.height/2))):
+            xs, ys = map_layer.get_walk_positions(x, y, 1000)
+            self.assertEqual((xs[0], ys[0]), (x, y))
+            self.assertTrue(((0 <= xs) & (xs < map_layer.width)).all())
+            self.assertTrue(((0 <= ys) & (ys < map_layer.height)).all())
+
+    def test_get_walk_positions_steps(self):
         map_layer = MapLayer()
-        x = 10
-        y = 10
-        step_one = map_layer.update_dungeon_coords(x, y, 0)
-        step_two = map_layer.update_dungeon_coords(step_one[0], step_one[1], 1)
-        step_three = map_layer.update_dungeon_coords(step_two[0], step_two[1], 2)
-        step_four = map_layer.update_dungeon_coords(step_three[0], step_three[1], 3)
-        self.assertEqual(step_one[1], y+1)
-        self.assertEqual(step_two[0], x+1)
-        self.assertEqual(step_three[1], y)
-        self.assertEqual(step_four[0], x)
+        xs, ys = map_layer.get_walk_positions(0, 0, 1000)
+        # Every step moves exactly one block up, right, down or left.
+        self.assertTrue((np.abs(np.diff(xs)) + np.abs(np.diff(ys)) == 1).all())
 
+    def test_generate_patch_size(self):
+        map_layer = MapLayer()
+        map_layer.generate_blank_map()
+        map_layer.generate_patch('C', 10, 10, 30)
+        self.assertEqual((map_layer.map_layer_matrix == 'C').sum(), 30)
 
     def test_generate_mean_dungeon_size(self):
         map_layer = MapLayer()
@@ -45,21 +40,16 @@ class DungeonGeneratorTestCase(unittest.TestCase):
             self.assertIn(map_layer.generate_random_start_point()[0], range(0, map_layer.width))
             self.assertIn(map_layer.generate_random_start_point()[1], range(0, map_layer.height))
 
-    def test_generate_blank_row(self):
-        map_layer = MapLayer()
-        map_layer.generate_blank_row()
-        self.assertEqual(map_layer.map_layer_matrix[0], ['X' for i in range(map_layer.width)])
-
     def test_generate_blank_map(self):
         map_layer = MapLayer()
         map_layer.generate_blank_map()
-        self.assertEqual(map_layer.map_layer_matrix, [['X' for i in range(map_layer.width)] for j in range(map_layer.height)] )
+        self.assertEqual(map_layer.map_layer_matrix.tolist(), [['X' for i in range(map_layer.width)] for j in range(map_layer.height)] )
 
     def test_generate_border_walls(self):
         map_layer = MapLayer()
         map_layer.generate_blank_map()
         map_layer.generate_border_walls()
-        self.assertEqual(map_layer.map_layer_matrix[0], ['O' for i in range(map_layer.width)])
+        self.assertEqual(map_layer.map_layer_matrix[0].tolist(), ['O' for i in range(map_layer.width)])
 
     def test_generate_shop(self):
         map_layer = MapLayer()
@@ -114,3 +104,22 @@ class DungeonGeneratorTestCase(unittest.TestCase):
         self.assertTrue(dungeon_in_map)
 
 
+
+    def test_generate_map_layer_configuration(self):
+        map_layer = MapLayer()
+        map_layer.generate_blank_map()
+        map_layer.generate_border_walls()
+        map_layer.generate_map_layer_configuration()
+        self.assertEqual(map_layer.map_layer_configuration.dtype, np.uint8)
+        self.assertEqual(map_layer.map_layer_configuration.shape, (map_layer.height, map_layer.width))
+        self.assertEqual(map_layer.map_layer_configuration[0, 0], ord('O'))
+        self.assertEqual(map_layer.map_layer_configuration[1, 1], ord('X'))
+
+    def test_create_space_for_drill(self):
+        map_layer = MapLayer()
+        map_layer.generate_blank_map()
+        map_layer.generate_map_layer_configuration()
+        configuration = map_layer.create_space_for_drill(150, 150)
+        self.assertEqual(configuration[7, 7], ord(' '))  # The block the drill is on.
+        self.assertEqual(configuration[7, 9], ord(' '))  # 40 pixels away.
+        self.assertEqual(configuration[7, 10], ord('X'))  # 60 pixels away.
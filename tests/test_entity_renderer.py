@@ -0,0 +1,54 @@
+import unittest
+
+from DrillDungeonGame.entity.entities import BlueNormalBullet, Drill, FlyingEnemy
+from DrillDungeonGame.entity_renderer import EntityRenderer
+
+
+class EntityRendererTestCase(unittest.TestCase):
+    def test_sync(self):
+        renderer = EntityRenderer()
+        drill = Drill(100, 100)
+        enemy = FlyingEnemy(300, 300, vision=200)
+        renderer.sync([enemy, drill])
+        self.assertEqual(list(renderer.body_list), [enemy, drill])
+        self.assertEqual(list(renderer.child_list), [enemy.children[0], drill.children[0]])  # The turrets.
+        self.assertEqual(len(renderer.bullet_list), 0)
+
+        turret = drill.children[0]
+        bullet = BlueNormalBullet(turret)
+        turret.children.append(bullet)
+        drill.enable_shield()
+        renderer.sync([enemy, drill])
+        self.assertEqual(list(renderer.bullet_list), [bullet])
+        self.assertEqual(renderer.child_list[-1], drill.children[-1])  # The shield is drawn over the turrets.
+
+        # Syncing again doesn't add anything twice.
+        renderer.sync([enemy, drill])
+        self.assertEqual(len(renderer.child_list), 3)
+
+        # An enemy coming into view is drawn in order, and the sprites dropped are let go of by the old lists.
+        other_enemy = FlyingEnemy(200, 200, vision=200)
+        body_list, child_list = renderer.body_list, renderer.child_list
+        renderer.sync([other_enemy, enemy, drill])
+        self.assertEqual(list(renderer.body_list), [other_enemy, enemy, drill])
+        renderer.sync([enemy, drill])
+        self.assertEqual(list(renderer.body_list), [enemy, drill])
+        self.assertEqual(len(renderer.child_list), 3)
+        for sprite in (other_enemy, other_enemy.children[0], enemy, drill):
+            self.assertNotIn(body_list, sprite.sprite_lists)
+            self.assertNotIn(child_list, sprite.sprite_lists)
+        for sprite_list in (renderer.body_list, renderer.child_list):
+            self.assertNotIn(sprite_list, other_enemy.sprite_lists)
+            self.assertNotIn(sprite_list, other_enemy.children[0].sprite_lists)
+
+        bullet.remove_from_sprite_lists()
+        drill.disable_shield()
+        enemy.hurt(enemy.max_health)
+        renderer.sync([drill])
+        self.assertEqual(list(renderer.body_list), [drill])
+        self.assertEqual(list(renderer.child_list), [turret])
+        self.assertEqual(len(renderer.bullet_list), 0)
+
+        renderer.clear()
+        self.assertEqual(len(renderer.body_list), 0)
+        self.assertNotIn(renderer.body_list, drill.sprite_lists)
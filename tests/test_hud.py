@@ -0,0 +1,33 @@
+import unittest
+
+from DrillDungeonGame.entity.entities import Drill
+from DrillDungeonGame.hud import HUD
+
+
+class HUDTestCase(unittest.TestCase):
+    def test_only_redraws_what_changed(self):
+        hud = HUD()
+        drill = Drill(0, 0, current_health=100, max_health=100, ammunition=10, coal=10, gold=0)
+        hud.update(0, drill)
+        self.assertEqual(hud.score_text.text, "Score: 0")
+        self.assertEqual(hud.inventory_text.text, "Ammunition: 10\nCoal:10\nGold:0")
+        bar_widths = hud._bar_widths
+
+        for _ in range(10):
+            hud.update(0, drill)
+        self.assertEqual(hud.score_text.rasterizations, 1)
+        self.assertEqual(hud.inventory_text.rasterizations, 1)
+
+        drill.inventory.gold += 1
+        hud.update(2, drill)
+        self.assertEqual(hud.score_text.rasterizations, 2)
+        self.assertEqual(hud.inventory_text.rasterizations, 2)
+        self.assertEqual(hud.inventory_text.text, "Ammunition: 10\nCoal:10\nGold:1")
+
+        # The bars are only rebuilt once they have changed by a pixel.
+        drill.current_health -= 0.1
+        hud.update(2, drill)
+        self.assertEqual(hud._bar_widths, bar_widths)
+        drill.current_health -= 10
+        hud.update(2, drill)
+        self.assertNotEqual(hud._bar_widths, bar_widths)
@@ -0,0 +1,70 @@
+import os
+import unittest
+
+import numpy as np
+
+from DrillDungeonGame.entity.entities import Drill
+from DrillDungeonGame.level import Level
+from DrillDungeonGame.level_store import LevelSnapshot, LevelStore
+from DrillDungeonGame.map import BLOCK
+
+
+class LevelStoreTestCase(unittest.TestCase):
+    def test_hibernate_and_rehydrate(self):
+        drill = Drill(200, 200)
+        store = LevelStore(drill, max_resident_levels=2)
+        store.append(Level(drill, 0))
+
+        # Change the first level, so the snapshot has to hold more than what was generated.
+        level = store[0]
+        x, y = (int(index) for index in np.argwhere(level.block_grid.tiles == ord(BLOCK.DIRT.char))[0])
+        level.block_grid.break_block(level.block_grid.block_at(x, y), level.sprites)
+        enemy = level.sprites.enemy_list[0]
+        enemy.center_x += 7
+        enemy.current_health -= 3
+        tiles = level.block_grid.tiles.copy()
+        enemy_states = level.enemy_states()
+        self.assertEqual(tiles[x, y], ord(BLOCK.AIR.char))
+
+        store.append(Level(drill, 1))
+        self.assertNotIsInstance(store._levels[0], LevelSnapshot)
+        store.append(Level(drill, 2))  # One level past the limit, so the least recently used one is hibernated.
+        snapshot = store._levels[0]
+        self.assertIsInstance(snapshot, LevelSnapshot)
+        self.assertTrue(os.path.exists(snapshot.path))
+        self.assertGreater(snapshot.nbytes, 0)
+        self.assertLess(snapshot.nbytes, tiles.nbytes)  # Compressed.
+        self.assertNotIn(drill, level.sprites.drill_list)  # Its sprites have been released.
+
+        rehydrated = store[0]
+        self.assertIsNot(rehydrated, level)
+        self.assertFalse(os.path.exists(snapshot.path))
+        self.assertEqual(rehydrated.current_level, 0)
+        self.assertTrue(np.array_equal(rehydrated.block_grid.tiles, tiles))
+        self.assertEqual([state[0] for state in rehydrated.enemy_states()], [state[0] for state in enemy_states])
+        self.assertEqual(rehydrated.enemy_states(), enemy_states)
+        self.assertIs(rehydrated.sprites.drill, drill)
+        self.assertIn(drill, rehydrated.sprites.drill_list)
+
+        # Level 1 is now the least recently used, so it has taken level 0's place on disk.
+        self.assertIsInstance(store._levels[1], LevelSnapshot)
+        self.assertNotIsInstance(store._levels[2], LevelSnapshot)
+
+        path = store._levels[1].path
+        store.clear()
+        self.assertEqual(len(store), 0)
+        self.assertFalse(os.path.exists(path))
+
+    def test_byte_limit(self):
+        drill = Drill(200, 200)
+        store = LevelStore(drill, max_resident_levels=None, max_resident_bytes=1)
+        store.append(Level(drill, 0))
+        store.append(Level(drill, 1))
+        self.assertIsInstance(store._levels[0], LevelSnapshot)
+        self.assertIsInstance(store[1], Level)  # The current level always stays resident.
+        self.assertIsInstance(store[0], Level)
+        self.assertIsInstance(store._levels[1], LevelSnapshot)
+        store.clear()
+
+    def test_invalid_limit(self):
+        self.assertRaises(ValueError, LevelStore, Drill(200, 200), max_resident_levels=0)
@@ -14,4 +14,21 @@ class LevelTestCase(unittest.TestCase):
         self.assertGreater(len(level.sprites.enemy_list), 0)
 
 
+class LevelPrefetcherTestCase(unittest.TestCase):
+    def test_take(self):
+        prefetcher = LevelPrefetcher()
+        self.assertIsNone(prefetcher.take(1))  # Never requested, so the level is generated by Level itself.
+
+        prefetcher.request(1)
+        layout = prefetcher.take(1)
+        self.assertIsInstance(layout, LevelLayout)
+        self.assertIsNone(prefetcher.take(1))  # A layout is only handed out once.
+        level = Level(Drill(10, 10), 1, layout=layout)
+        self.assertGreater(len(level.sprites.all_blocks_list), 0)
 
+        # A prefetcher that has been shut down starts a new worker for the next request.
+        prefetcher.shutdown()
+        self.assertIsNone(prefetcher.take(2))
+        prefetcher.request(2)
+        self.assertIsInstance(prefetcher.take(2), LevelLayout)
+        prefetcher.shutdown()
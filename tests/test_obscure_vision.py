@@ -1,7 +1,11 @@
 from DrillDungeonGame.obscure_vision import ObscuredVision
+from DrillDungeonGame.utility import make_vignette
 import unittest
 import logging
 
+import arcade
+import numpy as np
+
 
 class ObscureVisionTestCase(unittest.TestCase):
 
@@ -56,3 +60,21 @@ class ObscureVisionTestCase(unittest.TestCase):
             self.assertEqual(o._outer_alpha, 255)
             self.assertEqual(o._center_alpha, 255)
             self.assertEqual(o.vision, vision)
+
+    def test_vignette_textures_are_reused(self):
+        o = ObscuredVision(200, 500)
+        image = o._image
+        o.increase_vision()
+        self.assertIsNot(o._image, image)
+        o.decrease_vision()
+        self.assertIs(o._image, image)
+
+    def test_make_vignette(self):
+        texture = make_vignette(diameter=100, color=arcade.color.BLACK, vignette_radius=40, center_alpha=0,
+                                outer_alpha=255)
+        alpha = np.asarray(texture.image)[..., 3]
+        self.assertEqual(alpha.shape, (100, 100))
+        self.assertEqual(alpha[50, 50], int(255 / 40))  # The innermost ring.
+        self.assertEqual(alpha[50, 50 + 20], int(255 * 21 / 40))  # Halfway out, alpha is halfway between.
+        self.assertTrue((alpha[:, :5] == 255).all())  # Everything past the vignette_radius is filled.
+        self.assertTrue((alpha == alpha.T).all())
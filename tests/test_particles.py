@@ -0,0 +1,50 @@
+import unittest
+
+import arcade
+
+from DrillDungeonGame.particles.explosion import PARTICLE_COUNT, ParticleKind, ParticleSystem
+
+
+class ParticleSystemTestCase(unittest.TestCase):
+    def test_particles_fade_out(self):
+        particles = ParticleSystem(seed=0)
+        particles.emit(ParticleKind.DIRT, (100, 100))
+        particles.emit(ParticleKind.GOLD, (300, 300))
+        particles.emit_smoke((500, 500), 50)
+        self.assertEqual(len(particles), 2 * PARTICLE_COUNT + 1)
+
+        particles.update()
+        self.assertEqual(len(particles.sprite_list), len(particles))
+        # Each particle has moved away from where it was made, at between 2.5 and 5 pixels a frame.
+        distances = ((particles.positions[:PARTICLE_COUNT] - (100, 100)) ** 2).sum(axis=1) ** 0.5
+        self.assertTrue(((2.5 <= distances) & (distances <= 5)).all())
+        self.assertEqual(tuple(particles.positions[-1]), (500, 500.5))  # Smoke rises.
+
+        # Particles fade by 12 a frame and are gone once they are faded, smoke fades by 8 a frame.
+        for _ in range(21):
+            particles.update()
+        self.assertEqual(len(particles), 1)
+        for _ in range(10):
+            particles.update()
+        self.assertEqual(len(particles), 0)
+        self.assertEqual(len(particles.sprite_list), 0)
+
+    def test_coal_gives_off_smoke(self):
+        particles = ParticleSystem(seed=0)
+        particles.emit(ParticleKind.COAL, (100, 100))
+        for _ in range(5):
+            particles.update()
+        self.assertGreater(len(particles), PARTICLE_COUNT)
+
+    def test_keep_inside(self):
+        particles = ParticleSystem(sprite_list=arcade.SpriteList(), seed=0)
+        particles.emit(ParticleKind.SHIELD, (100, 100), count=3)
+        particles.emit(ParticleKind.DIRT, (1000, 1000), count=2)
+        inside = particles.inside(900, 900, 1100, 1100)
+        self.assertEqual(list(inside), [3, 4])
+        particles.keep(inside)
+        self.assertEqual(len(particles), 2)
+        self.assertEqual(particles.positions.tolist(), [[1000, 1000], [1000, 1000]])
+
+    def test_smoke_needs_a_size(self):
+        self.assertRaises(ValueError, ParticleSystem().emit, ParticleKind.SMOKE, (0, 0))
@@ -1,11 +1,13 @@
+import time
 import unittest
 
 import arcade
 
 from DrillDungeonGame.entity.entity import Entity
 from DrillDungeonGame.entity.mixins import PathFindingMixin
-from DrillDungeonGame.map import DirtBlock
-from DrillDungeonGame.sprite_container import SpriteContainer
+from DrillDungeonGame.map import DirtBlock, FlowField
+from DrillDungeonGame.utility import pixel_to_tile
+from tests.helpers import make_block_grid
 
 
 class FakePathFindingEntity(Entity, PathFindingMixin):
@@ -13,7 +15,7 @@ class FakePathFindingEntity(Entity, PathFindingMixin):
         super().__init__('resources/images/drills/drill_v3/drill_both_1.png',
                          0.3,
                          x, y)
-        PathFindingMixin.__init__(self, vision=kwargs.get('vision'))
+        PathFindingMixin.__init__(self, vision=kwargs.get('vision'), long_range=kwargs.get('long_range', False))
 
 
 class FakeBlockGrid:
@@ -21,6 +23,25 @@ class FakeBlockGrid:
         block.remove_from_sprite_lists()
 
 
+def make_walled_rows(size):
+    """An open square of air surrounded by a border, with a wall up the middle that has a gap at the top."""
+    rows = []
+    for y in range(size):
+        if y in (0, size - 1):
+            rows.append('O' * size)
+        elif y < size - 3:
+            rows.append('O' + ' ' * (size // 2 - 1) + 'W' + ' ' * (size - size // 2 - 2) + 'O')
+        else:
+            rows.append('O' + ' ' * (size - 2) + 'O')
+    return rows
+
+
+def path_through(entity, x, y, block_grid, diagonal_movement=True):
+    """Asks for a path through a block grid, and finishes every queued search so the path is ready."""
+    entity.path_to_position(x, y, block_grid, diagonal_movement)
+    block_grid.path_requests.process()
+
+
 class PathFindingMixinTestCase(unittest.TestCase):
 
     def test_path_no_obstacles_with_game_loop(self):
@@ -119,3 +140,252 @@ class PathFindingMixinTestCase(unittest.TestCase):
         # Without diagonal movement and out of vision range.
         e1.path_to_entity(e2, arcade.SpriteList(), diagonal_movement=False)
         self.assertEqual(e1.path, [])
+
+    def test_path_through_block_grid(self):
+        block_grid, sprites = make_block_grid(make_walled_rows(12))
+        e1 = FakePathFindingEntity(30, 30, speed=1.0, vision=300)
+
+        path_through(e1, 190, 30, block_grid, diagonal_movement=True)
+        self.assertEqual(e1.path[0], (30, 30))
+        self.assertEqual(e1.path[-1], (190, 30))
+        # The path has to go round the top of the wall, and never through it.
+        self.assertTrue(any(y >= 170 for _, y in e1.path))
+        for x, y in e1.path:
+            self.assertNotEqual(block_grid.tiles[pixel_to_tile(x), pixel_to_tile(y)], ord('W'))
+
+        path_through(e1, 190, 30, block_grid, diagonal_movement=False)
+        self.assertEqual(e1.path[-1], (190, 30))
+        for (x1, y1), (x2, y2) in zip(e1.path, e1.path[1:]):
+            self.assertEqual(abs(x1 - x2) + abs(y1 - y2), 20)
+
+        # Out of vision range.
+        e1.vision = 100
+        path_through(e1, 190, 30, block_grid, diagonal_movement=True)
+        self.assertEqual(e1.path, [])
+
+    def test_path_through_block_grid_digs_when_there_is_no_way_round(self):
+        block_grid, sprites = make_block_grid(['OOOOOOO',
+                                               'O  X  O',
+                                               'O  X  O',
+                                               'OOOOOOO'])
+        e1 = FakePathFindingEntity(30, 30, speed=1.0, vision=300)
+        path_through(e1, 110, 30, block_grid, diagonal_movement=True)
+        self.assertEqual(e1.path[-1], (110, 30))
+
+        # Borders can't be dug through.
+        block_grid, sprites = make_block_grid(['OOOOOOO',
+                                               'O  O  O',
+                                               'O  O  O',
+                                               'OOOOOOO'])
+        path_through(e1, 110, 30, block_grid, diagonal_movement=True)
+        self.assertEqual(e1.path, [])
+
+    def test_block_grid_path_finding_is_faster_than_arcade(self):
+        size = 30
+        rows = make_walled_rows(size)
+        block_grid, sprites = make_block_grid(rows)
+        e1 = FakePathFindingEntity(30, 30, speed=1.0, vision=600)
+        goal_x = 30 + 20 * (size - 3)
+        repeats = 5
+
+        def best_time(find_path):
+            find_path()  # Warm up first, so one-off costs aren't timed.
+            times = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                find_path()
+                times.append(time.perf_counter() - start)
+            return min(times)
+
+        def find_arcade_path():
+            e1.path_to_position(goal_x, 30, sprites.all_blocks_list, diagonal_movement=True)
+
+        def find_grid_path():
+            block_grid.path_cache.clear()  # Time the search itself, not the cache.
+            path_through(e1, goal_x, 30, block_grid, diagonal_movement=True)
+
+        arcade_time = best_time(find_arcade_path)
+        grid_time = best_time(find_grid_path)
+
+        self.assertEqual(e1.path[-1], (goal_x, 30))
+        self.assertLess(grid_time, arcade_time)
+
+    def test_follow_flow_field(self):
+        block_grid, sprites = make_block_grid(make_walled_rows(12))
+        e1 = FakePathFindingEntity(30, 30, speed=1.0, vision=300)
+        e2 = FakePathFindingEntity(50, 50, speed=1.0, vision=300)
+
+        # The field has no target yet.
+        e1.follow_flow_field(block_grid.flow_field)
+        self.assertEqual(e1.path, [])
+
+        block_grid.flow_field.update(pixel_to_tile(190), pixel_to_tile(30))
+        e1.follow_flow_field(block_grid.flow_field)
+        e2.follow_flow_field(block_grid.flow_field)
+        self.assertEqual(e1.path[0], (30, 30))
+        self.assertEqual(e1.path[-1], (190, 30))
+        self.assertEqual(e2.path[-1], (190, 30))
+        for x, y in e1.path:
+            self.assertNotEqual(block_grid.tiles[pixel_to_tile(x), pixel_to_tile(y)], ord('W'))
+        # The same path A* would find, at the same cost.
+        path_through(e1, 190, 30, block_grid)
+        self.assertEqual(len(e1.path), len(block_grid.flow_field.path_from(1, 1)))
+
+        # Both entities were served by one search, which isn't repeated until the target moves or a block breaks.
+        self.assertEqual(block_grid.flow_field.searches, 1)
+        block_grid.flow_field.update(pixel_to_tile(190), pixel_to_tile(30))
+        e1.follow_flow_field(block_grid.flow_field)
+        self.assertEqual(block_grid.flow_field.searches, 1)
+
+        block_grid.break_block(block_grid.block_at(6, 1), sprites)
+        e1.follow_flow_field(block_grid.flow_field)
+        self.assertEqual(block_grid.flow_field.searches, 2)
+        self.assertIn((130, 30), e1.path)  # Straight through the gap in the wall.
+
+    def test_follow_flow_field_searches_for_paths_that_leave_the_field(self):
+        block_grid, sprites = make_block_grid(make_walled_rows(12))
+        flow_field = FlowField(block_grid, radius=3)
+        e1 = FakePathFindingEntity(30, 30, speed=1.0, vision=300)
+
+        # The way round the wall leaves the field, so the path is queued and searched for instead.
+        flow_field.update(pixel_to_tile(190), pixel_to_tile(30))
+        e1.follow_flow_field(flow_field, block_grid)
+        self.assertEqual(e1.path, [])
+        self.assertEqual(len(block_grid.path_requests), 1)
+        block_grid.path_requests.process()
+        self.assertEqual(e1.path[-1], (190, 30))
+        self.assertTrue(any(y >= 170 for _, y in e1.path))
+
+        # The path is cached, so following the field again doesn't search for it again.
+        path = e1.path
+        e1.follow_flow_field(flow_field, block_grid)
+        self.assertEqual(e1.path, path)
+        self.assertEqual(len(block_grid.path_requests), 0)
+        self.assertEqual((block_grid.path_cache.hits, block_grid.path_cache.misses), (1, 1))
+
+        # Without the block grid the path is only read off the field.
+        e1.follow_flow_field(flow_field)
+        self.assertEqual(e1.path, [])
+
+        # Long range entities find the way round with the hierarchical path finder instead, straight away and however
+        # little they can see.
+        e2 = FakePathFindingEntity(30, 30, speed=1.0, vision=20, long_range=True)
+        e2.follow_flow_field(flow_field, block_grid)
+        self.assertEqual(len(block_grid.path_requests), 0)
+        self.assertEqual(e2.path[0], (30, 30))
+        self.assertEqual(e2.path[-1], (190, 30))
+
+    def test_flow_field_ignores_blocks_broken_out_of_its_reach(self):
+        block_grid, sprites = make_block_grid(make_walled_rows(40))
+        flow_field = block_grid.flow_field
+        e1 = FakePathFindingEntity(110, 30, speed=1.0, vision=300)
+        flow_field.update(1, 1)
+        e1.follow_flow_field(flow_field)
+        self.assertEqual(flow_field.searches, 1)
+
+        # A block broken in a region the field doesn't reach leaves it as it is.
+        block_grid.break_block(block_grid.block_at(20, 35), sprites)
+        e1.follow_flow_field(flow_field)
+        self.assertEqual(flow_field.searches, 1)
+
+        # One broken within its reach means searching again.
+        block_grid.break_block(block_grid.block_at(20, 5), sprites)
+        e1.follow_flow_field(flow_field)
+        self.assertEqual(flow_field.searches, 2)
+        self.assertEqual(e1.path[-1], (30, 30))
+
+    def test_path_cache(self):
+        block_grid, sprites = make_block_grid(make_walled_rows(40))
+        path_cache = block_grid.path_cache
+        e1 = FakePathFindingEntity(30, 30, speed=1.0, vision=100)
+
+        path_through(e1, 110, 110, block_grid)
+        path = e1.path
+        self.assertEqual((path_cache.hits, path_cache.misses), (0, 1))
+
+        path_through(e1, 110, 110, block_grid)
+        self.assertEqual(e1.path, path)
+        self.assertEqual((path_cache.hits, path_cache.misses), (1, 1))
+        self.assertEqual(path_cache.hit_rate, 0.5)
+        self.assertGreater(path_cache.saved_time, 0)
+
+        # Breaking a block in a region the search never looked at keeps the path cached.
+        block_grid.break_block(block_grid.block_at(20, 30), sprites)
+        path_through(e1, 110, 110, block_grid)
+        self.assertEqual((path_cache.hits, path_cache.misses), (2, 1))
+
+        # Breaking one it did look at means searching again.
+        block_grid.break_block(block_grid.block_at(0, 5), sprites)
+        path_through(e1, 110, 110, block_grid)
+        self.assertEqual(e1.path, path)
+        self.assertEqual((path_cache.hits, path_cache.misses), (2, 2))
+
+    def test_path_request_queue(self):
+        block_grid, sprites = make_block_grid(make_walled_rows(40))
+        path_requests = block_grid.path_requests
+        near = FakePathFindingEntity(690, 30, speed=1.0, vision=800)
+        far = FakePathFindingEntity(30, 30, speed=1.0, vision=800)
+
+        far.path_to_position(750, 30, block_grid)
+        near.path_to_position(750, 30, block_grid)
+        near.path_to_position(750, 30, block_grid)  # Asking again replaces the queued request.
+        self.assertEqual(len(path_requests), 2)
+        self.assertEqual(near.path, [])  # Nothing is searched until the queue is processed.
+
+        # The nearer entity is served first. With no budget to spare, the far search is paused part way through.
+        self.assertEqual(path_requests.process(0.001), 1)
+        self.assertEqual(near.path[-1], (750, 30))
+        self.assertEqual(far.path, [])
+        self.assertEqual(len(path_requests), 1)
+
+        frames = 1
+        while path_requests.process(0.001) == 0:
+            frames += 1
+        self.assertGreater(frames, 1)
+        self.assertEqual(far.path[-1], (750, 30))
+        self.assertEqual(far.path, [(x, y) for x, y in far.path if block_grid.tiles[x // 20, y // 20] != ord('W')])
+
+        # Finished paths are cached, so asking for the same path again is served straight away.
+        far.path_index = 5
+        far.path_to_position(750, 30, block_grid)
+        self.assertEqual(far.path_index, 0)
+        self.assertEqual(len(path_requests), 0)
+
+    def test_path_across_map(self):
+        block_grid, sprites = make_block_grid(make_walled_rows(40))
+        e1 = FakePathFindingEntity(30, 30, speed=1.0, vision=100)
+
+        # The goal is far out of sight, on the other side of a wall that takes a long way round.
+        path_through(e1, 750, 30, block_grid)
+        self.assertEqual(e1.path, [])
+        e1.path_across_map(750, 30, block_grid)
+        self.assertEqual(e1.path[0], (30, 30))
+        self.assertEqual(e1.path[-1], (750, 30))
+        for (x1, y1), (x2, y2) in zip(e1.path, e1.path[1:]):
+            self.assertLessEqual(max(abs(x1 - x2), abs(y1 - y2)), 20)
+            self.assertNotEqual(block_grid.tiles[pixel_to_tile(x2), pixel_to_tile(y2)], ord('W'))
+
+        # Breaking a hole in the wall only rebuilds the graph of the clusters around it.
+        hierarchical_path_finder = block_grid.hierarchical_path_finder
+        clusters_built = hierarchical_path_finder.clusters_built
+        block_grid.break_block(block_grid.block_at(20, 1), sprites)
+        e1.path_across_map(750, 30, block_grid)
+        self.assertLessEqual(hierarchical_path_finder.clusters_built - clusters_built, 2)
+        self.assertIn((410, 30), e1.path)
+        self.assertLess(len(e1.path), 40)
+
+    def test_unreachable_goal_is_rejected_without_searching(self):
+        block_grid, sprites = make_block_grid(['OOOOOOO',
+                                               'O  W  O',
+                                               'O  W  O',
+                                               'OOOOOOO'])
+        e1 = FakePathFindingEntity(30, 30, speed=1.0, vision=300)
+        e1.path = [(30, 30)]
+        e1.path_to_position(110, 30, block_grid)
+        self.assertEqual(e1.path, [])
+        self.assertEqual(len(block_grid.path_requests), 0)
+        self.assertEqual(block_grid.path_cache.misses, 0)
+
+        e1.path_across_map(110, 30, block_grid)
+        self.assertEqual(e1.path, [])
+        self.assertEqual(block_grid.hierarchical_path_finder.clusters_built, 0)
@@ -22,6 +22,13 @@ class FakeShootableEntity(Entity, ShootingMixin):
 
 
 class FakeBlockGrid:
+    def __init__(self, blocks):
+        self.blocks = blocks
+
+    def blocks_overlapping(self, sprite, kinds=None):
+        return [block for block in arcade.check_for_collision_with_list(sprite, self.blocks)
+                if kinds is None or type(block) in kinds]
+
     def break_block(self, block, sprites):
         block.remove_from_sprite_lists()
 
@@ -51,7 +58,7 @@ class ShootingMixinTestCase(unittest.TestCase):
 
         b = DirtBlock(0, 0, 100, 100)  # One dirt block horizontal
         sprites.all_blocks_list.append(b)
-        block_grid = FakeBlockGrid()
+        block_grid = FakeBlockGrid(sprites.all_blocks_list)
 
         time = 0
         delta_time = 0.1
@@ -91,7 +98,7 @@ class ShootingMixinTestCase(unittest.TestCase):
                     # Should have shot 5 bullets. 0.1 delta time. fire rate is 1.0
                     bullets_shot += 10
 
-            e.update(time, delta_time, sprites, None)
+            e.update(time, delta_time, sprites, block_grid)
 
         for bullet in e.children:
             self.assertEqual(bullet.angle, e.angle)  # Bullet angle should match parent.
@@ -0,0 +1,69 @@
+import unittest
+
+import arcade
+
+from DrillDungeonGame.entity.entities import BlueNormalBullet
+from DrillDungeonGame.entity.entity import Entity
+from DrillDungeonGame.spatial_hash import SpatialHash
+from tests.helpers import make_sprites
+
+
+class FakeBlockGrid:
+    def blocks_overlapping(self, sprite, kinds=None):
+        return []
+
+
+class SpatialHashTestCase(unittest.TestCase):
+    def test_query(self):
+        spatial_hash = SpatialHash(cell_size=50)
+        near, far = arcade.Sprite(center_x=10, center_y=10), arcade.Sprite(center_x=500, center_y=500)
+        spatial_hash.add(near)
+        spatial_hash.add(far)
+        self.assertEqual(len(spatial_hash), 2)
+        self.assertEqual(spatial_hash.query_radius(0, 0, 40), [near])
+
+        far.center_x, far.center_y = 20, 20
+        self.assertEqual(spatial_hash.query_radius(0, 0, 40), [near])  # Not moved in the hash yet.
+        spatial_hash.move(far)
+        self.assertCountEqual(spatial_hash.query_radius(0, 0, 40), [near, far])
+        self.assertEqual(spatial_hash.near(near), [far])
+
+        spatial_hash.sync([far])
+        self.assertNotIn(near, spatial_hash)
+        self.assertEqual(spatial_hash.query(-100, -100, 100, 100), [far])
+
+    def test_bullet_hits_entity(self):
+        sprites = make_sprites()
+        shooter = Entity('resources/images/drills/drill_v3/drill_both_1.png', 0.1, -500, -500)
+        target = Entity('resources/images/drills/drill_v3/drill_both_1.png', 0.1, 200, 200, current_health=100,
+                        max_health=100)
+        sprites.entity_list.append(target)
+        sprites.enemy_list.append(target)
+        bullet = BlueNormalBullet(shooter)
+        bullet.center_x, bullet.center_y = 200, 200
+
+        bullet.update(0, 1 / 60, sprites, FakeBlockGrid())
+        self.assertIn(target, sprites.entity_hash)
+        self.assertLess(target.current_health, 100)
+
+    def test_bullet_collisions_scale_linearly(self):
+        def candidates_per_bullet(size):
+            # A bullet between every four entities, spread over an area that grows with their number.
+            sprites = make_sprites()
+            shooter = Entity('resources/images/drills/drill_v3/drill_both_1.png', 0.1, -500, -500)
+            bullets = []
+            for x in range(size):
+                for y in range(size):
+                    sprites.entity_list.append(Entity('resources/images/drills/drill_v3/drill_both_1.png', 0.1,
+                                                      x * 100, y * 100))
+                    bullet = BlueNormalBullet(shooter)
+                    bullet.center_x, bullet.center_y = x * 100 + 50, y * 100 + 50
+                    bullets.append(bullet)
+            return max(len(sprites.entities_near(bullet)) for bullet in bullets)
+
+        small_candidates = candidates_per_bullet(10)
+        large_candidates = candidates_per_bullet(20)  # Four times as many bullets and entities.
+        # Each bullet is only checked against the entities around it, however many there are on the map, so the
+        # work done grows with the number of bullets rather than with bullets times entities.
+        self.assertEqual(small_candidates, large_candidates)
+        self.assertLess(small_candidates, 10 * 10)
@@ -0,0 +1,36 @@
+import unittest
+
+import arcade
+
+from DrillDungeonGame.particles.explosion import ParticleKind
+from DrillDungeonGame.utility import SCREEN_HEIGHT, SCREEN_WIDTH
+from DrillDungeonGame.view_margins import View
+from tests.helpers import make_sprites
+
+
+class ViewTestCase(unittest.TestCase):
+    def test_visible_sprites(self):
+        view = View()
+        view.left_offset, view.bottom_offset = 1000, 1000
+        on_screen = arcade.SpriteSolidColor(20, 20, arcade.color.RED)
+        on_screen.position = 1400, 1300
+        in_padding = arcade.SpriteSolidColor(20, 20, arcade.color.RED)
+        in_padding.position = 1000 + SCREEN_WIDTH + 50, 1300
+        off_screen = arcade.SpriteSolidColor(20, 20, arcade.color.RED)
+        off_screen.position = 2400, 2400
+        sprites = make_sprites(arcade.Sprite(center_x=0, center_y=0), [off_screen, on_screen, in_padding])
+        sprites.particles.emit(ParticleKind.DIRT, (100, 100), count=2)
+        sprites.particles.emit(ParticleKind.GOLD, (1010, 1000 + SCREEN_HEIGHT - 10), count=3)
+
+        entities, particles = view.visible_sprites(sprites, padding=100)
+        self.assertEqual(entities, [on_screen, in_padding])  # In the order of the entity list.
+        self.assertEqual(list(particles), [2, 3, 4])
+
+        entities, _ = view.visible_sprites(sprites, padding=0)
+        self.assertEqual(entities, [on_screen])
+
+        # Entities that move are found where they are once they have been moved in the hash.
+        off_screen.position = 1200, 1200
+        sprites.entity_hash.move(off_screen)
+        entities, _ = view.visible_sprites(sprites, padding=0)
+        self.assertEqual(entities, [off_screen, on_screen])